@@ -0,0 +1,3 @@
+"""Collect the generated TC scripts as pytest tests (see ``harness/pytest_plugin.py``)."""
+
+from harness.pytest_plugin import *  # noqa: F401,F403
@@ -0,0 +1,17 @@
+"""Performance and reliability harness for the TestSprite Playwright suite.
+
+Run modules from the ``testsprite_tests`` directory, e.g.::
+
+    python -m harness.coverage --routes / /gallery /products
+
+Browser helpers live in ``harness.browser``; they are not imported here so
+that the database-only benchmarks run without Playwright installed.
+"""
+
+from harness.config import ARTIFACTS_DIR, BASE_URL, LAUNCH_ARGS
+
+__all__ = [
+    "ARTIFACTS_DIR",
+    "BASE_URL",
+    "LAUNCH_ARGS",
+]
@@ -0,0 +1,130 @@
+"""Protected-route access matrix across personas.
+
+Every route in ``PROTECTED_ROUTES`` and ``AUTH_ROUTES`` is checked for every
+persona at once, each persona in its own browser context with a pre-seeded
+session, and the outcomes are compared with an expected-access spec::
+
+    python -m harness.access
+
+Personas:
+
+``anonymous``  no session
+``fresh``      a newly created, confirmed user who has not onboarded
+``onboarded``  a user whose profile has ``onboarding_completed = true``
+
+The signed-in personas are created with :func:`harness.factory.provisioned`,
+need ``HARNESS_SUPABASE_SERVICE_ROLE_KEY`` and are deleted when the run
+ends. The default spec encodes what
+``ProtectedRoute`` promises; ``--spec`` takes a JSON file of the form
+``{"<persona>": {"<route>": "allow" | "login"}}`` to override cells.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from playwright import async_api
+
+from harness.auth import storage_state_for
+from harness.browser import browser_session, new_context
+from harness.config import artifact_path
+from harness.crawl import DEFAULT_SETTLE_MS, Visit, visit
+from harness.factory import RestFactory, provisioned
+from harness.routes import RouteTable, load_routes
+
+PERSONAS = ("anonymous", "fresh", "onboarded")
+
+
+@dataclass
+class Persona:
+    name: str
+    email: Optional[str] = None
+    session: Optional[dict] = None
+
+
+def provision(make: RestFactory, name: str) -> Persona:
+    """Create a throwaway user for ``name`` through ``make`` and sign it in."""
+    if name == "anonymous":
+        return Persona(name)
+    user = make.user(name, onboarded=name == "onboarded")
+    return Persona(name, user.email, make.session(user))
+
+
+def default_spec(table: RouteTable, personas: list[str]) -> dict[str, dict[str, str]]:
+    spec = {}
+    for persona in personas:
+        signed_in = persona != "anonymous"
+        spec[persona] = {route: "allow" if signed_in else "login" for route in table.protected}
+        spec[persona].update({route: "allow" for route in table.auth})
+    return spec
+
+
+async def check_matrix(
+    personas: list[Persona],
+    spec: dict[str, dict[str, str]],
+    settle_ms: int,
+) -> list[Visit]:
+    async with browser_session() as browser:
+        contexts: dict[str, async_api.BrowserContext] = {}
+        try:
+            for persona in personas:
+                state = storage_state_for(persona.session) if persona.session else None
+                contexts[persona.name] = await new_context(browser, storage_state=state)
+            return await asyncio.gather(*(
+                visit(contexts[persona], route, persona, expected == "login", settle_ms)
+                for persona, routes in spec.items() if persona in contexts
+                for route, expected in routes.items()
+            ))
+        finally:
+            for context in contexts.values():
+                await context.close()
+
+
+def format_grid(visits: list[Visit], personas: list[str]) -> str:
+    routes = sorted({v.route for v in visits})
+    cells = {(v.route, v.persona): v for v in visits}
+    lines = [f"{'route':<20}" + "".join(f"{p:>12}" for p in personas)]
+    for route in routes:
+        row = f"{route:<20}"
+        for persona in personas:
+            v = cells.get((route, persona))
+            row += f"{'-' if v is None else ('pass' if v.ok else 'FAIL'):>12}"
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personas", nargs="+", choices=PERSONAS, default=list(PERSONAS))
+    parser.add_argument("--spec", type=Path, help="JSON overrides for expected access")
+    parser.add_argument("--settle-ms", type=int, default=DEFAULT_SETTLE_MS)
+    args = parser.parse_args(argv)
+
+    table = load_routes()
+    spec = default_spec(table, args.personas)
+    if args.spec:
+        for persona, routes in json.loads(args.spec.read_text()).items():
+            spec.setdefault(persona, {}).update(routes)
+
+    with provisioned() as make:
+        personas = [provision(make, name) for name in args.personas]
+        visits = asyncio.run(check_matrix(personas, spec, args.settle_ms))
+
+    artifact_path("access", "latest.json").write_text(json.dumps({
+        "spec": spec,
+        "personas": {p.name: p.email for p in personas},
+        "visits": [asdict(v) for v in visits],
+    }, indent=2))
+    print(format_grid(visits, args.personas))
+    for v in visits:
+        if not v.ok:
+            print(f"  {v.persona} {v.route}: {v.reason}")
+    return 0 if all(v.ok for v in visits) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""3D asset report for ``public/models`` and ``public/textures``.
+
+The customizer downloads ``shirt_baked.glb`` and the demo textures exactly
+as committed. This tool parses them offline (GLB chunks and glTF JSON,
+PNG/JPEG headers; standard library only) and reports meshes, vertex and
+index counts, embedded textures, an estimate of GPU memory and of download
+time per device class::
+
+    python -m harness.assets
+    python -m harness.assets --optimise --measure
+
+``--optimise`` writes compressed variants under the artifacts directory:
+Draco and meshopt geometry and KTX2/WebP textures through the
+``gltf-transform`` CLI (``npm i -g @gltf-transform/cli``), WebP textures
+through Pillow and KTX2 textures through ``toktx``. Variants whose tool is
+missing are skipped with a note. ``--measure`` serves originals and variants
+from a local HTTP server and times fetch (and image decode) in Chromium
+under each device class's throttled network.
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from harness.config import REPO_ROOT, artifact_path
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+ASSET_DIRS = [REPO_ROOT / "public" / "models", REPO_ROOT / "public" / "textures"]
+
+# name: (downlink Mbit/s, round trip ms), roughly DevTools' presets.
+DEVICE_CLASSES = {
+    "desktop": (50.0, 20),
+    "mid-mobile": (9.0, 60),
+    "low-mobile": (1.6, 150),
+}
+
+_COMPONENT_BYTES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+_TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+_GLB_MAGIC, _JSON_CHUNK, _BIN_CHUNK = 0x46546C67, 0x4E4F534A, 0x004E4942
+
+# GPU bytes per pixel once uploaded: RGBA8 for PNG/JPEG/WebP, ~1 for
+# KTX2/Basis transcoded to BC7/ASTC. Mipmaps add a third.
+_BYTES_PER_PIXEL = {"image/ktx2": 1.0}
+_MIP_FACTOR = 4 / 3
+
+
+@dataclass
+class TextureInfo:
+    name: str
+    mime: str
+    bytes: int
+    width: Optional[int]
+    height: Optional[int]
+
+    @property
+    def gpu_bytes(self) -> int:
+        if not self.width or not self.height:
+            return 0
+        return int(self.width * self.height * _BYTES_PER_PIXEL.get(self.mime, 4.0) * _MIP_FACTOR)
+
+
+@dataclass
+class MeshInfo:
+    name: str
+    primitives: int
+    vertices: int
+    indices: int
+    attribute_bytes: int
+    index_bytes: int
+
+
+@dataclass
+class AssetReport:
+    path: str
+    variant: str
+    bytes: int
+    meshes: list[MeshInfo] = field(default_factory=list)
+    textures: list[TextureInfo] = field(default_factory=list)
+    extensions: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+
+    @property
+    def vertices(self) -> int:
+        return sum(m.vertices for m in self.meshes)
+
+    @property
+    def gpu_bytes(self) -> int:
+        geometry = sum(m.attribute_bytes + m.index_bytes for m in self.meshes)
+        return geometry + sum(t.gpu_bytes for t in self.textures)
+
+
+def image_size(data: bytes) -> tuple[Optional[int], Optional[int]]:
+    """Width and height from a PNG, JPEG, WebP or KTX2 header."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return struct.unpack(">II", data[16:24])
+    if data[:2] == b"\xff\xd8":
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker, length = data[i + 1], struct.unpack(">H", data[i + 2:i + 4])[0]
+            if marker in (0xC0, 0xC1, 0xC2):
+                height, width = struct.unpack(">HH", data[i + 5:i + 9])
+                return width, height
+            i += 2 + length
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        if data[12:16] == b"VP8X":
+            return (int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1)
+        if data[12:16] == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if data[12:16] == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if data[:12] == b"\xabKTX 20\xbb\r\n\x1a\n":
+        return struct.unpack("<II", data[20:28])
+    return None, None
+
+
+def _mime(data: bytes) -> str:
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:2] == b"\xff\xd8":
+        return "image/jpeg"
+    if data[:4] == b"RIFF":
+        return "image/webp"
+    if data[:12] == b"\xabKTX 20\xbb\r\n\x1a\n":
+        return "image/ktx2"
+    return "application/octet-stream"
+
+
+def read_glb(data: bytes) -> tuple[dict, bytes]:
+    magic, version, length = struct.unpack("<III", data[:12])
+    if magic != _GLB_MAGIC or version != 2:
+        raise ValueError("not a glTF 2.0 binary")
+    offset, gltf, binary = 12, None, b""
+    while offset < length:
+        chunk_length, chunk_type = struct.unpack("<II", data[offset:offset + 8])
+        chunk = data[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == _JSON_CHUNK:
+            gltf = json.loads(chunk)
+        elif chunk_type == _BIN_CHUNK:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise ValueError("GLB has no JSON chunk")
+    return gltf, binary
+
+
+def analyse_glb(path: Path, variant: str = "original") -> AssetReport:
+    data = path.read_bytes()
+    gltf, binary = read_glb(data)
+    accessors, views = gltf.get("accessors", []), gltf.get("bufferViews", [])
+
+    def accessor_bytes(index: int) -> int:
+        acc = accessors[index]
+        return acc["count"] * _COMPONENT_BYTES[acc["componentType"]] * _TYPE_COMPONENTS[acc["type"]]
+
+    report = AssetReport(str(path.relative_to(REPO_ROOT)) if path.is_relative_to(REPO_ROOT) else str(path),
+                         variant, len(data), extensions=gltf.get("extensionsUsed", []))
+    for i, mesh in enumerate(gltf.get("meshes", [])):
+        vertices = indices = attr_bytes = index_bytes = 0
+        for prim in mesh.get("primitives", []):
+            attrs = prim.get("attributes", {})
+            if "POSITION" in attrs:
+                vertices += accessors[attrs["POSITION"]]["count"]
+            # GPU buffers hold decoded attributes even when the file is compressed.
+            attr_bytes += sum(accessor_bytes(a) for a in attrs.values())
+            if "indices" in prim:
+                indices += accessors[prim["indices"]]["count"]
+                index_bytes += accessor_bytes(prim["indices"])
+        report.meshes.append(MeshInfo(mesh.get("name", f"mesh{i}"), len(mesh.get("primitives", [])),
+                                      vertices, indices, attr_bytes, index_bytes))
+    for i, image in enumerate(gltf.get("images", [])):
+        if "bufferView" not in image:
+            report.notes.append(f"image {i} is external ({image.get('uri', '?')[:40]})")
+            continue
+        view = views[image["bufferView"]]
+        start = view.get("byteOffset", 0)
+        blob = binary[start:start + view["byteLength"]]
+        width, height = image_size(blob)
+        report.textures.append(TextureInfo(image.get("name", f"image{i}"),
+                                           image.get("mimeType", _mime(blob)), len(blob), width, height))
+    return report
+
+
+def analyse_image(path: Path, variant: str = "original") -> AssetReport:
+    data = path.read_bytes()
+    width, height = image_size(data)
+    report = AssetReport(str(path.relative_to(REPO_ROOT)) if path.is_relative_to(REPO_ROOT) else str(path),
+                         variant, len(data))
+    report.textures.append(TextureInfo(path.name, _mime(data), len(data), width, height))
+    return report
+
+
+def analyse(path: Path, variant: str = "original") -> AssetReport:
+    return analyse_glb(path, variant) if path.suffix == ".glb" else analyse_image(path, variant)
+
+
+def download_ms(size: int, device: str) -> float:
+    """Estimated transfer time: one round trip plus bytes over the downlink."""
+    mbps, rtt = DEVICE_CLASSES[device]
+    return rtt + size * 8 / (mbps * 1000)
+
+
+def _run(cmd: list[str]) -> Optional[str]:
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, timeout=600)
+        return None
+    except (OSError, subprocess.SubprocessError) as error:
+        stderr = getattr(error, "stderr", b"") or b""
+        return f"{cmd[0]} failed: {stderr.decode(errors='replace').strip()[:160] or error}"
+
+
+def optimise(source: Path, out_dir: Path) -> tuple[dict[str, Path], list[str]]:
+    """Write compressed variants of ``source``; returns ({variant: path}, notes)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    variants, notes = {}, []
+    gltf_transform = shutil.which("gltf-transform")
+    if source.suffix == ".glb":
+        jobs = {"draco": ["draco"], "meshopt": ["meshopt"], "webp": ["webp"], "ktx2": ["etc1s"]}
+        if not gltf_transform:
+            return variants, ["gltf-transform not on PATH; GLB variants skipped"]
+        for name, args in jobs.items():
+            target = out_dir / f"{source.stem}.{name}.glb"
+            error = _run([gltf_transform, *args, str(source), str(target)])
+            if error:
+                notes.append(error)
+            else:
+                variants[name] = target
+        return variants, notes
+
+    if Image is not None:
+        target = out_dir / f"{source.stem}.webp"
+        with Image.open(source) as img:
+            img.save(target, "WEBP", quality=85, method=6)
+        variants["webp"] = target
+    else:
+        notes.append("Pillow not installed; WebP variant skipped")
+    toktx = shutil.which("toktx")
+    if toktx:
+        target = out_dir / f"{source.stem}.ktx2"
+        error = _run([toktx, "--t2", "--encode", "etc1s", "--genmipmap", str(target), str(source)])
+        if error:
+            notes.append(error)
+        else:
+            variants["ktx2"] = target
+    else:
+        notes.append("toktx not on PATH; KTX2 variant skipped")
+    return variants, notes
+
+
+_FETCH_AND_DECODE = """
+async (url) => {
+  const started = performance.now();
+  const response = await fetch(url, { cache: "no-store" });
+  const blob = await response.blob();
+  const fetched = performance.now();
+  let decodeMs = null;
+  if (blob.type.startsWith("image/") && !blob.type.includes("ktx2")) {
+    const decodeStart = performance.now();
+    try { (await createImageBitmap(blob)).close(); decodeMs = performance.now() - decodeStart; } catch (e) {}
+  }
+  return { fetchMs: fetched - started, decodeMs };
+}
+"""
+
+
+async def measure(files: dict[str, Path], root: Path) -> dict[str, dict[str, dict]]:
+    """Time each file under each device class's throttled network."""
+    from harness.browser import browser_session, new_context
+
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(root))
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    results: dict[str, dict[str, dict]] = {}
+    try:
+        async with browser_session() as browser:
+            context = await new_context(browser)
+            page = await context.new_page()
+            await page.goto(f"{base}/")
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            for device, (mbps, rtt) in DEVICE_CLASSES.items():
+                await cdp.send("Network.emulateNetworkConditions", {
+                    "offline": False,
+                    "latency": rtt,
+                    "downloadThroughput": mbps * 1_000_000 / 8,
+                    "uploadThroughput": mbps * 1_000_000 / 8,
+                })
+                for key, path in files.items():
+                    rel = path.relative_to(root).as_posix()
+                    results.setdefault(key, {})[device] = await page.evaluate(_FETCH_AND_DECODE, f"{base}/{rel}")
+            await context.close()
+    finally:
+        server.shutdown()
+    return results
+
+
+def _kb(value: int) -> str:
+    return f"{value / 1024:.0f}"
+
+
+def format_table(reports: list[AssetReport], measured: dict[str, dict[str, dict]]) -> str:
+    devices = list(DEVICE_CLASSES)
+    header = (f"{'asset':<34} {'variant':<9} {'KB':>7} {'delta':>7} {'verts':>7} {'GPU MB':>7} "
+              + " ".join(f"{d + ' ms':>15}" for d in devices))
+    lines = [header]
+    originals = {r.path: r.bytes for r in reports if r.variant == "original"}
+    for r in reports:
+        base = originals.get(r.path, r.bytes)
+        delta = f"{(r.bytes - base) / base:+.0%}" if r.variant != "original" else ""
+        cells = []
+        for d in devices:
+            m = measured.get(f"{r.path}:{r.variant}", {}).get(d)
+            cells.append(f"{m['fetchMs']:.0f}" if m else f"~{download_ms(r.bytes, d):.0f}")
+        lines.append(f"{Path(r.path).name:<34} {r.variant:<9} {_kb(r.bytes):>7} {delta:>7} {r.vertices:>7} "
+                     f"{r.gpu_bytes / 1024 / 1024:>7.1f} " + " ".join(f"{c:>15}" for c in cells))
+    lines.append("download ms: measured in Chromium with --measure, ~estimated otherwise")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path, help="assets to analyse (default: public/models, textures)")
+    parser.add_argument("--optimise", action="store_true", help="write compressed variants")
+    parser.add_argument("--measure", action="store_true", help="time downloads in Chromium per device class")
+    args = parser.parse_args(argv)
+
+    sources = args.paths or sorted(
+        p for d in ASSET_DIRS if d.is_dir() for p in d.iterdir() if p.suffix.lower() in (".glb", ".png", ".jpg")
+    )
+    out_dir = artifact_path("assets", "variants", ".keep").parent
+    reports, files, notes = [], {}, []
+    for source in sources:
+        source = source.resolve()
+        original = analyse(source)
+        reports.append(original)
+        files[f"{original.path}:original"] = source
+        if args.optimise:
+            variants, variant_notes = optimise(source, out_dir)
+            notes += [f"{source.name}: {n}" for n in variant_notes]
+            for name, path in variants.items():
+                report = analyse(path, name)
+                report.path = original.path
+                reports.append(report)
+                files[f"{original.path}:{name}"] = path
+
+    measured = {}
+    if args.measure:
+        staging = artifact_path("assets", "serve", ".keep").parent
+        served = {}
+        for key, path in files.items():
+            target = staging / key.replace("/", "_").replace(":", ".") / path.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(path, target)
+            served[key] = target
+        measured = asyncio.run(measure(served, staging))
+
+    artifact_path("assets", "latest.json").write_text(json.dumps({
+        "reports": [{**asdict(r), "gpu_bytes": r.gpu_bytes, "vertices": r.vertices} for r in reports],
+        "measured": measured,
+        "notes": notes,
+    }, indent=2))
+    print(format_table(reports, measured))
+    for r in reports:
+        for note in r.notes:
+            print(f"  {Path(r.path).name}: {note}")
+    for note in notes:
+        print(f"  {note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Pre-seeded Supabase sessions so scenarios skip the UI login form.
+
+A session is obtained from GoTrue's password grant and written into the
+``localStorage`` key supabase-js reads on start-up, packaged as Playwright
+``storage_state``. ``AuthProvider`` then finds the session through
+``getSession()`` exactly as it would after a real sign-in.
+
+The token helpers only need the standard library, so database scenarios can
+use them without Playwright installed.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
+
+from harness.config import BASE_URL, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL
+
+USER_EMAIL = os.environ.get("HARNESS_USER_EMAIL", "")
+USER_PASSWORD = os.environ.get("HARNESS_USER_PASSWORD", "")
+
+# Supabase CLI's default local JWT secret.
+JWT_SECRET = os.environ.get(
+    "HARNESS_JWT_SECRET", "super-secret-jwt-token-with-at-least-32-characters-long"
+)
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+
+class AuthError(RuntimeError):
+    pass
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def mint_jwt(
+    sub: Optional[str],
+    role: str = "authenticated",
+    email: Optional[str] = None,
+    ttl_s: int = 3600,
+    secret: str = JWT_SECRET,
+) -> str:
+    """Sign an HS256 access token shaped like the ones GoTrue issues.
+
+    ``sub=None`` with ``role="anon"`` gives the anonymous key's claims.
+    """
+    now = int(time.time())
+    claims = {"role": role, "iat": now, "exp": now + ttl_s}
+    if sub:
+        claims.update(sub=sub, aud="authenticated")
+    if email:
+        claims["email"] = email
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    payload = _b64url(json.dumps(claims, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def jwt_claims(token: str) -> dict:
+    """Decode (without verifying) the payload of a JWT."""
+    payload = token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+
+
+def storage_key(supabase_url: str = SUPABASE_URL) -> str:
+    """The default ``storageKey`` supabase-js v2 derives from the project URL."""
+    return f"sb-{urlparse(supabase_url).hostname.split('.')[0]}-auth-token"
+
+
+def password_grant(
+    email: str,
+    password: str,
+    supabase_url: str = SUPABASE_URL,
+    anon_key: str = SUPABASE_ANON_KEY,
+) -> dict:
+    """Sign in through GoTrue and return the session JSON."""
+    req = urllib.request.Request(
+        f"{supabase_url}/auth/v1/token?grant_type=password",
+        data=json.dumps({"email": email, "password": password}).encode(),
+        method="POST",
+        headers={"apikey": anon_key, "Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as error:
+        raise AuthError(f"sign-in for {email} failed: {error.code} {error.read()[:200]!r}") from error
+
+
+def create_user(
+    email: str,
+    password: str,
+    user_metadata: Optional[dict] = None,
+    supabase_url: str = SUPABASE_URL,
+    service_key: str = SUPABASE_SERVICE_ROLE_KEY,
+) -> dict:
+    """Create a confirmed user through the GoTrue admin API."""
+    if not service_key:
+        raise AuthError("creating users needs HARNESS_SUPABASE_SERVICE_ROLE_KEY")
+    req = urllib.request.Request(
+        f"{supabase_url}/auth/v1/admin/users",
+        data=json.dumps({
+            "email": email,
+            "password": password,
+            "email_confirm": True,
+            "user_metadata": user_metadata or {},
+        }).encode(),
+        method="POST",
+        headers={
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "Content-Type": "application/json",
+        },
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            return json.loads(resp.read())
+    except urllib.error.HTTPError as error:
+        raise AuthError(f"creating {email} failed: {error.code} {error.read()[:200]!r}") from error
+
+
+def delete_user(
+    user_id: str,
+    supabase_url: str = SUPABASE_URL,
+    service_key: str = SUPABASE_SERVICE_ROLE_KEY,
+) -> None:
+    """Delete a user through the GoTrue admin API; missing users are ignored."""
+    req = urllib.request.Request(
+        f"{supabase_url}/auth/v1/admin/users/{user_id}",
+        method="DELETE",
+        headers={"apikey": service_key, "Authorization": f"Bearer {service_key}"},
+    )
+    try:
+        urllib.request.urlopen(req, timeout=15).close()
+    except urllib.error.HTTPError as error:
+        if error.code != 404:
+            raise AuthError(f"deleting {user_id} failed: {error.code}") from error
+
+
+def generate_link(
+    kind: str,
+    email: str,
+    password: Optional[str] = None,
+    redirect_to: Optional[str] = None,
+    supabase_url: str = SUPABASE_URL,
+    service_key: str = SUPABASE_SERVICE_ROLE_KEY,
+) -> dict:
+    """Ask GoTrue for a ``signup``/``magiclink``/``recovery`` link without sending mail.
+
+    The response carries ``action_link`` and ``hashed_token`` (at the top
+    level or under ``properties``, depending on the GoTrue version).
+    """
+    if not service_key:
+        raise AuthError("generating links needs HARNESS_SUPABASE_SERVICE_ROLE_KEY")
+    body = {"type": kind, "email": email}
+    if password:
+        body["password"] = password
+    if redirect_to:
+        body["redirect_to"] = redirect_to
+    req = urllib.request.Request(
+        f"{supabase_url}/auth/v1/admin/generate_link",
+        data=json.dumps(body).encode(),
+        method="POST",
+        headers={
+            "apikey": service_key,
+            "Authorization": f"Bearer {service_key}",
+            "Content-Type": "application/json",
+        },
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            link = json.loads(resp.read())
+    except urllib.error.HTTPError as error:
+        raise AuthError(f"{kind} link for {email} failed: {error.code} {error.read()[:200]!r}") from error
+    return {**link, **link.get("properties", {})}
+
+
+def storage_state_for(session: dict, origin: str = BASE_URL) -> dict:
+    return {
+        "cookies": [],
+        "origins": [{
+            "origin": origin,
+            "localStorage": [{"name": storage_key(), "value": json.dumps(session)}],
+        }],
+    }
+
+
+async def authenticated_context(
+    browser: "async_api.Browser",
+    session: Optional[dict] = None,
+    **kwargs,
+) -> "async_api.BrowserContext":
+    """Return a context already signed in as ``session`` (or the env user)."""
+    from harness.browser import new_context
+
+    if session is None:
+        if not USER_EMAIL:
+            raise AuthError("set HARNESS_USER_EMAIL and HARNESS_USER_PASSWORD")
+        session = password_grant(USER_EMAIL, USER_PASSWORD)
+    return await new_context(browser, storage_state=storage_state_for(session), **kwargs)
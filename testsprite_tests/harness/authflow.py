@@ -0,0 +1,255 @@
+"""Auth-flow latency benchmark: where the login path spends its time.
+
+Each flow runs many times, each iteration in a fresh browser context, and
+is split into hops at checkpoints taken from network events and the page:
+
+``login``     submit -> token (``/auth/v1/token``) -> dashboard URL
+              (``router.push``) -> profile fetch (``AuthProvider``) ->
+              dashboard rendered ("Welcome back")
+``register``  submit -> ``/auth/v1/signup`` -> "Check Your Email" rendered
+``confirm``   ``/auth/confirm?token=...&type=signup`` -> ``verifyOtp``
+              -> "Email Confirmed!" rendered
+
+A hop is the time from the latest earlier checkpoint to its own, so hops
+that overlap (the profile fetch can start before the redirect) are never
+double counted. The report names the hop that dominates each flow's p95::
+
+    python -m harness.authflow --iterations 200 --concurrency 4
+
+Links for ``confirm`` come from GoTrue's admin ``generate_link``, so no
+mail is sent; every user created is deleted.
+
+``callback`` is accepted but reported as unsupported: ``/auth/callback``
+only exchanges a PKCE ``code``, and admin-generated magic links use the
+implicit flow (tokens in the URL hash), so every run would fail. Timing it
+needs a PKCE sign-in started from the page and a mailbox to read the link.
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from harness.auth import AuthError, delete_user, generate_link
+from harness.browser import browser_session, new_context
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.factory import FactoryUser, provisioned
+from harness.stats import format_summary, summarize
+
+FLOWS = ("login", "register", "confirm")
+
+CHECKPOINTS = {
+    "login": ["token", "redirect", "profile", "rendered"],
+    "register": ["signup", "rendered"],
+    "confirm": ["verify", "rendered"],
+}
+
+UNSUPPORTED_FLOWS = {
+    "callback": "/auth/callback needs a PKCE code; admin magic links are implicit-flow",
+}
+
+
+@dataclass
+class FlowRun:
+    flow: str
+    hops: dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+    final_path: str = ""
+    ok: bool = True
+    error: str = ""
+
+
+class CheckpointRecorder:
+    """Timestamps the first matching request/response after :meth:`start`."""
+
+    def __init__(self, page: async_api.Page, responses: dict[str, Callable[[str], bool]]):
+        self.responses = responses
+        self.started: Optional[float] = None
+        self.times: dict[str, float] = {}
+        self.created_user: Optional[str] = None
+        self._pending: list[asyncio.Future] = []
+        page.on("response", self._on_response)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.times.clear()
+
+    def mark(self, name: str) -> None:
+        if self.started is not None:
+            self.times.setdefault(name, time.perf_counter())
+
+    def _on_response(self, response: async_api.Response) -> None:
+        if self.started is None:
+            return
+        for name, matches in self.responses.items():
+            if name not in self.times and matches(response.url):
+                self.mark(name)
+                if name == "signup":
+                    self._pending.append(asyncio.ensure_future(self._remember_user(response)))
+
+    async def _remember_user(self, response: async_api.Response) -> None:
+        try:
+            body = await response.json()
+        except async_api.Error:
+            return
+        self.created_user = (body.get("user") or body).get("id")
+
+    async def settle(self) -> None:
+        """Wait for response bodies still being read."""
+        await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def hops(self, order: list[str]) -> dict[str, float]:
+        hops, latest = {}, self.started
+        for name in order:
+            at = self.times.get(name)
+            if at is None:
+                continue
+            hops[name] = max(0.0, at - latest) * 1000
+            latest = max(latest, at)
+        return hops
+
+
+def _path(url: str) -> Callable[[str], bool]:
+    return lambda candidate: url in candidate
+
+
+async def _login(page: async_api.Page, user: FactoryUser) -> FlowRun:
+    rec = CheckpointRecorder(page, {"token": _path("/auth/v1/token"), "profile": _path("/rest/v1/profiles")})
+    await page.goto(url_for("/auth/login"), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+    await page.fill("#email", user.email)
+    await page.fill("#password", user.password)
+    rec.start()
+    await page.click("button[type=submit]")
+    await page.wait_for_url("**/dashboard", timeout=NAVIGATION_TIMEOUT_MS)
+    rec.mark("redirect")
+    await page.get_by_text("Welcome back").first.wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+    rec.mark("rendered")
+    return _finish("login", rec, page)
+
+
+async def _register(page: async_api.Page, email: str, password: str, created: list[str]) -> FlowRun:
+    rec = CheckpointRecorder(page, {"signup": _path("/auth/v1/signup")})
+    await page.goto(url_for("/auth/register"), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+    await page.fill("#fullName", "Harness Register")
+    await page.fill("#email", email)
+    await page.fill("#password", password)
+    await page.fill("#confirmPassword", password)
+    rec.start()
+    try:
+        await page.click("button[type=submit]")
+        await page.get_by_text("Check Your Email").wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+        rec.mark("rendered")
+    finally:
+        # Signup may have succeeded even if the page never confirmed it.
+        await rec.settle()
+        if rec.created_user:
+            created.append(rec.created_user)
+    return _finish("register", rec, page)
+
+
+async def _confirm(page: async_api.Page, email: str, password: str, created: list[str]) -> FlowRun:
+    link = generate_link("signup", email, password=password)
+    user_id = (link.get("user") or link).get("id")
+    if user_id:
+        created.append(user_id)
+    rec = CheckpointRecorder(page, {"verify": _path("/auth/v1/verify")})
+    rec.start()
+    await page.goto(url_for(f"/auth/confirm?token={link['hashed_token']}&type=signup"),
+                    wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+    await page.get_by_text("Email Confirmed!").wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+    rec.mark("rendered")
+    return _finish("confirm", rec, page)
+
+
+def _finish(flow: str, rec: CheckpointRecorder, page: async_api.Page) -> FlowRun:
+    hops = rec.hops(CHECKPOINTS[flow])
+    total = (max(rec.times.values()) - rec.started) * 1000 if rec.times else 0.0
+    return FlowRun(flow, hops, total, urlparse(page.url).path)
+
+
+async def run_flow(flow: str, iterations: int, concurrency: int, users: list[FactoryUser]) -> list[FlowRun]:
+    semaphore = asyncio.Semaphore(concurrency)
+    created: list[str] = []
+
+    async def one(browser: async_api.Browser, i: int) -> FlowRun:
+        async with semaphore:
+            context = await new_context(browser)
+            page = await context.new_page()
+            try:
+                if flow == "login":
+                    return await _login(page, users[i % len(users)])
+                email = f"harness+{flow}-{secrets.token_hex(5)}@example.com"
+                password = secrets.token_urlsafe(12)
+                if flow == "register":
+                    return await _register(page, email, password, created)
+                return await _confirm(page, email, password, created)
+            except (async_api.Error, AuthError) as error:
+                return FlowRun(flow, ok=False, final_path=urlparse(page.url).path, error=str(error).splitlines()[0])
+            finally:
+                await context.close()
+
+    try:
+        async with browser_session() as browser:
+            return await asyncio.gather(*(one(browser, i) for i in range(iterations)))
+    finally:
+        for user_id in created:
+            delete_user(user_id)
+
+
+def dominant_hop(runs: list[FlowRun], order: list[str]) -> tuple[Optional[str], dict[str, dict]]:
+    summaries = {hop: summarize(r.hops[hop] for r in runs if hop in r.hops) for hop in order}
+    measured = {hop: s for hop, s in summaries.items() if s["count"]}
+    if not measured:
+        return None, summaries
+    return max(measured, key=lambda hop: measured[hop]["p95"]), summaries
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", nargs="+", choices=FLOWS + tuple(UNSUPPORTED_FLOWS), default=list(FLOWS))
+    parser.add_argument("--iterations", type=int, default=200, help="runs per flow")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--users", type=int, default=4, help="accounts shared by login runs")
+    args = parser.parse_args(argv)
+
+    report = {}
+    all_runs = []
+    with provisioned() as make:
+        users = [make.user(f"authflow{i}", onboarded=True) for i in range(args.users)]
+        for flow in args.flows:
+            if flow in UNSUPPORTED_FLOWS:
+                report[flow] = {"unsupported": UNSUPPORTED_FLOWS[flow]}
+                print(f"{flow}: unsupported ({UNSUPPORTED_FLOWS[flow]})")
+                continue
+            runs = asyncio.run(run_flow(flow, args.iterations, args.concurrency, users))
+            all_runs += runs
+            ok = [r for r in runs if r.ok]
+            dominant, hops = dominant_hop(ok, CHECKPOINTS[flow])
+            report[flow] = {
+                "runs": len(runs),
+                "failures": len(runs) - len(ok),
+                "total": summarize(r.total_ms for r in ok),
+                "hops": hops,
+                "dominant_p95_hop": dominant,
+                "errors": sorted({r.error for r in runs if r.error})[:10],
+            }
+            print(f"{flow}: {len(ok)}/{len(runs)} ok, p95 dominated by {dominant or '-'}")
+            print("  " + format_summary("total", report[flow]["total"]))
+            for hop, summary in hops.items():
+                if summary["count"]:
+                    print("  " + format_summary(hop, summary))
+
+    artifact_path("authflow", "runs.json").write_text(json.dumps([asdict(r) for r in all_runs], indent=2))
+    artifact_path("authflow", "latest.json").write_text(json.dumps(report, indent=2))
+    return 1 if any(r.get("failures") for r in report.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Browser lifecycle helpers shared by harness scenarios."""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from playwright import async_api
+
+from harness.config import DEFAULT_TIMEOUT_MS, HEADLESS, LAUNCH_ARGS
+
+
+@asynccontextmanager
+async def browser_session(
+    args: Optional[list[str]] = None,
+    headless: bool = HEADLESS,
+) -> AsyncIterator[async_api.Browser]:
+    """Start Playwright and yield a Chromium browser, tearing both down on exit."""
+    pw = await async_api.async_playwright().start()
+    browser = None
+    try:
+        browser = await pw.chromium.launch(
+            headless=headless,
+            args=LAUNCH_ARGS if args is None else args,
+        )
+        yield browser
+    finally:
+        if browser:
+            await browser.close()
+        await pw.stop()
+
+
+async def new_context(browser: async_api.Browser, **kwargs) -> async_api.BrowserContext:
+    """Create a browser context with the suite's default timeout applied."""
+    context = await browser.new_context(**kwargs)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    return context
@@ -0,0 +1,185 @@
+"""Cost of the customizer's canvas screenshot on the render loop.
+
+``ScreenshotButton`` calls ``canvas.toDataURL("image/png")`` synchronously,
+so while the PNG is encoded the main thread cannot run the Three.js frame
+loop. This scenario opens ``/customize`` at several viewport sizes and
+device pixel ratios, clicks the real Screenshot button a few times per
+configuration and records, around each capture:
+
+* the time spent inside ``toDataURL``/``toBlob`` (wrapped in the page),
+* long tasks overlapping the capture (main-thread block time),
+* ``requestAnimationFrame`` gaps, converted into dropped frames::
+
+    python -m harness.canvas_capture --dprs 1 2 --captures 5
+
+An off-thread encoder (``toBlob``, ``OffscreenCanvas.convertToBlob``) should
+show up here as encode time that no longer blocks frames.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from playwright import async_api
+
+from harness.browser import browser_session, new_context
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.stats import format_summary, summarize
+
+ROUTE = "/customize"
+
+# Width x height of the browser viewport; the canvas fills its card, so the
+# drawing buffer grows with the viewport and with the DPR (capped at 2 by
+# CanvasStage).
+DEFAULT_VIEWPORTS = {"laptop": (1280, 800), "desktop": (1920, 1080), "wide": (2560, 1440)}
+
+_FRAME_PROBE = """
+(() => {
+  const state = { frames: [], longTasks: [], encodes: [] };
+  window.__harnessCapture = state;
+  const tick = (t) => { state.frames.push(t); requestAnimationFrame(tick); };
+  requestAnimationFrame(tick);
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) state.longTasks.push({ start: e.startTime, duration: e.duration });
+    }).observe({ type: "longtask", buffered: true });
+  } catch (e) {}
+  for (const name of ["toDataURL", "toBlob"]) {
+    const original = HTMLCanvasElement.prototype[name];
+    HTMLCanvasElement.prototype[name] = function (...args) {
+      const start = performance.now();
+      try { return original.apply(this, args); }
+      finally {
+        state.encodes.push({ method: name, start, duration: performance.now() - start,
+                             width: this.width, height: this.height });
+      }
+    };
+  }
+})();
+"""
+
+_READ_WINDOW = """
+([from, to]) => {
+  const s = window.__harnessCapture;
+  return {
+    frames: s.frames.filter((t) => t >= from && t <= to),
+    longTasks: s.longTasks.filter((t) => t.start + t.duration >= from && t.start <= to),
+    encodes: s.encodes.filter((e) => e.start >= from && e.start <= to),
+  };
+}
+"""
+
+
+@dataclass
+class CaptureSample:
+    viewport: str
+    dpr: float
+    canvas_width: int
+    canvas_height: int
+    encode_ms: float
+    blocked_ms: float
+    longest_frame_ms: float
+    dropped_frames: int
+
+
+def dropped_frames(frames: list[float], interval_ms: float) -> tuple[int, float]:
+    """Return (frames missed, longest gap) for a list of rAF timestamps."""
+    gaps = [b - a for a, b in zip(frames, frames[1:])]
+    missed = sum(max(0, round(gap / interval_ms) - 1) for gap in gaps)
+    return missed, max(gaps, default=0.0)
+
+
+async def _frame_interval(page: async_api.Page) -> float:
+    """Median rAF interval over an idle second, i.e. the display's frame budget."""
+    start = await page.evaluate("performance.now()")
+    await page.wait_for_timeout(1000)
+    frames = (await page.evaluate(_READ_WINDOW, [start, start + 1000]))["frames"]
+    gaps = sorted(b - a for a, b in zip(frames, frames[1:]))
+    return gaps[len(gaps) // 2] if gaps else 1000 / 60
+
+
+async def measure_config(
+    browser: async_api.Browser,
+    viewport: str,
+    dpr: float,
+    captures: int,
+    window_ms: int,
+) -> list[CaptureSample]:
+    width, height = DEFAULT_VIEWPORTS[viewport]
+    context = await new_context(browser, viewport={"width": width, "height": height},
+                                device_scale_factor=dpr, accept_downloads=True)
+    await context.add_init_script(_FRAME_PROBE)
+    samples = []
+    try:
+        page = await context.new_page()
+        await page.goto(url_for(ROUTE), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+        await page.wait_for_selector("canvas", timeout=NAVIGATION_TIMEOUT_MS)
+        interval = await _frame_interval(page)
+        # app/customize/page.tsx renders <ScreenshotButton /> twice: in the
+        # header toolbar and under the customizer controls. Use the header one.
+        button = page.get_by_role("button", name="Screenshot").first
+        for _ in range(captures):
+            start = await page.evaluate("performance.now()")
+            async with page.expect_download() as download_info:
+                await button.click()
+            await (await download_info.value).delete()
+            await page.wait_for_timeout(window_ms)
+            window = await page.evaluate(_READ_WINDOW, [start, start + window_ms])
+            missed, longest = dropped_frames(window["frames"], interval)
+            encode = window["encodes"][0] if window["encodes"] else {}
+            samples.append(CaptureSample(
+                viewport=viewport,
+                dpr=dpr,
+                canvas_width=encode.get("width", 0),
+                canvas_height=encode.get("height", 0),
+                encode_ms=sum(e["duration"] for e in window["encodes"]),
+                blocked_ms=sum(t["duration"] for t in window["longTasks"]),
+                longest_frame_ms=longest,
+                dropped_frames=missed,
+            ))
+    finally:
+        await context.close()
+    return samples
+
+
+async def run(viewports: list[str], dprs: list[float], captures: int, window_ms: int) -> list[CaptureSample]:
+    samples = []
+    async with browser_session() as browser:
+        for viewport in viewports:
+            for dpr in dprs:
+                samples += await measure_config(browser, viewport, dpr, captures, window_ms)
+    return samples
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewports", nargs="+", choices=list(DEFAULT_VIEWPORTS), default=list(DEFAULT_VIEWPORTS))
+    parser.add_argument("--dprs", nargs="+", type=float, default=[1.0, 2.0])
+    parser.add_argument("--captures", type=int, default=5, help="screenshots per configuration")
+    parser.add_argument("--window-ms", type=int, default=1500, help="observation window after each click")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if any capture blocks longer")
+    args = parser.parse_args(argv)
+
+    samples = asyncio.run(run(args.viewports, args.dprs, args.captures, args.window_ms))
+    artifact_path("canvas_capture", "latest.json").write_text(json.dumps([asdict(s) for s in samples], indent=2))
+
+    for viewport in args.viewports:
+        for dpr in args.dprs:
+            ours = [s for s in samples if s.viewport == viewport and s.dpr == dpr]
+            if not ours:
+                continue
+            size = f"{ours[0].canvas_width}x{ours[0].canvas_height}"
+            print(f"{viewport} @{dpr:g}x ({size}), dropped frames per capture: "
+                  f"{sum(s.dropped_frames for s in ours) / len(ours):.1f}")
+            print("  " + format_summary("encode", summarize(s.encode_ms for s in ours)))
+            print("  " + format_summary("blocked", summarize(s.blocked_ms for s in ours)))
+    if args.budget_ms is not None and any(s.blocked_ms > args.budget_ms for s in samples):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Synthetic product catalog for the database benchmarks.
+
+Builds ``harness_bench.products`` with the columns ``GalleryGrid`` reads and
+filters on, filled with deterministic pseudo-random rows so runs compare.
+"""
+
+from harness.db import BENCH_SCHEMA
+
+ADJECTIVES = [
+    "Classic", "Black", "White", "Leather", "Summer", "Winter", "Formal", "Casual",
+    "Running", "Silver", "Designer", "Wool", "Denim", "Vintage", "Cosmic", "Slim",
+    "Oversized", "Cropped", "Organic", "Linen",
+]
+ITEMS = [
+    "T-Shirt", "Jeans", "Jacket", "Shoes", "Dress", "Suit", "Coat", "Sneakers",
+    "Necklace", "Cap", "Pants", "Sunglasses", "Sweater", "Belt", "Hoodie", "Skirt",
+    "Shorts", "Blazer", "Boots", "Scarf",
+]
+CATEGORIES = ["tops", "bottoms", "shoes", "accessories"]
+STYLES = ["casual", "formal", "streetwear", "activewear"]
+
+PRODUCTS_TABLE = f"{BENCH_SCHEMA}.products"
+
+# Same single-column indexes scripts/00-complete-database-setup.sql creates.
+BASELINE_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS bench_products_price ON {PRODUCTS_TABLE} (price)",
+    f"CREATE INDEX IF NOT EXISTS bench_products_created_at ON {PRODUCTS_TABLE} (created_at)",
+]
+
+
+def _sql_array(values: list[str]) -> str:
+    return "ARRAY[" + ",".join("'" + v.replace("'", "''") + "'" for v in values) + "]"
+
+
+def seed_products(conn, rows: int, seed: float = 0.42) -> None:
+    """(Re)create the benchmark catalog with ``rows`` products."""
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {BENCH_SCHEMA}")
+    conn.execute(f"DROP TABLE IF EXISTS {PRODUCTS_TABLE}")
+    conn.execute(f"""
+        CREATE TABLE {PRODUCTS_TABLE} (
+            id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT,
+            price DECIMAL(10,2) NOT NULL,
+            category TEXT,
+            style TEXT,
+            is_new BOOLEAN DEFAULT false,
+            model_url TEXT,
+            images JSONB DEFAULT '[]'::jsonb,
+            tags TEXT[] DEFAULT '{{}}',
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """)
+    conn.execute("SELECT setseed(%s)", (seed,))
+    adjectives, items = _sql_array(ADJECTIVES), _sql_array(ITEMS)
+    conn.execute(f"""
+        INSERT INTO {PRODUCTS_TABLE} (name, description, price, category, style, is_new, model_url, created_at)
+        SELECT
+            ({adjectives})[1 + floor(random() * {len(ADJECTIVES)})::int] || ' '
+                || ({items})[1 + floor(random() * {len(ITEMS)})::int] || ' ' || g,
+            'Synthetic catalog item ' || g,
+            round((5 + random() * 295)::numeric, 2),
+            ({_sql_array(CATEGORIES)})[1 + floor(random() * {len(CATEGORIES)})::int],
+            ({_sql_array(STYLES)})[1 + floor(random() * {len(STYLES)})::int],
+            random() < 0.2,
+            '/models/shirt_baked.glb',
+            NOW() - (random() * interval '730 days')
+        FROM generate_series(1, %s) AS g
+    """, (rows,))
+    for statement in BASELINE_INDEXES:
+        conn.execute(statement)
+    conn.execute(f"ANALYZE {PRODUCTS_TABLE}")
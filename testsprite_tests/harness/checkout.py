@@ -0,0 +1,377 @@
+"""Checkout journey benchmark: seeded cart to order confirmation.
+
+TC007/TC009 stall at "Add to Cart", so this scenario skips it: each journey
+starts with a user whose ``cart_items`` rows and ``cosmic-cart``
+localStorage (``contexts/cart-context.tsx``) are already written, opens
+``/cart``, follows "Proceed to Checkout" and drives
+``components/checkout-form.tsx``:
+
+* validation latency: Submit on the empty form until the browser's first
+  ``invalid`` event, and Submit on the filled form until ``submit`` fires;
+* order creation: the form itself only waits on a timer, so an init script
+  places the order on ``submit`` the way a real checkout would, as the
+  signed-in user (cart read, payment intent, ``orders`` and ``order_items``
+  inserts, capture, status update, cart clear), timing every round trip;
+* time to confirmation: Submit until "Thanks for shopping!" renders.
+
+``order_ms`` and the per-trip times measure the harness's own injected
+order code (see :data:`ORDER_NOTE`), not a path the app runs: the form's
+submit handler only starts a ``setTimeout``. They show what a real order
+write would cost against this schema, not what the app costs today.
+
+Payments go to a stand-in served by Playwright request routing, with a
+fixed latency and an optional decline rate. The order summary the form
+shows is compared with the seeded cart total::
+
+    python -m harness.checkout --cart-sizes 1 5 20 --concurrency 1 4 --iterations 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from harness.auth import storage_key, storage_state_for
+from harness.browser import browser_session, new_context
+from harness.config import NAVIGATION_TIMEOUT_MS, SUPABASE_ANON_KEY, SUPABASE_URL, artifact_path, url_for
+from harness.factory import FactoryUser, RestFactory, provisioned
+from harness.postgrest import PostgrestClient
+from harness.stats import format_summary, summarize
+
+PAYMENT_URL = url_for("/__harness/payments")
+CART_KEY = "cosmic-cart"
+SHIPPING = {
+    "firstName": "Harness",
+    "lastName": "Checkout",
+    "email": "harness.checkout@example.com",
+    "address": "1 Orbit Way",
+    "city": "Tycho",
+    "zipCode": "90210",
+}
+METRICS = ("cart_ms", "checkout_ms", "invalid_ms", "valid_ms", "order_ms", "confirmation_ms")
+ORDER_NOTE = ("order_ms and trips time order writes injected by the harness on submit; "
+              "components/checkout-form.tsx itself only runs a setTimeout")
+
+
+def shipping_address(fields: dict = SHIPPING) -> dict:
+    """The form's fields as the ``orders.shipping_address`` JSON."""
+    return {
+        "name": f"{fields['firstName']} {fields['lastName']}",
+        "email": fields["email"],
+        "address": fields["address"],
+        "city": fields["city"],
+        "zip_code": fields["zipCode"],
+    }
+
+
+_ORDER_HOOK = """
+(() => {
+  const config = __CONFIG__;
+  const state = { clicked: null, invalid: null, submitted: null, done: null, trips: [], order: null, error: null };
+  window.__harnessCheckout = state;
+
+  const trip = async (name, url, init) => {
+    const started = performance.now();
+    const resp = await fetch(url, init);
+    const body = resp.status === 204 ? null : await resp.json().catch(() => null);
+    state.trips.push({ name, ms: performance.now() - started, status: resp.status });
+    if (!resp.ok) throw new Error(`${name}: HTTP ${resp.status}`);
+    return body;
+  };
+
+  const placeOrder = async () => {
+    const session = JSON.parse(localStorage.getItem(config.storageKey) || "null");
+    if (!session) throw new Error("no session in localStorage");
+    const uid = session.user.id;
+    const rest = `${config.supabaseUrl}/rest/v1`;
+    const headers = {
+      apikey: config.anonKey,
+      Authorization: `Bearer ${session.access_token}`,
+      "Content-Type": "application/json",
+      Prefer: "return=representation",
+    };
+    const json = { "Content-Type": "application/json" };
+    const cart = await trip("load_cart",
+      `${rest}/cart_items?select=product_id,quantity,products(price)&user_id=eq.${uid}`, { headers });
+    const total = cart.reduce((sum, row) => sum + Number(row.products.price) * row.quantity, 0);
+    const intent = await trip("payment_intent", `${config.paymentUrl}/intents`,
+      { method: "POST", headers: json, body: JSON.stringify({ amount: Math.round(total * 100) }) });
+    const [order] = await trip("create_order", `${rest}/orders`, { method: "POST", headers,
+      body: JSON.stringify({
+        user_id: uid, total_amount: total.toFixed(2), status: "pending",
+        shipping_address: config.address, billing_address: config.address,
+      }) });
+    await trip("create_order_items", `${rest}/order_items`, { method: "POST", headers,
+      body: JSON.stringify(cart.map((row) => ({
+        order_id: order.id, product_id: row.product_id, quantity: row.quantity,
+        unit_price: row.products.price, total_price: (Number(row.products.price) * row.quantity).toFixed(2),
+      }))) });
+    const capture = await trip("payment_capture", `${config.paymentUrl}/intents/${intent.id}/capture`,
+      { method: "POST", headers: json });
+    // orders.status only allows pending/processing/shipped/delivered/cancelled.
+    const status = capture.status === "succeeded" ? "processing" : "cancelled";
+    await trip("update_order", `${rest}/orders?id=eq.${order.id}`,
+      { method: "PATCH", headers, body: JSON.stringify({ status }) });
+    if (status === "processing") {
+      await trip("clear_cart", `${rest}/cart_items?user_id=eq.${uid}`, { method: "DELETE", headers });
+    }
+    state.order = { id: order.id, total, lines: cart.length, status };
+  };
+
+  document.addEventListener("click", (e) => {
+    if (e.target.closest && e.target.closest("button[type=submit]")) {
+      state.clicked = performance.now();
+      state.invalid = null;
+    }
+  }, true);
+  document.addEventListener("invalid", () => {
+    if (state.invalid === null) state.invalid = performance.now();
+  }, true);
+  document.addEventListener("submit", () => {
+    state.submitted = performance.now();
+    placeOrder()
+      .catch((error) => { state.error = String(error); })
+      .finally(() => { state.done = performance.now(); });
+  }, true);
+})();
+"""
+
+_SUMMARY_TOTAL = """
+() => {
+  const cell = document.querySelector(".checkout-form div.font-bold > span:last-child");
+  return cell ? Number(cell.textContent.replace(/[^0-9.]/g, "")) : null;
+}
+"""
+
+
+class PaymentStandIn:
+    """Answers ``/intents`` and ``/intents/<id>/capture`` after ``latency_ms``."""
+
+    def __init__(self, latency_ms: float, decline_rate: float, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.decline_rate = decline_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self._next_id = 0
+
+    async def handle(self, route: async_api.Route) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency_ms / 1000)
+        path = urlparse(route.request.url).path
+        if path.endswith("/capture"):
+            declined = self.random.random() < self.decline_rate
+            body = {"id": path.split("/")[-2], "status": "declined" if declined else "succeeded"}
+        else:
+            self._next_id += 1
+            body = {"id": f"pi_{self._next_id}", "status": "requires_capture",
+                    **json.loads(route.request.post_data or "{}")}
+        await route.fulfill(status=200, content_type="application/json", body=json.dumps(body))
+
+
+@dataclass
+class Journey:
+    cart_size: int
+    concurrency: int
+    ok: bool = True
+    error: str = ""
+    cart_ms: Optional[float] = None
+    checkout_ms: Optional[float] = None
+    invalid_ms: Optional[float] = None
+    valid_ms: Optional[float] = None
+    order_ms: Optional[float] = None
+    confirmation_ms: Optional[float] = None
+    trips: dict[str, float] = field(default_factory=dict)
+    payment_status: str = ""
+    cart_total: float = 0.0
+    summary_total: Optional[float] = None
+
+
+def seed_products(make: RestFactory, count: int) -> list[dict]:
+    return [make.product(name=f"Harness checkout item {i}", price=round(9.5 + 3.25 * i, 2)) for i in range(count)]
+
+
+def seed_cart(admin: PostgrestClient, user: FactoryUser, products: list[dict]) -> None:
+    """Replace the user's ``cart_items`` rows with one line per product."""
+    admin.delete("cart_items", {"user_id": f"eq.{user.id}"})
+    admin.insert("cart_items", [{"user_id": user.id, "product_id": p["id"], "quantity": 1 + i % 3}
+                                for i, p in enumerate(products)], returning=False)
+
+
+def local_cart(products: list[dict]) -> list[dict]:
+    """The same lines as ``CartItem`` objects, as ``CartProvider`` persists them."""
+    return [{
+        "id": i + 1,
+        "name": p["name"],
+        "category": "harness",
+        "price": float(p["price"]),
+        "image": "/placeholder.svg",
+        "modelUrl": "",
+        "color": "#00C4B4",
+        "quantity": 1 + i % 3,
+    } for i, p in enumerate(products)]
+
+
+def seeded_state(session: dict, cart: list[dict]) -> dict:
+    state = storage_state_for(session)
+    state["origins"][0]["localStorage"].append({"name": CART_KEY, "value": json.dumps(cart)})
+    return state
+
+
+async def journey(browser: async_api.Browser, session: dict, products: list[dict], stand_in: PaymentStandIn,
+                  concurrency: int) -> Journey:
+    cart = local_cart(products)
+    run = Journey(len(products), concurrency, cart_total=round(sum(c["price"] * c["quantity"] for c in cart), 2))
+    config = {"supabaseUrl": SUPABASE_URL, "anonKey": SUPABASE_ANON_KEY,
+              "storageKey": storage_key(), "paymentUrl": PAYMENT_URL, "address": shipping_address()}
+    context = await new_context(browser, storage_state=seeded_state(session, cart))
+    await context.add_init_script(_ORDER_HOOK.replace("__CONFIG__", json.dumps(config)))
+    await context.route(f"{PAYMENT_URL}/**", stand_in.handle)
+    try:
+        page = await context.new_page()
+        proceed = page.get_by_role("button", name="Proceed to Checkout")
+        started = time.perf_counter()
+        await page.goto(url_for("/cart"), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+        await proceed.wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+        run.cart_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        await proceed.click()
+        await page.locator("#firstName").wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+        run.checkout_ms = (time.perf_counter() - started) * 1000
+        run.summary_total = await page.evaluate(_SUMMARY_TOTAL)
+
+        submit = page.get_by_role("button", name="Complete Purchase (Demo)")
+        await submit.click()
+        await page.wait_for_function("() => window.__harnessCheckout.invalid !== null")
+        run.invalid_ms = await page.evaluate("() => window.__harnessCheckout.invalid - window.__harnessCheckout.clicked")
+
+        for field_id, value in SHIPPING.items():
+            await page.fill(f"#{field_id}", value)
+        started = time.perf_counter()
+        await submit.click()
+        await page.get_by_text("Thanks for shopping!").wait_for(timeout=NAVIGATION_TIMEOUT_MS)
+        run.confirmation_ms = (time.perf_counter() - started) * 1000
+
+        await page.wait_for_function("() => window.__harnessCheckout.done !== null", timeout=NAVIGATION_TIMEOUT_MS)
+        state = await page.evaluate("() => window.__harnessCheckout")
+        run.valid_ms = state["submitted"] - state["clicked"]
+        run.order_ms = state["done"] - state["submitted"]
+        for trip in state["trips"]:
+            run.trips[trip["name"]] = trip["ms"]
+        run.payment_status = (state["order"] or {}).get("status", "")
+        if state["error"]:
+            run.ok, run.error = False, state["error"]
+    except async_api.Error as error:
+        run.ok, run.error = False, str(error).splitlines()[0]
+    finally:
+        await context.close()
+    return run
+
+
+async def run_level(browser: async_api.Browser, make: RestFactory, slots: list[tuple[FactoryUser, dict]],
+                    products: list[dict], iterations: int, stand_in: PaymentStandIn) -> list[Journey]:
+    """``iterations`` journeys, at most ``len(slots)`` at a time, one user per slot."""
+    free: asyncio.Queue = asyncio.Queue()
+    for slot in slots:
+        free.put_nowait(slot)
+
+    async def one() -> Journey:
+        user, session = await free.get()
+        try:
+            await asyncio.to_thread(seed_cart, make.admin, user, products)
+            return await journey(browser, session, products, stand_in, len(slots))
+        finally:
+            free.put_nowait((user, session))
+
+    return await asyncio.gather(*(one() for _ in range(iterations)))
+
+
+async def run(make: RestFactory, cart_sizes: list[int], levels: list[int], iterations: int,
+              stand_in: PaymentStandIn) -> list[Journey]:
+    products = seed_products(make, max(cart_sizes))
+    users = [make.user(f"checkout{i}", onboarded=True) for i in range(max(levels))]
+    slots = [(user, make.session(user)) for user in users]
+    journeys = []
+    async with browser_session() as browser:
+        for size in cart_sizes:
+            for level in levels:
+                journeys += await run_level(browser, make, slots[:level], products[:size], iterations, stand_in)
+    return journeys
+
+
+def summarize_levels(journeys: list[Journey]) -> list[dict]:
+    report = []
+    for size, level in dict.fromkeys((j.cart_size, j.concurrency) for j in journeys):
+        runs = [j for j in journeys if j.cart_size == size and j.concurrency == level]
+        ok = [j for j in runs if j.ok]
+        trip_names = list(dict.fromkeys(name for j in ok for name in j.trips))
+        report.append({
+            "cart_size": size,
+            "concurrency": level,
+            "runs": len(runs),
+            "failures": len(runs) - len(ok),
+            "declined": sum(j.payment_status == "cancelled" for j in ok),
+            "round_trips_per_order": sum(len(j.trips) for j in ok) / len(ok) if ok else 0.0,
+            "summary_mismatches": sum(j.summary_total is not None and abs(j.summary_total - j.cart_total) > 0.005
+                                      for j in ok),
+            **{metric: summarize(getattr(j, metric) for j in ok if getattr(j, metric) is not None)
+               for metric in METRICS},
+            "trips": {name: summarize(j.trips[name] for j in ok if name in j.trips) for name in trip_names},
+            "errors": sorted({j.error for j in runs if j.error})[:10],
+        })
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cart-sizes", nargs="+", type=int, default=[1, 5, 20], help="lines per cart")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4], help="parallel journeys")
+    parser.add_argument("--iterations", type=int, default=20, help="journeys per cart size and concurrency")
+    parser.add_argument("--payment-latency-ms", type=float, default=150.0)
+    parser.add_argument("--decline-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-confirmation-ms", type=float, default=None,
+                        help="fail if any level's p95 time to confirmation exceeds this")
+    args = parser.parse_args(argv)
+
+    stand_in = PaymentStandIn(args.payment_latency_ms, args.decline_rate, args.seed)
+    with provisioned() as make:
+        journeys = asyncio.run(run(make, args.cart_sizes, args.concurrency, args.iterations, stand_in))
+    report = summarize_levels(journeys)
+    artifact_path("checkout", "journeys.json").write_text(json.dumps([asdict(j) for j in journeys], indent=2))
+    artifact_path("checkout", "latest.json").write_text(json.dumps({"note": ORDER_NOTE, "levels": report}, indent=2))
+
+    print(f"note: {ORDER_NOTE}")
+    failures = []
+    for level in report:
+        label = f"cart {level['cart_size']} x{level['concurrency']}"
+        print(f"{label}: {level['runs'] - level['failures']}/{level['runs']} ok, "
+              f"{level['round_trips_per_order']:.1f} round trips/order, {level['declined']} declined")
+        for metric in METRICS:
+            if level[metric]["count"]:
+                print("  " + format_summary(metric, level[metric]))
+        for name, summary in level["trips"].items():
+            print("    " + format_summary(name, summary))
+        if level["failures"]:
+            failures.append(f"{label}: {level['failures']} failed ({'; '.join(level['errors'][:3])})")
+        if level["summary_mismatches"]:
+            failures.append(f"{label}: order summary differs from the cart in {level['summary_mismatches']} run(s)")
+        confirmation = level["confirmation_ms"]
+        if args.max_confirmation_ms is not None and confirmation["count"] \
+                and confirmation["p95"] > args.max_confirmation_ms:
+            failures.append(f"{label}: p95 confirmation {confirmation['p95']:.0f} ms over "
+                            f"{args.max_confirmation_ms:.0f} ms")
+    for failure in failures:
+        print(f"! {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
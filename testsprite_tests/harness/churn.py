@@ -0,0 +1,274 @@
+"""Re-render churn of the customizer's valtio state.
+
+``customizationState`` in ``components/customizer/CustomizationStore.ts`` is
+a valtio ``proxy``; ``ChatBot.applyLocalCommand`` and the controls mutate
+it, and every component reading it through ``useSnapshot`` re-renders,
+including ``TShirtModel`` inside the React Three Fiber canvas. This scenario
+types scripted bursts of ``color``, ``logo``, ``full`` and ``toggle``
+commands into the ChatBot on ``/customize`` and, per command, records:
+
+* commits and the components that rendered in them, for both renderers
+  (react-dom and R3F's reconciler), via a stub DevTools hook as in
+  ``harness.hydration``;
+* render time, from ``actualDuration`` when React profiling timers are on
+  (development builds), and wall time from Send to the last commit;
+* long tasks overlapping the command::
+
+    python -m harness.churn --burst 20 --max-commit-ms 16
+    python -m harness.churn --baseline tmp/harness/churn/latest.json --max-growth 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.stats import format_summary, summarize
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+ROUTE = "/customize"
+WATCHED = ("TShirtModel", "CanvasStage", "ChatBot", "ColorPicker", "LogoGrid")
+
+_COMMIT_PROBE = """
+(() => {
+  const state = { mark: 0, commits: [], longTasks: [] };
+  window.__harnessChurn = state;
+  const PERFORMED_WORK = 1;
+  const nameOf = (fiber) => {
+    const type = fiber.type;
+    if (!type || typeof type === "string") return null;
+    return type.displayName || type.name || (type.render && (type.render.displayName || type.render.name)) || null;
+  };
+  const rendered = (root) => {
+    const names = [];
+    const stack = [root.current];
+    while (stack.length) {
+      const fiber = stack.pop();
+      if (!fiber) continue;
+      if ((fiber.flags & PERFORMED_WORK) && (!fiber.alternate || fiber.alternate.child !== fiber.child
+          || fiber.alternate.memoizedProps !== fiber.memoizedProps
+          || fiber.alternate.memoizedState !== fiber.memoizedState)) {
+        const name = nameOf(fiber);
+        if (name) names.push(name);
+      }
+      if (fiber.sibling) stack.push(fiber.sibling);
+      if (fiber.child) stack.push(fiber.child);
+    }
+    return names;
+  };
+  const hook = window.__REACT_DEVTOOLS_GLOBAL_HOOK__ || (() => {
+    let nextId = 1;
+    const stub = {
+      supportsFiber: true,
+      renderers: new Map(),
+      inject(renderer) { const id = nextId++; this.renderers.set(id, renderer); return id; },
+      checkDCE() {},
+      onScheduleFiberRoot() {},
+      onCommitFiberUnmount() {},
+      onPostCommitFiberRoot() {},
+      onCommitFiberRoot() {},
+    };
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = stub;
+    return stub;
+  })();
+  const previous = hook.onCommitFiberRoot.bind(hook);
+  hook.onCommitFiberRoot = (rendererId, root, ...rest) => {
+    if (state.mark) {
+      state.commits.push({
+        at: performance.now(),
+        renderer: rendererId,
+        duration: root.current.actualDuration ?? null,
+        components: rendered(root),
+      });
+    }
+    return previous(rendererId, root, ...rest);
+  };
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) state.longTasks.push({ start: e.startTime, duration: e.duration });
+    }).observe({ type: "longtask", buffered: true });
+  } catch (e) {}
+})();
+"""
+
+_BOT_REPLIES = ("[...document.querySelectorAll('div')]"
+                ".filter((d) => d.children.length === 0 && d.textContent.startsWith('Bot: ')).length")
+
+_START = "() => { const s = window.__harnessChurn; s.mark = performance.now(); s.commits = []; return s.mark; }"
+
+_FINISH = """
+(mark) => {
+  const s = window.__harnessChurn;
+  s.mark = 0;
+  return {
+    commits: s.commits,
+    longTasks: s.longTasks.filter((t) => t.start + t.duration >= mark),
+  };
+}
+"""
+
+
+@dataclass
+class CommandSample:
+    kind: str
+    command: str
+    commits: int
+    renders: dict[str, int]
+    render_ms: Optional[float]
+    wall_ms: float
+    long_task_ms: float
+    renderers: int = 0
+
+
+@dataclass
+class BurstPlan:
+    kind: str
+    commands: list[str] = field(default_factory=list)
+
+
+def default_plan(burst: int) -> list[BurstPlan]:
+    colors = ["#ff0000", "#00C4B4", "#007BFF", "#EFBD48", "#222222", "#ffffff"]
+    textures = ["/textures/demo-2.png", "/textures/demo-3.png", "/textures/threejs.png"]
+    return [
+        BurstPlan("color", [f"color {colors[i % len(colors)]}" for i in range(burst)]),
+        BurstPlan("logo", [f"logo {textures[i % len(textures)]}" for i in range(burst)]),
+        BurstPlan("full", [f"full {textures[i % len(textures)]}" for i in range(burst)]),
+        BurstPlan("toggle", [f"toggle {'logo' if i % 2 else 'full'}" for i in range(burst)]),
+    ]
+
+
+async def send_command(page: "async_api.Page", command: str, settle_ms: int) -> dict:
+    box = page.get_by_placeholder('Try: "color #ff0000", "logo https://...", "screenshot"')
+    await box.fill(command)
+    before = await page.evaluate(f"() => ({_BOT_REPLIES})")
+    mark = await page.evaluate(_START)
+    await page.get_by_role("button", name="Send", exact=True).click()
+    await page.wait_for_function(f"(n) => ({_BOT_REPLIES}) > n", arg=before)
+    # Texture loads and R3F's frame loop commit after the click resolves.
+    await page.wait_for_timeout(settle_ms)
+    raw = await page.evaluate(_FINISH, mark)
+    raw["mark"] = mark
+    return raw
+
+
+def to_sample(kind: str, command: str, raw: dict) -> CommandSample:
+    commits = raw["commits"]
+    renders = Counter(name for c in commits for name in c["components"] if name in WATCHED)
+    durations = [c["duration"] for c in commits if c["duration"] is not None]
+    return CommandSample(
+        kind=kind,
+        command=command,
+        commits=len(commits),
+        renders=dict(renders),
+        render_ms=sum(durations) if durations else None,
+        wall_ms=(max(c["at"] for c in commits) - raw["mark"]) if commits else 0.0,
+        long_task_ms=sum(t["duration"] for t in raw["longTasks"]),
+        renderers=len({c["renderer"] for c in commits}),
+    )
+
+
+async def run(plan: list[BurstPlan], settle_ms: int) -> list[CommandSample]:
+    # Imported here so the report helpers below work without Playwright.
+    from harness.browser import browser_session, new_context
+
+    samples = []
+    async with browser_session() as browser:
+        context = await new_context(browser)
+        await context.add_init_script(_COMMIT_PROBE)
+        try:
+            page = await context.new_page()
+            await page.goto(url_for(ROUTE), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+            await page.wait_for_selector("canvas", timeout=NAVIGATION_TIMEOUT_MS)
+            for burst in plan:
+                for command in burst.commands:
+                    raw = await send_command(page, command, settle_ms)
+                    samples.append(to_sample(burst.kind, command, raw))
+        finally:
+            await context.close()
+    return samples
+
+
+def summarize_kinds(samples: list[CommandSample]) -> dict[str, dict]:
+    report = {}
+    for kind in dict.fromkeys(s.kind for s in samples):
+        ours = [s for s in samples if s.kind == kind]
+        renders = Counter()
+        for s in ours:
+            renders.update(s.renders)
+        timed = [s.render_ms for s in ours if s.render_ms is not None]
+        report[kind] = {
+            "commands": len(ours),
+            "commits_per_command": sum(s.commits for s in ours) / len(ours),
+            "renders_per_command": {name: count / len(ours) for name, count in renders.items()},
+            "render_ms": summarize(timed) if timed else None,
+            "wall_ms": summarize(s.wall_ms for s in ours),
+            "long_task_ms": sum(s.long_task_ms for s in ours),
+        }
+    return report
+
+
+def regressions(baseline: dict, current: dict, max_growth: float) -> list[str]:
+    """Kinds whose mean commits or p95 wall time grew by more than ``max_growth``."""
+    found = []
+    for kind, now in current.items():
+        before = baseline.get(kind)
+        if not before:
+            continue
+        for label, old, new in (
+            ("commits/command", before["commits_per_command"], now["commits_per_command"]),
+            ("p95 wall ms", before["wall_ms"]["p95"], now["wall_ms"]["p95"]),
+        ):
+            if old and new > old * (1 + max_growth):
+                found.append(f"{kind}: {label} {old:.1f} -> {new:.1f}")
+    return found
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--burst", type=int, default=20, help="commands per kind")
+    parser.add_argument("--settle-ms", type=int, default=150)
+    parser.add_argument("--max-commit-ms", type=float, default=None,
+                        help="fail if any command's p95 wall time to last commit exceeds this")
+    parser.add_argument("--max-renders", type=float, default=None,
+                        help="fail if a watched component renders more than this per command")
+    parser.add_argument("--baseline", type=Path, help="previous report to compare against")
+    parser.add_argument("--max-growth", type=float, default=0.25, help="allowed relative growth vs baseline")
+    args = parser.parse_args(argv)
+    if args.baseline and not args.baseline.exists():
+        parser.error(f"baseline {args.baseline} does not exist")
+    # Read before latest.json is rewritten, which may be the baseline itself.
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    samples = asyncio.run(run(default_plan(args.burst), args.settle_ms))
+    report = summarize_kinds(samples)
+    artifact_path("churn", "samples.json").write_text(json.dumps([asdict(s) for s in samples], indent=2))
+    artifact_path("churn", "latest.json").write_text(json.dumps(report, indent=2))
+
+    failures = []
+    for kind, r in report.items():
+        renders = ", ".join(f"{n} {c:.1f}" for n, c in sorted(r["renders_per_command"].items())) or "none"
+        print(f"{kind}: {r['commits_per_command']:.1f} commits/command, renders/command: {renders}")
+        print("  " + format_summary("to last commit", r["wall_ms"]))
+        if r["render_ms"]:
+            print("  " + format_summary("render", r["render_ms"]))
+        if args.max_commit_ms is not None and r["wall_ms"]["p95"] > args.max_commit_ms:
+            failures.append(f"{kind}: p95 {r['wall_ms']['p95']:.1f} ms over {args.max_commit_ms:.1f} ms")
+        if args.max_renders is not None:
+            failures += [f"{kind}: {n} renders {c:.1f}x per command" for n, c in r["renders_per_command"].items()
+                         if c > args.max_renders]
+    if baseline is not None:
+        failures += regressions(baseline, report, args.max_growth)
+    for failure in failures:
+        print(f"! {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Shared settings for harness scenarios.
+
+Every value can be overridden through an environment variable so the same
+scenarios run against a local ``next dev`` server, a production build or CI.
+"""
+
+import os
+from pathlib import Path
+
+# testsprite_tests/harness/config.py -> repository root
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+BASE_URL = os.environ.get("HARNESS_BASE_URL", "http://localhost:3000").rstrip("/")
+
+ARTIFACTS_DIR = Path(
+    os.environ.get("HARNESS_ARTIFACTS_DIR", REPO_ROOT / "testsprite_tests" / "tmp" / "harness")
+)
+
+HEADLESS = os.environ.get("HARNESS_HEADLESS", "1") != "0"
+
+# Whether the pytest plugin records events.ndjson / junit.xml by default.
+RECORD_RESULTS = os.environ.get("HARNESS_RESULTS", "0") != "0"
+
+# Same flags the generated TC scripts launch Chromium with.
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+    "--single-process",
+]
+
+# Supabase endpoint used by scenarios that talk to PostgREST directly.
+SUPABASE_URL = os.environ.get(
+    "HARNESS_SUPABASE_URL",
+    os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "http://localhost:54321"),
+).rstrip("/")
+SUPABASE_ANON_KEY = os.environ.get(
+    "HARNESS_SUPABASE_ANON_KEY", os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
+)
+# Only needed by scenarios that provision users or bypass RLS.
+SUPABASE_SERVICE_ROLE_KEY = os.environ.get(
+    "HARNESS_SUPABASE_SERVICE_ROLE_KEY", os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+)
+
+DEFAULT_TIMEOUT_MS = int(os.environ.get("HARNESS_TIMEOUT_MS", "5000"))
+NAVIGATION_TIMEOUT_MS = int(os.environ.get("HARNESS_NAVIGATION_TIMEOUT_MS", "10000"))
+
+
+def url_for(route: str) -> str:
+    """Return the absolute URL for an app route such as ``/gallery``."""
+    if route.startswith(("http://", "https://")):
+        return route
+    return f"{BASE_URL}/{route.lstrip('/')}"
+
+
+def artifact_path(*parts: str) -> Path:
+    """Return a path inside ``ARTIFACTS_DIR``, creating parent directories."""
+    path = ARTIFACTS_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,244 @@
+"""Per-route JavaScript coverage and unused-bundle report.
+
+Chromium precise (block) coverage is collected over CDP for every route and
+folded back onto Next.js chunks, so a heavy import creeping into
+``app/*/page.tsx`` shows up as wasted bytes on that route::
+
+    python -m harness.coverage --routes / /gallery /customize \\
+        --baseline tmp/harness/coverage/latest.json --max-growth 20000
+
+The report is written to ``<artifacts>/coverage/latest.json``; when a baseline
+is given, per-route deltas are printed and the exit code is non-zero if any
+route's unused bytes grew by more than ``--max-growth``.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from playwright import async_api
+
+from harness.browser import browser_session, new_context
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+
+# "page-3f9a1c2b4d5e6f70.js" -> "page.js" so hashed chunk names diff cleanly.
+_CHUNK_HASH = re.compile(r"[-.][0-9a-f]{8,}(?=\.js$)")
+
+
+@dataclass
+class ChunkUsage:
+    chunk: str
+    url: str
+    total_bytes: int
+    used_bytes: int
+
+    @property
+    def unused_bytes(self) -> int:
+        return self.total_bytes - self.used_bytes
+
+
+@dataclass
+class RouteCoverage:
+    route: str
+    chunks: list[ChunkUsage] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(c.total_bytes for c in self.chunks)
+
+    @property
+    def unused_bytes(self) -> int:
+        return sum(c.unused_bytes for c in self.chunks)
+
+    def to_dict(self) -> dict:
+        return {
+            "route": self.route,
+            "total_bytes": self.total_bytes,
+            "unused_bytes": self.unused_bytes,
+            "chunks": [
+                {**asdict(c), "unused_bytes": c.unused_bytes}
+                for c in sorted(self.chunks, key=lambda c: c.unused_bytes, reverse=True)
+            ],
+        }
+
+
+def chunk_name(url: str) -> str:
+    """Map a script URL to a stable chunk name.
+
+    ``/_next/static/chunks/app/gallery/page-<hash>.js`` becomes
+    ``app/gallery/page.js``; scripts outside ``_next`` keep their path.
+    """
+    path = urlparse(url).path
+    marker = "/_next/static/chunks/"
+    if marker in path:
+        path = path.split(marker, 1)[1]
+    elif "/_next/static/" in path:
+        path = path.split("/_next/static/", 1)[1]
+    return _CHUNK_HASH.sub("", path.lstrip("/")) or url
+
+
+def used_bytes(functions: list[dict], length: int) -> int:
+    """Count executed bytes from a CDP ``ScriptCoverage.functions`` list.
+
+    Block coverage ranges nest: a function's first range spans its body and
+    later ranges override sub-blocks. Applying ranges outer-to-inner onto a
+    byte mask resolves the nesting.
+    """
+    if length <= 0:
+        return 0
+    ranges = [r for fn in functions for r in fn["ranges"]]
+    ranges.sort(key=lambda r: (r["startOffset"], -r["endOffset"]))
+    mask = bytearray(length)
+    for r in ranges:
+        start = max(0, r["startOffset"])
+        end = min(length, r["endOffset"])
+        if end > start:
+            mask[start:end] = (b"\x01" if r["count"] > 0 else b"\x00") * (end - start)
+    return sum(mask)
+
+
+class CoverageRecorder:
+    """Collect precise coverage for a page, one checkpoint per route.
+
+    Each :meth:`collect` reports the scripts parsed since the previous
+    checkpoint, so a page that navigates client-side gets the chunks each
+    route pulled in rather than re-counting the shared runtime. Only
+    :func:`main` uses it; the pytest plugin does not record coverage.
+    """
+
+    def __init__(self, session: async_api.CDPSession):
+        self._session = session
+        self._scripts: dict[str, dict] = {}
+        self._reported: set[str] = set()
+
+    @classmethod
+    async def attach(cls, page: async_api.Page) -> "CoverageRecorder":
+        session = await page.context.new_cdp_session(page)
+        recorder = cls(session)
+        session.on("Debugger.scriptParsed", recorder._on_script_parsed)
+        await session.send("Debugger.enable")
+        await session.send("Profiler.enable")
+        await session.send(
+            "Profiler.startPreciseCoverage", {"callCount": True, "detailed": True}
+        )
+        return recorder
+
+    def _on_script_parsed(self, event: dict) -> None:
+        if event.get("url", "").startswith(("http://", "https://")):
+            self._scripts[event["scriptId"]] = event
+
+    async def collect(self, route: str) -> RouteCoverage:
+        result = await self._session.send("Profiler.takePreciseCoverage")
+        by_chunk: dict[str, ChunkUsage] = {}
+        for script in result["result"]:
+            script_id = script["scriptId"]
+            meta = self._scripts.get(script_id)
+            if meta is None or script_id in self._reported:
+                continue
+            self._reported.add(script_id)
+            name = chunk_name(meta["url"])
+            length = int(meta.get("length") or 0)
+            usage = by_chunk.setdefault(name, ChunkUsage(name, meta["url"], 0, 0))
+            usage.total_bytes += length
+            usage.used_bytes += used_bytes(script["functions"], length)
+        return RouteCoverage(route, list(by_chunk.values()))
+
+    async def detach(self) -> None:
+        try:
+            await self._session.send("Profiler.stopPreciseCoverage")
+            await self._session.detach()
+        except async_api.Error:
+            pass
+
+
+async def measure_routes(routes: list[str]) -> list[RouteCoverage]:
+    """Load each route in a fresh page and return its coverage."""
+    reports = []
+    async with browser_session() as browser:
+        context = await new_context(browser)
+        try:
+            for route in routes:
+                page = await context.new_page()
+                recorder = await CoverageRecorder.attach(page)
+                await page.goto(url_for(route), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=NAVIGATION_TIMEOUT_MS)
+                except async_api.Error:
+                    pass
+                reports.append(await recorder.collect(route))
+                await recorder.detach()
+                await page.close()
+        finally:
+            await context.close()
+    return reports
+
+
+def diff_reports(previous: dict, current: dict) -> list[dict]:
+    """Compare two saved reports route by route.
+
+    Returns one entry per route with the change in unused bytes and the
+    chunks that appeared or disappeared.
+    """
+    before = {r["route"]: r for r in previous.get("routes", [])}
+    deltas = []
+    for route in current.get("routes", []):
+        old = before.get(route["route"], {"unused_bytes": 0, "chunks": []})
+        old_chunks = {c["chunk"] for c in old["chunks"]}
+        new_chunks = {c["chunk"] for c in route["chunks"]}
+        deltas.append({
+            "route": route["route"],
+            "unused_delta": route["unused_bytes"] - old["unused_bytes"],
+            "added_chunks": sorted(new_chunks - old_chunks),
+            "removed_chunks": sorted(old_chunks - new_chunks),
+        })
+    return deltas
+
+
+def format_table(reports: list[RouteCoverage]) -> str:
+    lines = [f"{'route':<24} {'total KB':>10} {'unused KB':>10} {'unused %':>9}"]
+    for r in reports:
+        pct = 100 * r.unused_bytes / r.total_bytes if r.total_bytes else 0.0
+        lines.append(
+            f"{r.route:<24} {r.total_bytes / 1024:>10.1f} {r.unused_bytes / 1024:>10.1f} {pct:>8.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", default=["/", "/gallery", "/products", "/customize"])
+    parser.add_argument("--baseline", type=Path, help="previous report to diff against")
+    parser.add_argument("--max-growth", type=int, default=None,
+                        help="fail if a route's unused bytes grow by more than this")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+    if args.baseline and not args.baseline.exists():
+        parser.error(f"baseline {args.baseline} does not exist")
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    reports = asyncio.run(measure_routes(args.routes))
+    current = {"routes": [r.to_dict() for r in reports]}
+    output = args.output or artifact_path("coverage", "latest.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2))
+    print(format_table(reports))
+
+    if baseline is None:
+        return 0
+    failed = False
+    for delta in diff_reports(baseline, current):
+        print(f"{delta['route']:<24} {delta['unused_delta']:+d} bytes"
+              f" added={delta['added_chunks']} removed={delta['removed_chunks']}")
+        if args.max_growth is not None and delta["unused_delta"] > args.max_growth:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
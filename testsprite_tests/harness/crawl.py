@@ -0,0 +1,183 @@
+"""Route crawler: a fast smoke tier generated from ``lib/constants/routes.ts``.
+
+Every page in ``ROUTES`` is visited concurrently, anonymously and (when
+``HARNESS_USER_EMAIL``/``HARNESS_USER_PASSWORD`` are set) with a pre-seeded
+session. Each visit checks the document status, that protected routes send
+anonymous visitors to the login page and let signed-in users stay, and
+records navigation timings into a per-route latency table::
+
+    python -m harness.crawl --concurrency 6 --budget-s 60
+
+``ProtectedRoute`` redirects on the client, so protected pages are given
+``--settle-ms`` to move off their original URL before the final path is read.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
+
+from harness.auth import USER_EMAIL, authenticated_context
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.routes import RouteTable, load_routes
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+LOGIN_PATH = "/auth/login"
+DEFAULT_SETTLE_MS = 4000
+
+_NAV_TIMINGS = """
+() => {
+  const nav = performance.getEntriesByType("navigation")[0];
+  return nav ? {
+    ttfb: nav.responseStart,
+    dcl: nav.domContentLoadedEventEnd,
+    load: nav.loadEventEnd,
+  } : {};
+}
+"""
+
+
+@dataclass
+class Visit:
+    route: str
+    persona: str
+    status: Optional[int]
+    final_path: Optional[str]
+    ttfb_ms: Optional[float]
+    dcl_ms: Optional[float]
+    load_ms: Optional[float]
+    wall_ms: float
+    ok: bool = True
+    reason: str = ""
+
+
+def failure_reason(route: str, status: Optional[int], final_path: str, expect_redirect: bool) -> str:
+    """Why a visit that loaded failed, or ``""`` if it passed."""
+    if status is not None and status >= 400:
+        return f"HTTP {status}"
+    if expect_redirect and not final_path.startswith(LOGIN_PATH):
+        return f"expected redirect to {LOGIN_PATH}, stayed on {final_path}"
+    if not expect_redirect and final_path != route:
+        return f"unexpected redirect to {final_path}"
+    return ""
+
+
+async def visit(
+    context: "async_api.BrowserContext",
+    route: str,
+    persona: str,
+    expect_redirect: bool = False,
+    settle_ms: int = DEFAULT_SETTLE_MS,
+) -> Visit:
+    """Load ``route`` in a new page and record where it ends up and how fast.
+
+    With ``expect_redirect`` the page is given ``settle_ms`` to leave
+    ``route``; otherwise it is given the same time to prove it stays.
+    """
+    from playwright import async_api
+
+    page = await context.new_page()
+    started = time.perf_counter()
+    status = None
+    try:
+        response = await page.goto(url_for(route), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+        status = response.status if response else None
+        try:
+            await page.wait_for_url(lambda url: urlparse(url).path != route, timeout=settle_ms)
+        except async_api.Error:
+            pass
+        timings = await page.evaluate(_NAV_TIMINGS)
+        final_path = urlparse(page.url).path
+        result = Visit(route, persona, status, final_path, timings.get("ttfb"), timings.get("dcl"),
+                       timings.get("load"), (time.perf_counter() - started) * 1000)
+    except async_api.Error as error:
+        return Visit(route, persona, status, None, None, None, None,
+                     (time.perf_counter() - started) * 1000, False, str(error).splitlines()[0])
+    finally:
+        await page.close()
+
+    result.reason = failure_reason(route, status, final_path, expect_redirect)
+    result.ok = not result.reason
+    return result
+
+
+async def crawl(
+    table: RouteTable,
+    concurrency: int,
+    settle_ms: int,
+    authenticated: bool,
+) -> list[Visit]:
+    # Imported here so the report helpers work without Playwright.
+    from harness.browser import browser_session, new_context
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(context, route, persona, expect_redirect):
+        async with semaphore:
+            return await visit(context, route, persona, expect_redirect, settle_ms)
+
+    async with browser_session() as browser:
+        contexts = {"anonymous": await new_context(browser)}
+        if authenticated:
+            contexts["authenticated"] = await authenticated_context(browser)
+        try:
+            jobs = []
+            for persona, context in contexts.items():
+                for route in table.pages:
+                    expect_redirect = persona == "anonymous" and route in table.protected
+                    jobs.append(bounded(context, route, persona, expect_redirect))
+            return await asyncio.gather(*jobs)
+        finally:
+            for context in contexts.values():
+                await context.close()
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def format_table(visits: list[Visit]) -> str:
+    lines = [f"{'route':<20} {'persona':<14} {'status':>6} {'ttfb':>6} {'dcl':>6} {'load':>6} "
+             f"{'wall':>6}  result"]
+    for v in sorted(visits, key=lambda v: (v.route, v.persona)):
+        lines.append(
+            f"{v.route:<20} {v.persona:<14} {v.status or '-':>6} {_ms(v.ttfb_ms):>6} {_ms(v.dcl_ms):>6} "
+            f"{_ms(v.load_ms):>6} {_ms(v.wall_ms):>6}  {'ok' if v.ok else 'FAIL ' + v.reason}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--settle-ms", type=int, default=DEFAULT_SETTLE_MS)
+    parser.add_argument("--budget-s", type=float, default=60.0, help="fail if the crawl takes longer")
+    parser.add_argument("--anonymous-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    table = load_routes()
+    started = time.perf_counter()
+    visits = asyncio.run(crawl(
+        table, args.concurrency, args.settle_ms,
+        authenticated=bool(USER_EMAIL) and not args.anonymous_only,
+    ))
+    elapsed = time.perf_counter() - started
+
+    artifact_path("crawl", "latest.json").write_text(json.dumps([asdict(v) for v in visits], indent=2))
+    print(format_table(visits))
+    print(f"{len(visits)} visits in {elapsed:.1f}s")
+    failed = [v for v in visits if not v.ok]
+    if elapsed > args.budget_s:
+        print(f"smoke tier exceeded its {args.budget_s:.0f}s budget")
+        return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Dashboard aggregate-cost benchmark.
+
+``fetchDashboardData`` in ``app/dashboard/page.tsx`` selects every
+``saved_outfits`` row of the user only to show ``outfits.length`` and
+``outfits.slice(0, 3)``. This benchmark seeds users with increasing outfit
+counts and measures, per size:
+
+* the query shapes at the API layer, signed as the user:
+
+  ``full``          ``select=*&user_id=eq.<id>`` (what the page does)
+  ``count``         ``HEAD`` with ``Prefer: count=exact``
+  ``top_n``         ``select=*&order=created_at.desc&limit=3``
+  ``count_top_n``   ``top_n`` plus ``count=exact``: both answers, one request
+
+* the real page in the browser: time from navigation to the outfit
+  response plus a quiet main thread (time-to-interactive), the response
+  payload and the JS heap afterwards::
+
+    python -m harness.dashboard --sizes 10 1000 10000 50000
+
+PostgREST caps responses at its ``max-rows`` setting (1000 on Supabase), so
+``full`` also reports how many rows actually came back: beyond the cap the
+dashboard's total is silently wrong, not just slow.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Optional
+
+from harness.auth import authenticated_context, mint_jwt
+from harness.config import NAVIGATION_TIMEOUT_MS, SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, artifact_path, url_for
+from harness.factory import FactoryUser, RestFactory, provisioned
+from harness.postgrest import PostgrestClient
+from harness.stats import summarize
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 50000]
+SEED_CHUNK = 1000
+TOP_N = 3
+QUIET_MS = 500
+
+SHAPES = {
+    "full": ("GET", {}, {}),
+    "count": ("HEAD", {"select": "id"}, {"Prefer": "count=exact"}),
+    "top_n": ("GET", {"order": "created_at.desc", "limit": str(TOP_N)}, {}),
+    "count_top_n": ("GET", {"order": "created_at.desc", "limit": str(TOP_N)}, {"Prefer": "count=exact"}),
+}
+
+_LONG_TASKS = """
+(() => {
+  window.__harnessLongTasks = [];
+  try {
+    new PerformanceObserver((list) => {
+      for (const e of list.getEntries()) window.__harnessLongTasks.push(e.startTime + e.duration);
+    }).observe({ type: "longtask", buffered: true });
+  } catch (e) {}
+})();
+"""
+
+
+@dataclass
+class ShapeResult:
+    size: int
+    shape: str
+    p50_ms: float
+    p95_ms: float
+    bytes: int
+    rows: Optional[int]
+    total: Optional[int]
+
+
+@dataclass
+class PageResult:
+    size: int
+    tti_ms: Optional[float]
+    payload_bytes: Optional[int]
+    js_heap_mb: Optional[float]
+
+
+def seed_outfits(make: RestFactory, user: FactoryUser, count: int) -> None:
+    for start in range(0, count, SEED_CHUNK):
+        rows = [{"user_id": user.id, "name": f"Outfit {n}", "description": "Dashboard benchmark outfit"}
+                for n in range(start, min(start + SEED_CHUNK, count))]
+        resp = make.admin.insert("saved_outfits", rows, returning=False)
+        if resp.status >= 400:
+            raise RuntimeError(f"seeding outfits failed: HTTP {resp.status} {resp.body}")
+
+
+def _total(headers: dict[str, str]) -> Optional[int]:
+    """``Content-Range: 0-2/50000`` -> 50000."""
+    value = headers.get("Content-Range") or headers.get("content-range") or ""
+    tail = value.rpartition("/")[2]
+    return int(tail) if tail.isdigit() else None
+
+
+def measure_shapes(user: FactoryUser, size: int, repeats: int) -> list[ShapeResult]:
+    client = PostgrestClient(api_key=SUPABASE_ANON_KEY, access_token=mint_jwt(user.id, email=user.email))
+    results = []
+    for shape, (method, params, headers) in SHAPES.items():
+        timings, last = [], None
+        for _ in range(repeats):
+            last = client.request(method, "rest/v1/saved_outfits",
+                                  {"select": "*", **params, "user_id": f"eq.{user.id}"}, headers=headers)
+            timings.append(last.elapsed_ms)
+        summary = summarize(timings)
+        rows = len(last.body) if isinstance(last.body, list) else None
+        results.append(ShapeResult(size, shape, summary["p50"], summary["p95"], last.bytes, rows,
+                                   _total(last.headers)))
+    return results
+
+
+async def measure_page(browser: "async_api.Browser", session: dict, size: int) -> PageResult:
+    from playwright import async_api
+
+    context = await authenticated_context(browser, session)
+    await context.add_init_script(_LONG_TASKS)
+    try:
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        started = time.perf_counter()
+        async with page.expect_response(lambda r: "/rest/v1/saved_outfits" in r.url,
+                                        timeout=NAVIGATION_TIMEOUT_MS * 3) as response_info:
+            await page.goto(url_for("/dashboard"), wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+        response = await response_info.value
+        payload = len(await response.body())
+        # Interactive once no long task has ended for QUIET_MS.
+        await page.wait_for_function(
+            f"""() => {{
+              const last = Math.max(0, ...window.__harnessLongTasks);
+              return performance.now() - last > {QUIET_MS};
+            }}""",
+            timeout=NAVIGATION_TIMEOUT_MS * 3,
+            polling=100,
+        )
+        tti = (time.perf_counter() - started) * 1000 - QUIET_MS
+        metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        heap = metrics.get("JSHeapUsedSize")
+        return PageResult(size, tti, payload, heap / 1024 / 1024 if heap is not None else None)
+    except async_api.Error:
+        return PageResult(size, None, None, None)
+    finally:
+        await context.close()
+
+
+async def measure_pages(sessions: dict[int, dict]) -> list[PageResult]:
+    # Playwright is only needed here, so --no-browser runs without it.
+    from harness.browser import browser_session
+
+    async with browser_session() as browser:
+        return [await measure_page(browser, session, size) for size, session in sessions.items()]
+
+
+def _fmt(value, spec: str) -> str:
+    return format(value, spec) if value is not None else "-"
+
+
+def format_table(shapes: list[ShapeResult], pages: list[PageResult]) -> str:
+    lines = [f"{'outfits':>8} {'shape':<12} {'p50 ms':>8} {'p95 ms':>8} {'bytes':>10} {'rows':>6} {'total':>7}"]
+    for r in shapes:
+        lines.append(f"{r.size:>8} {r.shape:<12} {r.p50_ms:>8.1f} {r.p95_ms:>8.1f} {r.bytes:>10} "
+                     f"{_fmt(r.rows, 'd'):>6} {_fmt(r.total, 'd'):>7}")
+    if pages:
+        lines += ["", f"{'outfits':>8} {'tti ms':>8} {'payload':>10} {'heap MB':>8}"]
+        for p in pages:
+            lines.append(f"{p.size:>8} {_fmt(p.tti_ms, '.0f'):>8} {_fmt(p.payload_bytes, 'd'):>10} "
+                         f"{_fmt(p.js_heap_mb, '.1f'):>8}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=20, help="requests per query shape")
+    parser.add_argument("--no-browser", action="store_true", help="skip the page measurements")
+    args = parser.parse_args(argv)
+
+    if not SUPABASE_SERVICE_ROLE_KEY:
+        print("seeding needs HARNESS_SUPABASE_SERVICE_ROLE_KEY")
+        return 2
+
+    shapes, pages = [], []
+    with provisioned() as make:
+        sessions = {}
+        for size in args.sizes:
+            user = make.user(f"dash{size}", onboarded=True)
+            seed_outfits(make, user, size)
+            shapes += measure_shapes(user, size, args.repeats)
+            if not args.no_browser:
+                sessions[size] = make.session(user)
+        if sessions:
+            pages = asyncio.run(measure_pages(sessions))
+
+    artifact_path("dashboard", "latest.json").write_text(json.dumps({
+        "shapes": [asdict(r) for r in shapes],
+        "pages": [asdict(p) for p in pages],
+    }, indent=2))
+    print(format_table(shapes, pages))
+    truncated = [r for r in shapes if r.shape == "full" and r.rows is not None and r.rows < r.size]
+    for r in truncated:
+        print(f"! full select returned {r.rows} of {r.size} outfits; the dashboard total is wrong")
+    return 1 if truncated else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
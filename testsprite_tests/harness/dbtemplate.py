@@ -0,0 +1,254 @@
+"""Template-database provisioning: build the schema once, clone it per worker.
+
+Replaying ``scripts/00-complete-database-setup.sql`` and migrations 05-20
+takes far longer than the tests that need them. Instead the scripts are
+applied once into a Postgres template database named after a hash of the
+scripts it applies, and each worker gets ``CREATE DATABASE ... TEMPLATE``
+of it, which is a file-level copy taking milliseconds::
+
+    python -m harness.dbtemplate ensure          # build if the scripts changed
+    python -m harness.dbtemplate clone --workers 4
+    python -m harness.dbtemplate drop-clones
+    python -m harness.dbtemplate prune           # remove outdated templates
+
+From Python, ``worker_database("gw0")`` yields a connection URL for a fresh
+clone and drops it afterwards; pair it with ``harness.factory.isolated``.
+
+Templates are built from ``template0``, which has no Supabase ``auth`` or
+``storage`` schemas, so a small bootstrap creates the roles, tables and
+functions the scripts reference (``auth.users``, ``auth.uid()``,
+``storage.objects`` ...). Clones are meant for database-level tests; GoTrue
+and PostgREST keep pointing at the real database.
+
+Concurrent ``ensure`` calls are serialised with an advisory lock, and a
+template only gets its final name once every script has applied, so a
+failed build never leaves a half-built template behind.
+"""
+
+import argparse
+import hashlib
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from harness.config import REPO_ROOT
+from harness.db import DATABASE_URL, connect
+
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+# 01-04 are folded into 00-complete-database-setup.sql.
+SCRIPT_ORDER = ["00-complete-database-setup.sql"] + [f"{n:02d}-" for n in range(5, 21)]
+TEMPLATE_PREFIX = "harness_tpl_"
+CLONE_PREFIX = "harness_db_"
+_LOCK_KEY = 0x4841524E  # "HARN"
+
+BOOTSTRAP_SQL = """
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN CREATE ROLE anon NOLOGIN; END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN CREATE ROLE authenticated NOLOGIN; END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    CREATE ROLE service_role NOLOGIN BYPASSRLS;
+  END IF;
+END $$;
+
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE IF NOT EXISTS auth.users (
+  id uuid PRIMARY KEY,
+  email text,
+  aud text,
+  role text,
+  encrypted_password text,
+  email_confirmed_at timestamptz,
+  raw_app_meta_data jsonb DEFAULT '{}'::jsonb,
+  raw_user_meta_data jsonb DEFAULT '{}'::jsonb,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS $$
+  SELECT nullif(coalesce(current_setting('request.jwt.claim.sub', true),
+                         current_setting('request.jwt.claims', true)::jsonb ->> 'sub'), '')::uuid
+$$;
+CREATE OR REPLACE FUNCTION auth.role() RETURNS text LANGUAGE sql STABLE AS $$
+  SELECT nullif(coalesce(current_setting('request.jwt.claim.role', true),
+                         current_setting('request.jwt.claims', true)::jsonb ->> 'role'), '')::text
+$$;
+CREATE OR REPLACE FUNCTION auth.jwt() RETURNS jsonb LANGUAGE sql STABLE AS $$
+  SELECT coalesce(nullif(current_setting('request.jwt.claims', true), ''), '{}')::jsonb
+$$;
+
+CREATE SCHEMA IF NOT EXISTS storage;
+CREATE TABLE IF NOT EXISTS storage.buckets (
+  id text PRIMARY KEY,
+  name text NOT NULL,
+  owner uuid,
+  public boolean DEFAULT false,
+  file_size_limit bigint,
+  allowed_mime_types text[],
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS storage.objects (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  bucket_id text REFERENCES storage.buckets (id),
+  name text,
+  owner uuid,
+  metadata jsonb,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now()
+);
+CREATE OR REPLACE FUNCTION storage.foldername(name text) RETURNS text[] LANGUAGE sql IMMUTABLE AS $$
+  SELECT (string_to_array(name, '/'))[1:array_length(string_to_array(name, '/'), 1) - 1]
+$$;
+
+GRANT USAGE ON SCHEMA auth, storage TO anon, authenticated, service_role;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA auth TO anon, authenticated, service_role;
+GRANT ALL ON ALL TABLES IN SCHEMA storage TO anon, authenticated, service_role;
+"""
+
+
+class TemplateError(RuntimeError):
+    pass
+
+
+def migration_scripts() -> list:
+    """The scripts applied to a template, in order."""
+    files = sorted(SCRIPTS_DIR.glob("*.sql"))
+    return [f for prefix in SCRIPT_ORDER for f in files if f.name.startswith(prefix)]
+
+
+def schema_hash() -> str:
+    """Hash of the bootstrap and the applied scripts (name and contents).
+
+    01-04 are not applied, so editing them does not rebuild the template.
+    """
+    digest = hashlib.sha256(BOOTSTRAP_SQL.encode())
+    for path in migration_scripts():
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def template_name(digest: Optional[str] = None) -> str:
+    return f"{TEMPLATE_PREFIX}{digest or schema_hash()}"
+
+
+def clone_name(worker: str) -> str:
+    return f"{CLONE_PREFIX}{worker}"
+
+
+def database_url(name: str, base_url: str = DATABASE_URL) -> str:
+    """``base_url`` with the database name replaced."""
+    from psycopg.conninfo import make_conninfo
+
+    return make_conninfo(base_url, dbname=name)
+
+
+def _databases(conn, prefix: str) -> list[str]:
+    # Not LIKE: "_" in the prefixes would match any character.
+    rows = conn.execute("SELECT datname FROM pg_database WHERE starts_with(datname, %s)", (prefix,)).fetchall()
+    return [r[0] for r in rows]
+
+
+def _drop(conn, name: str) -> None:
+    conn.execute(f'ALTER DATABASE "{name}" WITH IS_TEMPLATE false')
+    conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+
+
+def _build(conn, name: str) -> None:
+    building = f"{name}_building"
+    if building in _databases(conn, building):
+        _drop(conn, building)
+    conn.execute(f'CREATE DATABASE "{building}" TEMPLATE template0')
+    try:
+        with connect(database_url(building)) as target:
+            target.execute(BOOTSTRAP_SQL)
+            for script in migration_scripts():
+                try:
+                    target.execute(script.read_text())
+                except Exception as error:
+                    raise TemplateError(f"{script.name}: {str(error).splitlines()[0]}") from error
+    except BaseException:
+        _drop(conn, building)
+        raise
+    conn.execute(f'ALTER DATABASE "{building}" RENAME TO "{name}"')
+    # No connections means CREATE DATABASE ... TEMPLATE never waits on one.
+    conn.execute(f'ALTER DATABASE "{name}" WITH IS_TEMPLATE true ALLOW_CONNECTIONS false')
+
+
+def ensure_template() -> str:
+    """Return the current template's name, building it if the scripts changed."""
+    name = template_name()
+    with connect() as conn:
+        conn.execute("SELECT pg_advisory_lock(%s)", (_LOCK_KEY,))
+        try:
+            if name not in _databases(conn, name):
+                _build(conn, name)
+        finally:
+            conn.execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+    return name
+
+
+def clone(worker: str, template: Optional[str] = None) -> str:
+    """Create (or recreate) ``worker``'s database from the template; returns its URL."""
+    template = template or ensure_template()
+    name = clone_name(worker)
+    with connect() as conn:
+        conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+        conn.execute(f'CREATE DATABASE "{name}" TEMPLATE "{template}"')
+    return database_url(name)
+
+
+def drop_clone(worker: str) -> None:
+    with connect() as conn:
+        conn.execute(f'DROP DATABASE IF EXISTS "{clone_name(worker)}" WITH (FORCE)')
+
+
+@contextmanager
+def worker_database(worker: str) -> Iterator[str]:
+    """Yield a connection URL for a fresh clone, dropped on exit."""
+    url = clone(worker)
+    try:
+        yield url
+    finally:
+        drop_clone(worker)
+
+
+def prune() -> list[str]:
+    """Drop templates built from older scripts; returns their names."""
+    current = template_name()
+    with connect() as conn:
+        stale = [n for n in _databases(conn, TEMPLATE_PREFIX) if n != current]
+        for name in stale:
+            _drop(conn, name)
+    return stale
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ensure")
+    clone_cmd = commands.add_parser("clone")
+    clone_cmd.add_argument("--workers", type=int, default=1)
+    commands.add_parser("drop-clones")
+    commands.add_parser("prune")
+    args = parser.parse_args(argv)
+
+    if args.command == "ensure":
+        print(ensure_template())
+    elif args.command == "clone":
+        template = ensure_template()
+        for i in range(args.workers):
+            print(clone(f"gw{i}", template))
+    elif args.command == "drop-clones":
+        with connect() as conn:
+            for name in _databases(conn, CLONE_PREFIX):
+                conn.execute(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)')
+                print(f"dropped {name}")
+    else:
+        for name in prune():
+            print(f"dropped {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
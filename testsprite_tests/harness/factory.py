@@ -0,0 +1,215 @@
+"""Per-test data factory with namespaced rows and guaranteed cleanup.
+
+The TC scripts share fixed accounts (``validuser@example.com``,
+``testuser@example.com``, ``userA@example.com``), so a registration test
+collides with whatever an earlier run left behind and nothing can run in
+parallel. A factory instead gives each test its own namespace: every user
+it creates gets an email like ``harness+<namespace>-<label>@example.com``
+and every row it creates hangs off those users.
+
+Two isolation strategies:
+
+``isolated(conn)``  database-level tests. Rows are written inside one
+                    transaction that is rolled back on exit, so nothing is
+                    ever committed and cleanup is free::
+
+                        with connect() as conn, isolated(conn) as make:
+                            user = make.user("buyer")
+                            make.cart_item(user, make.product(), quantity=2)
+
+``provisioned()``   browser tests, which need committed data the app can
+                    read. Users come from the GoTrue admin API (so they can
+                    sign in), rows are written with the service-role key,
+                    and on exit the users are deleted, which cascades to
+                    their avatars, carts and outfits::
+
+                        with provisioned() as make:
+                            user = make.user("shopper", onboarded=True)
+                            make.outfit(user, items=3)
+                            state = storage_state_for(make.session(user))
+"""
+
+import json
+import secrets
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from harness.auth import create_user, delete_user, password_grant
+from harness.config import SUPABASE_SERVICE_ROLE_KEY
+from harness.postgrest import PostgrestClient
+
+
+def new_namespace() -> str:
+    return secrets.token_hex(4)
+
+
+@dataclass
+class FactoryUser:
+    id: str
+    email: str
+    password: str
+
+
+class DataFactory(ABC):
+    """Builds related rows for one test; subclasses decide where they go."""
+
+    def __init__(self, namespace: Optional[str] = None):
+        self.namespace = namespace or new_namespace()
+
+    def email(self, label: str) -> str:
+        return f"harness+{self.namespace}-{label}@example.com"
+
+    @abstractmethod
+    def _insert(self, table: str, row: dict) -> dict:
+        """Insert ``row`` into ``table`` and return it as stored."""
+
+    @abstractmethod
+    def _create_user(self, email: str, password: str, full_name: str) -> str:
+        """Create an auth user and return its id."""
+
+    @abstractmethod
+    def _upsert_profile(self, profile: dict) -> None:
+        """Insert or update the ``profiles`` row for a user."""
+
+    def user(self, label: str = "user", onboarded: bool = False) -> FactoryUser:
+        email = self.email(label)
+        password = secrets.token_urlsafe(16)
+        full_name = f"Harness {label.title()}"
+        user_id = self._create_user(email, password, full_name)
+        self._upsert_profile({"id": user_id, "email": email, "full_name": full_name,
+                              "onboarding_completed": onboarded})
+        return FactoryUser(user_id, email, password)
+
+    def product(self, **overrides) -> dict:
+        row = {"name": f"Harness product {self.namespace}", "price": 49.99,
+               "stock_quantity": 100, "is_active": True, **overrides}
+        return self._insert("products", row)
+
+    def avatar(self, user: FactoryUser, **overrides) -> dict:
+        row = {"user_id": user.id, "name": f"Avatar {self.namespace}",
+               "measurements": {"height": 175}, "is_default": True, **overrides}
+        return self._insert("avatars", row)
+
+    def cart_item(self, user: FactoryUser, product: Optional[dict] = None, quantity: int = 1) -> dict:
+        product = product or self.product()
+        return self._insert("cart_items", {"user_id": user.id, "product_id": product["id"], "quantity": quantity})
+
+    def outfit(self, user: FactoryUser, items: int = 0, **overrides) -> dict:
+        outfit = self._insert("saved_outfits", {"user_id": user.id, "name": f"Outfit {self.namespace}",
+                                                "is_public": False, **overrides})
+        for position in range(items):
+            self._insert("outfit_items", {"outfit_id": outfit["id"], "product_id": self.product()["id"],
+                                          "position_data": {"slot": position}})
+        return outfit
+
+
+class SqlFactory(DataFactory):
+    """Writes straight to Postgres on ``conn``; pair with :func:`isolated`."""
+
+    def __init__(self, conn, namespace: Optional[str] = None):
+        super().__init__(namespace)
+        self.conn = conn
+
+    def _insert(self, table: str, row: dict) -> dict:
+        cols = list(row)
+        values = [json.dumps(v) if isinstance(v, (dict, list)) else v for v in row.values()]
+        result = self.conn.execute(
+            f"INSERT INTO public.{table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))}) "
+            f"RETURNING to_jsonb({table}.*)",
+            values,
+        ).fetchone()
+        return result[0]
+
+    def _create_user(self, email: str, password: str, full_name: str) -> str:
+        # Database-level users cannot sign in; browser tests use provisioned().
+        user_id = str(uuid.uuid4())
+        self.conn.execute(
+            "INSERT INTO auth.users (id, email, aud, role, raw_user_meta_data) "
+            "VALUES (%s, %s, 'authenticated', 'authenticated', %s)",
+            (user_id, email, json.dumps({"full_name": full_name})),
+        )
+        return user_id
+
+    def _upsert_profile(self, profile: dict) -> None:
+        cols = list(profile)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c != "id")
+        self.conn.execute(
+            f"INSERT INTO public.profiles ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {updates}",
+            list(profile.values()),
+        )
+
+
+class RestFactory(DataFactory):
+    """Commits through GoTrue and PostgREST; :meth:`close` removes it all."""
+
+    def __init__(self, namespace: Optional[str] = None):
+        super().__init__(namespace)
+        self.admin = PostgrestClient(api_key=SUPABASE_SERVICE_ROLE_KEY)
+        self.user_ids: list[str] = []
+        self.product_ids: list[str] = []
+
+    def _insert(self, table: str, row: dict) -> dict:
+        resp = self.admin.insert(table, row)
+        if resp.status >= 400:
+            raise RuntimeError(f"inserting into {table} failed: HTTP {resp.status} {resp.body}")
+        created = resp.body[0]
+        if table == "products":
+            self.product_ids.append(created["id"])
+        return created
+
+    def _create_user(self, email: str, password: str, full_name: str) -> str:
+        user_id = create_user(email, password, {"full_name": full_name})["id"]
+        self.user_ids.append(user_id)
+        return user_id
+
+    def _upsert_profile(self, profile: dict) -> None:
+        resp = self.admin.request("POST", "rest/v1/profiles", body=profile,
+                                  headers={"Prefer": "resolution=merge-duplicates,return=minimal"})
+        if resp.status >= 400:
+            raise RuntimeError(f"upserting profile {profile['id']} failed: HTTP {resp.status} {resp.body}")
+
+    def session(self, user: FactoryUser) -> dict:
+        return password_grant(user.email, user.password)
+
+    def close(self) -> None:
+        """Attempt every delete, then raise once if any of them failed."""
+        errors = []
+        for user_id in reversed(self.user_ids):
+            try:
+                delete_user(user_id)
+            except Exception as error:
+                errors.append(f"user {user_id}: {error}")
+        if self.product_ids:
+            # Products go last: users' cart and outfit rows reference them.
+            try:
+                resp = self.admin.delete("products", {"id": f"in.({','.join(self.product_ids)})"})
+            except Exception as error:
+                errors.append(f"products: {error}")
+            else:
+                if resp.status >= 400:
+                    errors.append(f"products: HTTP {resp.status} {resp.body}")
+        self.user_ids.clear()
+        self.product_ids.clear()
+        if errors:
+            raise RuntimeError(f"cleaning up namespace {self.namespace} failed: " + "; ".join(errors))
+
+
+@contextmanager
+def isolated(conn, namespace: Optional[str] = None) -> Iterator[SqlFactory]:
+    """Yield a :class:`SqlFactory` whose writes are rolled back on exit."""
+    with conn.transaction(force_rollback=True):
+        yield SqlFactory(conn, namespace)
+
+
+@contextmanager
+def provisioned(namespace: Optional[str] = None) -> Iterator[RestFactory]:
+    """Yield a :class:`RestFactory` and delete everything it created on exit."""
+    factory = RestFactory(namespace)
+    try:
+        yield factory
+    finally:
+        factory.close()
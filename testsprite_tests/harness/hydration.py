@@ -0,0 +1,227 @@
+"""Hydration timing and hydration-mismatch detection for Next.js pages.
+
+Timing comes from a stub ``__REACT_DEVTOOLS_GLOBAL_HOOK__`` installed before
+any app script runs: React reports its first root commit to the hook, which
+is the moment hydration finishes. Long tasks observed before that commit are
+recorded alongside, so slow hydration can be told apart from a slow network.
+
+React's hydration warnings are captured from the console and turned into
+structured issues tied to the route and, where React prints a component
+diff, the innermost component named in it::
+
+    python -m harness.hydration --routes / /auth/login /auth/forgot-password
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from playwright import async_api
+
+from harness.browser import browser_session, new_context
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+
+_HYDRATION_PROBE = """
+(() => {
+  const state = { hydratedAt: null, commits: 0, longTasks: [] };
+  window.__harnessHydration = state;
+  const existing = window.__REACT_DEVTOOLS_GLOBAL_HOOK__;
+  if (!existing) {
+    let nextId = 1;
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+      supportsFiber: true,
+      renderers: new Map(),
+      inject(renderer) { const id = nextId++; this.renderers.set(id, renderer); return id; },
+      checkDCE() {},
+      onScheduleFiberRoot() {},
+      onCommitFiberUnmount() {},
+      onPostCommitFiberRoot() {},
+      onCommitFiberRoot() {
+        state.commits += 1;
+        if (state.hydratedAt === null) state.hydratedAt = performance.now();
+      },
+    };
+  }
+  try {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) {
+        state.longTasks.push({ start: entry.startTime, duration: entry.duration });
+      }
+    }).observe({ type: "longtask", buffered: true });
+  } catch (e) {}
+})();
+"""
+
+_READ_TIMINGS = """
+() => {
+  const nav = performance.getEntriesByType("navigation")[0];
+  const state = window.__harnessHydration || {};
+  return {
+    responseStart: nav ? nav.responseStart : null,
+    domContentLoaded: nav ? nav.domContentLoadedEventEnd : null,
+    hydratedAt: state.hydratedAt ?? null,
+    commits: state.commits || 0,
+    longTasks: state.longTasks || [],
+  };
+}
+"""
+
+HYDRATION_WARNINGS = (
+    "A tree hydrated but some attributes of the server rendered HTML didn't match",
+    "Hydration failed because",
+    "There was an error while hydrating",
+    "Text content does not match server-rendered HTML",
+    "Expected server HTML to contain a matching",
+    "did not match. Server:",
+)
+
+# Lines of React's component diff look like "      <GalleryGrid>" or "+  <div".
+_DIFF_COMPONENT = re.compile(r"^[\s+\-]*<([A-Z][\w.$]*)")
+
+
+@dataclass
+class HydrationIssue:
+    route: str
+    component: Optional[str]
+    message: str
+
+
+@dataclass
+class HydrationTiming:
+    route: str
+    ttfb_ms: Optional[float]
+    hydrated_ms: Optional[float]
+    first_byte_to_hydration_ms: Optional[float]
+    long_task_ms_before_hydration: float
+    commits: int
+    issues: list[HydrationIssue] = field(default_factory=list)
+
+    @property
+    def hydrated(self) -> bool:
+        return self.hydrated_ms is not None
+
+
+def is_hydration_warning(text: str) -> bool:
+    return any(marker in text for marker in HYDRATION_WARNINGS)
+
+
+def component_from_warning(text: str) -> Optional[str]:
+    """Return the innermost component in React's hydration diff, if any."""
+    component = None
+    for line in text.splitlines():
+        match = _DIFF_COMPONENT.match(line)
+        if match:
+            component = match.group(1)
+    return component
+
+
+class HydrationProbe:
+    """Install on a context, then :meth:`measure` each page after navigation."""
+
+    def __init__(self):
+        self._messages: dict[async_api.Page, list[str]] = {}
+
+    async def install(self, context: async_api.BrowserContext) -> None:
+        await context.add_init_script(_HYDRATION_PROBE)
+        context.on("page", self._watch)
+        for page in context.pages:
+            self._watch(page)
+
+    def _watch(self, page: async_api.Page) -> None:
+        messages = self._messages.setdefault(page, [])
+
+        def on_console(msg: async_api.ConsoleMessage) -> None:
+            if msg.type in ("error", "warning") and is_hydration_warning(msg.text):
+                messages.append(msg.text)
+
+        def on_page_error(error: async_api.Error) -> None:
+            if is_hydration_warning(str(error)):
+                messages.append(str(error))
+
+        page.on("console", on_console)
+        page.on("pageerror", on_page_error)
+
+    async def measure(self, page: async_api.Page, route: str, timeout_ms: int = 10000) -> HydrationTiming:
+        try:
+            await page.wait_for_function(
+                "() => window.__harnessHydration && window.__harnessHydration.hydratedAt !== null",
+                timeout=timeout_ms,
+            )
+        except async_api.Error:
+            pass
+        raw = await page.evaluate(_READ_TIMINGS)
+        hydrated = raw["hydratedAt"]
+        ttfb = raw["responseStart"]
+        blocking = sum(
+            t["duration"] for t in raw["longTasks"] if hydrated is None or t["start"] < hydrated
+        )
+        issues = [
+            HydrationIssue(route, component_from_warning(text), text.splitlines()[0])
+            for text in self._messages.get(page, [])
+        ]
+        self._messages[page] = []
+        return HydrationTiming(
+            route=route,
+            ttfb_ms=ttfb,
+            hydrated_ms=hydrated,
+            first_byte_to_hydration_ms=(hydrated - ttfb) if hydrated is not None and ttfb is not None else None,
+            long_task_ms_before_hydration=blocking,
+            commits=raw["commits"],
+            issues=issues,
+        )
+
+
+async def measure_routes(routes: list[str]) -> list[HydrationTiming]:
+    results = []
+    async with browser_session() as browser:
+        context = await new_context(browser)
+        probe = HydrationProbe()
+        await probe.install(context)
+        try:
+            for route in routes:
+                page = await context.new_page()
+                await page.goto(url_for(route), wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+                results.append(await probe.measure(page, route))
+                await page.close()
+        finally:
+            await context.close()
+    return results
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+",
+                        default=["/", "/auth/login", "/auth/forgot-password", "/gallery"])
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail routes whose first-byte-to-hydration exceeds this")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(measure_routes(args.routes))
+    output = artifact_path("hydration", "latest.json")
+    output.write_text(json.dumps([asdict(r) for r in results], indent=2))
+
+    failed = False
+    print(f"{'route':<28} {'ttfb':>8} {'hydrated':>9} {'ttfb->hyd':>10} {'long tasks':>11} issues")
+    for r in results:
+        print(f"{r.route:<28} {_ms(r.ttfb_ms):>8} {_ms(r.hydrated_ms):>9} "
+              f"{_ms(r.first_byte_to_hydration_ms):>10} {r.long_task_ms_before_hydration:>11.0f} {len(r.issues)}")
+        for issue in r.issues:
+            print(f"  ! {issue.component or '?'}: {issue.message}")
+        over_budget = (
+            args.budget_ms is not None
+            and (r.first_byte_to_hydration_ms is None or r.first_byte_to_hydration_ms > args.budget_ms)
+        )
+        failed = failed or bool(r.issues) or over_budget
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Bounded, streaming capture of console and network logs per test.
+
+Every console message, page error and request/response is written as one
+JSON line to ``<artifacts>/logs/<test_id>.ndjson.gz`` as it happens, so
+memory use stays flat however long a test runs. Only the last ``tail_size``
+entries are kept in memory, and only those are attached to a failure
+record instead of the full "Browser Console Logs" dump::
+
+    async with capture_logs(context, "TC002") as logs:
+        ...
+    record = logs.failure_record(error)
+"""
+
+import gzip
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from playwright import async_api
+
+from harness.config import artifact_path
+
+DEFAULT_TAIL_SIZE = 50
+# Console text and URLs are truncated so one runaway message can't dominate.
+MAX_TEXT_LENGTH = 2000
+
+
+def _clip(text: str) -> str:
+    if len(text) <= MAX_TEXT_LENGTH:
+        return text
+    return text[:MAX_TEXT_LENGTH] + f"... [{len(text) - MAX_TEXT_LENGTH} chars truncated]"
+
+
+class LogCollector:
+    """Stream browser events to compressed NDJSON through a ring buffer."""
+
+    def __init__(
+        self,
+        test_id: str,
+        tail_size: int = DEFAULT_TAIL_SIZE,
+        path: Optional[Path] = None,
+        flush_every: int = 100,
+    ):
+        self.test_id = test_id
+        self.path = path or artifact_path("logs", f"{test_id}.ndjson.gz")
+        self._tail: deque[dict] = deque(maxlen=tail_size)
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._flush_every = flush_every
+        self._pending = 0
+        self._started = time.monotonic()
+        self.counts: dict[str, int] = {}
+
+    def record(self, kind: str, **data) -> None:
+        entry = {"t": round(time.monotonic() - self._started, 4), "kind": kind, **data}
+        self._tail.append(entry)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def attach(self, context: async_api.BrowserContext) -> None:
+        context.on("page", self._watch_page)
+        for page in context.pages:
+            self._watch_page(page)
+        context.on("request", self._on_request)
+        context.on("response", self._on_response)
+        context.on("requestfailed", self._on_request_failed)
+
+    def _watch_page(self, page: async_api.Page) -> None:
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_page_error)
+
+    def _on_console(self, msg: async_api.ConsoleMessage) -> None:
+        location = msg.location or {}
+        self.record(
+            "console",
+            level=msg.type,
+            text=_clip(msg.text),
+            url=location.get("url"),
+            line=location.get("lineNumber"),
+        )
+
+    def _on_page_error(self, error: async_api.Error) -> None:
+        self.record("pageerror", text=_clip(str(error)))
+
+    def _on_request(self, request: async_api.Request) -> None:
+        self.record(
+            "request",
+            method=request.method,
+            url=_clip(request.url),
+            resource=request.resource_type,
+        )
+
+    def _on_response(self, response: async_api.Response) -> None:
+        self.record(
+            "response",
+            status=response.status,
+            url=_clip(response.url),
+            from_service_worker=response.from_service_worker,
+        )
+
+    def _on_request_failed(self, request: async_api.Request) -> None:
+        self.record(
+            "requestfailed",
+            method=request.method,
+            url=_clip(request.url),
+            failure=request.failure,
+        )
+
+    def tail(self) -> list[dict]:
+        return list(self._tail)
+
+    def format_tail(self) -> str:
+        """Render the tail the way ``testError`` strings list console logs."""
+        lines = []
+        for entry in self._tail:
+            if entry["kind"] == "console":
+                lines.append(f"[{entry['level'].upper()}] {entry['text']}")
+            elif entry["kind"] == "pageerror":
+                lines.append(f"[PAGEERROR] {entry['text']}")
+            elif entry["kind"] == "requestfailed":
+                lines.append(f"[NETWORK] {entry['method']} {entry['url']} failed: {entry['failure']}")
+            elif entry["kind"] == "response" and entry["status"] >= 400:
+                lines.append(f"[NETWORK] {entry['status']} {entry['url']}")
+        return "\n".join(lines)
+
+    def failure_record(self, error: BaseException) -> dict:
+        """Return a compact failure record referencing the full log file."""
+        return {
+            "testId": self.test_id,
+            "testError": str(error),
+            "logTail": self.tail(),
+            "logCounts": dict(self.counts),
+            "logFile": str(self.path),
+        }
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_log(path: Path) -> list[dict]:
+    """Load a captured log; tolerates a truncated final line from an aborted run."""
+    entries = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except EOFError:
+        pass
+    return entries
+
+
+@asynccontextmanager
+async def capture_logs(
+    context: async_api.BrowserContext,
+    test_id: str,
+    tail_size: int = DEFAULT_TAIL_SIZE,
+) -> AsyncIterator[LogCollector]:
+    collector = LogCollector(test_id, tail_size=tail_size)
+    collector.attach(context)
+    try:
+        yield collector
+    finally:
+        collector.close()
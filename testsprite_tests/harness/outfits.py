@@ -0,0 +1,325 @@
+"""Outfit save/load throughput benchmark.
+
+``saveOutfit`` (server action) and ``createOutfit`` (client helper) both
+insert into ``saved_outfits`` and then, in a second round trip, into
+``outfit_items``; ``updateOutfitItems`` deletes every item and re-inserts
+them. This benchmark runs those flows at high concurrency and reports
+ops/sec, round trips per operation and per-step tail latency::
+
+    python -m harness.outfits --backend rest --concurrency 32 --ops 2000
+    python -m harness.outfits --backend sql --concurrency 32 --ops 2000
+
+The ``rest`` backend issues the same PostgREST requests as supabase-js,
+either with the service-role key like ``saveOutfit`` (``--as service``) or
+as a signed-in user under RLS like ``createOutfit`` (``--as user``). The
+``sql`` backend additionally times a single-statement variant of each write
+(one CTE, one round trip, atomic) to show what an RPC would buy.
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from harness.auth import mint_jwt
+from harness.config import SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, artifact_path
+from harness.factory import provisioned
+from harness.postgrest import PostgrestClient
+from harness.stats import format_summary, summarize
+
+DEFAULT_ITEMS = 4
+DEFAULT_MAX_CONNECTIONS = 20
+
+
+@dataclass
+class OpSample:
+    flow: str
+    steps: list[float]
+    ok: bool
+    error: str = ""
+
+    @property
+    def total(self) -> float:
+        return sum(self.steps)
+
+
+@dataclass
+class Fixture:
+    user_id: str
+    product_ids: list[str]
+    outfit_ids: list[str] = field(default_factory=list)
+    cleanup: Callable[[], None] = lambda: None
+
+
+def _items(product_ids: list[str], count: int) -> list[dict]:
+    return [
+        {
+            "product_id": product_ids[i % len(product_ids)],
+            "position_data": json.dumps({"x": i, "y": 0, "z": 0}),
+            "customization_data": {"color": "#00C4B4"},
+        }
+        for i in range(count)
+    ]
+
+
+class RestDriver:
+    def __init__(self, as_user: bool):
+        self.admin = PostgrestClient(api_key=SUPABASE_SERVICE_ROLE_KEY)
+        self.as_user = as_user
+        self.client = self.admin
+
+    def setup(self, items: int) -> Fixture:
+        # The factory stays open for the whole run; cleanup closes it.
+        stack = ExitStack()
+        make = stack.enter_context(provisioned())
+        try:
+            user = make.user("outfits")
+            if self.as_user:
+                self.client = PostgrestClient(api_key=SUPABASE_ANON_KEY, access_token=mint_jwt(user.id))
+            existing = self.admin.select("products", {"select": "id", "limit": str(items)}).body or []
+            product_ids = [p["id"] for p in existing]
+            if not product_ids:
+                product_ids = [make.product(name=f"Harness product {i}", price=10 + i)["id"] for i in range(items)]
+        except BaseException:
+            stack.close()
+            raise
+        return Fixture(user.id, product_ids, cleanup=stack.close)
+
+    def save(self, fixture: Fixture, items: int) -> OpSample:
+        outfit = self.client.request(
+            "POST", "rest/v1/saved_outfits",
+            body={"user_id": fixture.user_id, "name": "Harness outfit", "is_favorite": False},
+            headers={"Prefer": "return=representation", "Accept": "application/vnd.pgrst.object+json"},
+        )
+        if outfit.status >= 400:
+            return OpSample("save", [outfit.elapsed_ms], False, f"outfit HTTP {outfit.status}")
+        fixture.outfit_ids.append(outfit.body["id"])
+        rows = [{**item, "outfit_id": outfit.body["id"]} for item in _items(fixture.product_ids, items)]
+        result = self.client.insert("outfit_items", rows, returning=False)
+        return OpSample("save", [outfit.elapsed_ms, result.elapsed_ms], result.status < 400,
+                        "" if result.status < 400 else f"items HTTP {result.status}")
+
+    def update_items(self, fixture: Fixture, items: int) -> OpSample:
+        outfit_id = fixture.outfit_ids[hash(threading.get_ident()) % len(fixture.outfit_ids)]
+        deleted = self.client.request("DELETE", "rest/v1/outfit_items", {"outfit_id": f"eq.{outfit_id}"})
+        rows = [{**item, "outfit_id": outfit_id} for item in _items(fixture.product_ids, items)]
+        inserted = self.client.insert("outfit_items", rows, returning=False)
+        ok = deleted.status < 400 and inserted.status < 400
+        return OpSample("update_items", [deleted.elapsed_ms, inserted.elapsed_ms], ok)
+
+    def load(self, fixture: Fixture, items: int) -> OpSample:
+        resp = self.client.select("saved_outfits", {
+            "select": "*,avatars(*),outfit_items(*,products(*))",
+            "user_id": f"eq.{fixture.user_id}",
+            "order": "created_at.desc",
+        })
+        return OpSample("load", [resp.elapsed_ms], resp.status < 400)
+
+    def flows(self) -> dict[str, Callable[[Fixture, int], OpSample]]:
+        return {"save": self.save, "update_items": self.update_items, "load": self.load}
+
+
+class SqlDriver:
+    """Same writes over psycopg, plus single-statement variants."""
+
+    _SAVE_BATCHED = """
+        WITH outfit AS (
+            INSERT INTO public.saved_outfits (user_id, name, is_favorite)
+            VALUES (%s, 'Harness outfit', false) RETURNING id
+        )
+        INSERT INTO public.outfit_items (outfit_id, product_id, position_data, customization_data)
+        SELECT outfit.id, item.product_id, item.position_data, item.customization_data
+        FROM outfit, jsonb_to_recordset(%s::jsonb)
+            AS item(product_id uuid, position_data jsonb, customization_data jsonb)
+        RETURNING outfit_id
+    """
+
+    _UPDATE_BATCHED = """
+        WITH removed AS (DELETE FROM public.outfit_items WHERE outfit_id = %s)
+        INSERT INTO public.outfit_items (outfit_id, product_id, position_data, customization_data)
+        SELECT %s, item.product_id, item.position_data, item.customization_data
+        FROM jsonb_to_recordset(%s::jsonb)
+            AS item(product_id uuid, position_data jsonb, customization_data jsonb)
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        from harness.db import connect, timed
+
+        self._connect = connect
+        self._timed_query = timed
+        # One pool for every flow: at most max_connections are ever opened,
+        # whatever the concurrency, and they stay below Postgres' 100.
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = []
+
+    @contextmanager
+    def _conn(self) -> Iterator:
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                ctx = self._connect()
+                conn = ctx.__enter__()
+                self._opened.append(ctx)
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        while self._opened:
+            self._opened.pop().__exit__(None, None, None)
+
+    def setup(self, items: int) -> Fixture:
+        with self._conn() as conn:
+            return self._setup(conn, items)
+
+    def _setup(self, conn, items: int) -> Fixture:
+        user_id = str(uuid.uuid4())
+        conn.execute("INSERT INTO auth.users (id, email, aud, role) VALUES (%s, %s, 'authenticated', 'authenticated')",
+                     (user_id, f"harness+outfits-{user_id[:8]}@example.com"))
+        conn.execute("INSERT INTO public.profiles (id, email) VALUES (%s, %s) ON CONFLICT (id) DO NOTHING",
+                     (user_id, f"harness+outfits-{user_id[:8]}@example.com"))
+        product_ids = [str(r[0]) for r in conn.execute(
+            "SELECT id FROM public.products LIMIT %s", (items,)).fetchall()]
+        created = []
+        if not product_ids:
+            created = [str(r[0]) for r in conn.execute(
+                "INSERT INTO public.products (name, price) SELECT 'Harness product ' || g, 10 + g "
+                "FROM generate_series(1, %s) g RETURNING id", (items,)).fetchall()]
+            product_ids = created
+
+        def cleanup():
+            try:
+                with self._conn() as conn:
+                    conn.execute("DELETE FROM auth.users WHERE id = %s", (user_id,))
+                    conn.execute("DELETE FROM public.profiles WHERE id = %s", (user_id,))
+                    if created:
+                        conn.execute("DELETE FROM public.products WHERE id = ANY(%s::uuid[])", (created,))
+            finally:
+                self.close()
+
+        return Fixture(user_id, product_ids, cleanup=cleanup)
+
+    def save(self, fixture: Fixture, items: int) -> OpSample:
+        with self._conn() as conn:
+            ms1, rows = self._timed_query(
+                conn, "INSERT INTO public.saved_outfits (user_id, name, is_favorite) "
+                "VALUES (%s, 'Harness outfit', false) RETURNING id", (fixture.user_id,))
+            outfit_id = rows[0][0]
+            fixture.outfit_ids.append(outfit_id)
+            values = _items(fixture.product_ids, items)
+            ms2, _ = self._timed_query(
+                conn, "INSERT INTO public.outfit_items (outfit_id, product_id, position_data, customization_data) "
+                "SELECT %s, item.product_id, item.position_data, item.customization_data "
+                "FROM jsonb_to_recordset(%s::jsonb) AS item(product_id uuid, position_data jsonb, customization_data jsonb)",
+                (outfit_id, json.dumps(values)))
+        return OpSample("save", [ms1, ms2], True)
+
+    def save_batched(self, fixture: Fixture, items: int) -> OpSample:
+        with self._conn() as conn:
+            ms, rows = self._timed_query(conn, self._SAVE_BATCHED,
+                                         (fixture.user_id, json.dumps(_items(fixture.product_ids, items))))
+        if rows:
+            fixture.outfit_ids.append(rows[0][0])
+        return OpSample("save_batched", [ms], True)
+
+    def update_items(self, fixture: Fixture, items: int) -> OpSample:
+        outfit_id = fixture.outfit_ids[hash(threading.get_ident()) % len(fixture.outfit_ids)]
+        with self._conn() as conn:
+            ms1, _ = self._timed_query(conn, "DELETE FROM public.outfit_items WHERE outfit_id = %s", (outfit_id,))
+            ms2, _ = self._timed_query(
+                conn, "INSERT INTO public.outfit_items (outfit_id, product_id, position_data, customization_data) "
+                "SELECT %s, item.product_id, item.position_data, item.customization_data "
+                "FROM jsonb_to_recordset(%s::jsonb) AS item(product_id uuid, position_data jsonb, customization_data jsonb)",
+                (outfit_id, json.dumps(_items(fixture.product_ids, items))))
+        return OpSample("update_items", [ms1, ms2], True)
+
+    def update_items_batched(self, fixture: Fixture, items: int) -> OpSample:
+        outfit_id = fixture.outfit_ids[hash(threading.get_ident()) % len(fixture.outfit_ids)]
+        with self._conn() as conn:
+            ms, _ = self._timed_query(conn, self._UPDATE_BATCHED,
+                                      (outfit_id, outfit_id, json.dumps(_items(fixture.product_ids, items))))
+        return OpSample("update_items_batched", [ms], True)
+
+    def flows(self) -> dict[str, Callable[[Fixture, int], OpSample]]:
+        return {
+            "save": self.save,
+            "save_batched": self.save_batched,
+            "update_items": self.update_items,
+            "update_items_batched": self.update_items_batched,
+        }
+
+
+def run_flow(flow: Callable[[Fixture, int], OpSample], fixture: Fixture, ops: int,
+             concurrency: int, items: int) -> tuple[list[OpSample], float]:
+    def one(_):
+        try:
+            return flow(fixture, items)
+        except Exception as error:
+            return OpSample(flow.__name__, [], False, str(error).splitlines()[0])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(ops)))
+    return samples, time.perf_counter() - started
+
+
+def report(name: str, samples: list[OpSample], elapsed: float) -> dict:
+    ok = [s for s in samples if s.ok]
+    steps = max((len(s.steps) for s in ok), default=0)
+    result = {
+        "flow": name,
+        "ops": len(samples),
+        "errors": len(samples) - len(ok),
+        "ops_per_sec": len(ok) / elapsed if elapsed else 0.0,
+        "round_trips_per_op": steps,
+        "total": summarize(s.total for s in ok),
+        "steps": [summarize(s.steps[i] for s in ok if len(s.steps) > i) for i in range(steps)],
+    }
+    print(f"{name}: {result['ops_per_sec']:.1f} ops/s, {steps} round trip(s)/op, {result['errors']} errors")
+    print("  " + format_summary("total", result["total"]))
+    for i, step in enumerate(result["steps"], 1):
+        print("  " + format_summary(f"step {i}", step))
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["rest", "sql"], default="rest")
+    parser.add_argument("--as", dest="as_role", choices=["service", "user"], default="service")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="outfit_items per outfit")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help="size of the shared psycopg pool for --backend sql")
+    args = parser.parse_args(argv)
+
+    if args.backend == "rest":
+        driver = RestDriver(args.as_role == "user")
+    else:
+        driver = SqlDriver(args.max_connections)
+    fixture = driver.setup(args.items)
+    results = []
+    try:
+        # Saves run first so the update and load flows have outfits to work on.
+        for name, flow in driver.flows().items():
+            samples, elapsed = run_flow(flow, fixture, args.ops, args.concurrency, args.items)
+            results.append(report(name, samples, elapsed))
+    finally:
+        fixture.cleanup()
+
+    artifact_path("outfits", f"{args.backend}.json").write_text(json.dumps(results, indent=2))
+    return 0 if all(r["errors"] == 0 for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
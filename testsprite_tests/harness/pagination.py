@@ -0,0 +1,197 @@
+"""Deep-pagination benchmark for the gallery's OFFSET queries.
+
+``GalleryGrid.fetchProducts`` asks PostgREST for
+``select=*&order=<col>&offset=(page-1)*12&limit=12``, which Postgres serves
+by reading and discarding every earlier row. This benchmark walks pages
+1..N of a scaled synthetic catalog for each ``sortBy`` mode, once with that
+OFFSET query and once with keyset (cursor) pagination on the same data, and
+writes the per-page latencies to ``pagination/latency.csv``::
+
+    python -m harness.pagination --rows 200000 --pages 1200
+
+``--via rest`` walks the real ``products`` table through PostgREST instead,
+issuing exactly the requests supabase-js would. Requires psycopg for the
+SQL mode; a ``latency.png`` plot is drawn when matplotlib is installed.
+"""
+
+import argparse
+import csv
+import sys
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from harness.catalog import PRODUCTS_TABLE, seed_products
+from harness.config import artifact_path
+from harness.db import connect, timed
+from harness.postgrest import PostgrestClient
+from harness.stats import format_summary, summarize
+
+PAGE_SIZE = 12
+
+COLUMNS = ("id", "name", "description", "price", "category", "style", "is_new",
+           "model_url", "images", "tags", "created_at")
+
+# sortBy value in GalleryGrid -> (column, descending)
+SORT_MODES = {
+    "newest": ("created_at", True),
+    "price-low-high": ("price", False),
+    "price-high-low": ("price", True),
+}
+
+# Composite indexes keyset pagination needs; id breaks ties on equal prices.
+KEYSET_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS bench_products_created_at_id ON {PRODUCTS_TABLE} (created_at DESC, id DESC)",
+    f"CREATE INDEX IF NOT EXISTS bench_products_price_id ON {PRODUCTS_TABLE} (price, id)",
+]
+
+DEPTH_BUCKETS = [(1, 10), (11, 100), (101, 500), (501, 1000), (1001, None)]
+
+
+@dataclass
+class PageSample:
+    sort_mode: str
+    strategy: str
+    page: int
+    ms: float
+    rows: int
+
+
+def offset_sql(sort_mode: str) -> str:
+    column, desc = SORT_MODES[sort_mode]
+    return (f"SELECT {', '.join(COLUMNS)} FROM {PRODUCTS_TABLE} "
+            f"ORDER BY {column} {'DESC' if desc else 'ASC'} LIMIT {PAGE_SIZE} OFFSET %s")
+
+
+def keyset_sql(sort_mode: str, first: bool) -> str:
+    column, desc = SORT_MODES[sort_mode]
+    direction = "DESC" if desc else "ASC"
+    where = "" if first else f"WHERE ({column}, id) {'<' if desc else '>'} (%s, %s) "
+    return (f"SELECT {', '.join(COLUMNS)} FROM {PRODUCTS_TABLE} {where}"
+            f"ORDER BY {column} {direction}, id {direction} LIMIT {PAGE_SIZE}")
+
+
+def walk_sql(conn, sort_mode: str, pages: int) -> Iterator[PageSample]:
+    column, _ = SORT_MODES[sort_mode]
+    sort_index = COLUMNS.index(column)
+    id_index = COLUMNS.index("id")
+
+    query = offset_sql(sort_mode)
+    for page in range(1, pages + 1):
+        ms, rows = timed(conn, query, ((page - 1) * PAGE_SIZE,))
+        yield PageSample(sort_mode, "offset", page, ms, len(rows))
+        if not rows:
+            break
+
+    cursor = None
+    for page in range(1, pages + 1):
+        if cursor is None:
+            ms, rows = timed(conn, keyset_sql(sort_mode, first=True))
+        else:
+            ms, rows = timed(conn, keyset_sql(sort_mode, first=False), cursor)
+        yield PageSample(sort_mode, "keyset", page, ms, len(rows))
+        if not rows:
+            break
+        cursor = (rows[-1][sort_index], rows[-1][id_index])
+
+
+def walk_rest(client: PostgrestClient, sort_mode: str, pages: int) -> Iterator[PageSample]:
+    column, desc = SORT_MODES[sort_mode]
+    order = f"{column}.{'desc' if desc else 'asc'}"
+    for page in range(1, pages + 1):
+        resp = client.select("products", {
+            "order": order, "offset": str((page - 1) * PAGE_SIZE), "limit": str(PAGE_SIZE),
+        })
+        rows = resp.body if isinstance(resp.body, list) else []
+        yield PageSample(sort_mode, "offset", page, resp.elapsed_ms, len(rows))
+        if not rows:
+            break
+
+    op = "lt" if desc else "gt"
+    params = {"order": f"{order},id.{'desc' if desc else 'asc'}", "limit": str(PAGE_SIZE)}
+    for page in range(1, pages + 1):
+        resp = client.select("products", params)
+        rows = resp.body if isinstance(resp.body, list) else []
+        yield PageSample(sort_mode, "keyset", page, resp.elapsed_ms, len(rows))
+        if not rows:
+            break
+        last = rows[-1]
+        params["or"] = (f"({column}.{op}.{last[column]},"
+                        f"and({column}.eq.{last[column]},id.{op}.{last['id']}))")
+
+
+def depth_table(samples: list[PageSample]) -> list[str]:
+    lines = []
+    groups: dict[tuple[str, str], list[PageSample]] = {}
+    for s in samples:
+        groups.setdefault((s.sort_mode, s.strategy), []).append(s)
+    for (sort_mode, strategy), group in groups.items():
+        for low, high in DEPTH_BUCKETS:
+            bucket = [s.ms for s in group if s.page >= low and (high is None or s.page <= high)]
+            if bucket:
+                label = f"{sort_mode}/{strategy} p{low}-{high or 'end'}"
+                lines.append(format_summary(label, summarize(bucket)))
+    return lines
+
+
+def plot(samples: list[PageSample], path) -> bool:
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return False
+    fig, ax = plt.subplots(figsize=(10, 6))
+    series: dict[str, list[PageSample]] = {}
+    for s in samples:
+        series.setdefault(f"{s.sort_mode} / {s.strategy}", []).append(s)
+    for label, points in series.items():
+        ax.plot([p.page for p in points], [p.ms for p in points], label=label, linewidth=0.8)
+    ax.set_xlabel("page")
+    ax.set_ylabel("latency (ms)")
+    ax.set_title("Gallery pagination latency vs depth")
+    ax.legend()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+    return True
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--via", choices=["sql", "rest"], default="sql")
+    parser.add_argument("--rows", type=int, default=200_000, help="catalog size for --via sql")
+    parser.add_argument("--pages", type=int, default=1200)
+    parser.add_argument("--sort", nargs="+", choices=list(SORT_MODES), default=list(SORT_MODES))
+    parser.add_argument("--no-seed", action="store_true", help="reuse the existing catalog")
+    args = parser.parse_args(argv)
+
+    samples: list[PageSample] = []
+    if args.via == "sql":
+        with connect() as conn:
+            if not args.no_seed:
+                seed_products(conn, args.rows)
+            for statement in KEYSET_INDEXES:
+                conn.execute(statement)
+            for mode in args.sort:
+                samples.extend(walk_sql(conn, mode, args.pages))
+    else:
+        client = PostgrestClient()
+        for mode in args.sort:
+            samples.extend(walk_rest(client, mode, args.pages))
+
+    csv_path = artifact_path("pagination", "latency.csv")
+    with csv_path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["sort_mode", "strategy", "page", "ms", "rows"])
+        for s in samples:
+            writer.writerow([s.sort_mode, s.strategy, s.page, f"{s.ms:.3f}", s.rows])
+
+    for line in depth_table(samples):
+        print(line)
+    if plot(samples, csv_path.with_name("latency.png")):
+        print(f"plot: {csv_path.with_name('latency.png')}")
+    print(f"samples: {csv_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
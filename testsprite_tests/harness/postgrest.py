@@ -0,0 +1,99 @@
+"""Minimal PostgREST client that sends the same requests supabase-js does.
+
+Scenarios use it to exercise the API layer directly instead of clicking
+through the UI. Only the standard library is used.
+"""
+
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from harness.config import SUPABASE_ANON_KEY, SUPABASE_URL
+
+
+@dataclass
+class RestResponse:
+    status: int
+    elapsed_ms: float
+    body: Any
+    bytes: int
+    headers: dict[str, str]
+
+
+class PostgrestClient:
+    def __init__(
+        self,
+        base_url: str = SUPABASE_URL,
+        api_key: str = SUPABASE_ANON_KEY,
+        access_token: Optional[str] = None,
+        schema: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.access_token = access_token
+        self.schema = schema
+        self.timeout = timeout
+
+    def _headers(self, method: str, extra: Optional[dict[str, str]]) -> dict[str, str]:
+        headers = {
+            "apikey": self.api_key,
+            "Authorization": f"Bearer {self.access_token or self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if self.schema:
+            key = "Accept-Profile" if method in ("GET", "HEAD") else "Content-Profile"
+            headers[key] = self.schema
+        headers.update(extra or {})
+        return headers
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict[str, str]] = None,
+        body: Any = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> RestResponse:
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params, safe=",.()*:")
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(url, data=data, method=method, headers=self._headers(method, headers))
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                raw = resp.read()
+                status, resp_headers = resp.status, dict(resp.headers)
+        except urllib.error.HTTPError as error:
+            raw = error.read()
+            status, resp_headers = error.code, dict(error.headers)
+        elapsed = (time.perf_counter() - started) * 1000
+        try:
+            parsed = json.loads(raw) if raw else None
+        except ValueError:
+            parsed = raw.decode(errors="replace")
+        return RestResponse(status, elapsed, parsed, len(raw), resp_headers)
+
+    def select(self, table: str, params: Optional[dict[str, str]] = None, **kwargs) -> RestResponse:
+        return self.request("GET", f"rest/v1/{table}", {"select": "*", **(params or {})}, **kwargs)
+
+    def insert(self, table: str, rows: Any, returning: bool = True) -> RestResponse:
+        prefer = "return=representation" if returning else "return=minimal"
+        return self.request("POST", f"rest/v1/{table}", body=rows, headers={"Prefer": prefer})
+
+    def update(self, table: str, filters: dict[str, str], values: dict) -> RestResponse:
+        return self.request("PATCH", f"rest/v1/{table}", filters, values,
+                            headers={"Prefer": "return=representation"})
+
+    def delete(self, table: str, filters: dict[str, str]) -> RestResponse:
+        return self.request("DELETE", f"rest/v1/{table}", filters,
+                            headers={"Prefer": "return=representation"})
+
+    def rpc(self, function: str, args: dict) -> RestResponse:
+        return self.request("POST", f"rest/v1/rpc/{function}", body=args)
@@ -0,0 +1,209 @@
+"""Duplicate ``profiles`` fetches from ``AuthProvider``.
+
+``contexts/auth-context.tsx`` loads the profile from ``getSession()``'s
+callback and again from ``onAuthStateChange`` (which also fires
+``INITIAL_SESSION`` on start-up), so one page load can fetch the same
+profile twice or more, racing each other. This probe records every
+``profiles`` request per navigation through the DevTools protocol, with a
+timestamp, the auth requests around it and the JavaScript call stack that
+issued it, and fails when one navigation fetches the same profile more
+than once::
+
+    python -m harness.profile_fetches --routes /dashboard /profile /customize
+
+Scenarios: a cold load of each route with a pre-seeded session, and a
+form sign-in from ``/auth/login`` through to the dashboard. The signed-in
+user is created through the GoTrue admin API and deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import parse_qs, urlparse
+
+from harness.auth import storage_state_for
+from harness.config import NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.factory import FactoryUser, provisioned
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+DEFAULT_ROUTES = ["/", "/dashboard", "/profile", "/customize"]
+SETTLE_MS = 2500
+
+
+@dataclass
+class ProfileFetch:
+    at_ms: float
+    method: str
+    query: str
+    stack: list[str]
+    after_auth: Optional[str]
+
+    @property
+    def profile_id(self) -> Optional[str]:
+        """The ``id=eq.`` filter's value; ``select`` and other params vary by caller."""
+        for param in self.query.split("&"):
+            if param.startswith("id=eq."):
+                return param[len("id=eq."):]
+        return None
+
+
+@dataclass
+class NavigationAudit:
+    scenario: str
+    route: str
+    fetches: list[ProfileFetch] = field(default_factory=list)
+    auth_requests: list[str] = field(default_factory=list)
+
+    @property
+    def duplicates(self) -> int:
+        reads = Counter(f.profile_id or f.query for f in self.fetches if f.method == "GET")
+        return sum(n - 1 for n in reads.values() if n > 1)
+
+    @property
+    def ok(self) -> bool:
+        return self.duplicates == 0
+
+
+class ProfileRequestProbe:
+    """Collects ``profiles`` and ``/auth/v1`` requests through CDP."""
+
+    def __init__(self):
+        self.audit: Optional[NavigationAudit] = None
+        self._origin: Optional[float] = None
+        self._last_auth: Optional[str] = None
+
+    async def attach(self, context: "async_api.BrowserContext", page: "async_api.Page") -> None:
+        cdp = await context.new_cdp_session(page)
+        cdp.on("Network.requestWillBeSent", self._on_request)
+        await cdp.send("Network.enable")
+
+    def begin(self, scenario: str, route: str) -> NavigationAudit:
+        self.audit = NavigationAudit(scenario, route)
+        self._origin = None
+        self._last_auth = None
+        return self.audit
+
+    def _on_request(self, event: dict) -> None:
+        if self.audit is None:
+            return
+        request = event["request"]
+        parsed = urlparse(request["url"])
+        if self._origin is None:
+            self._origin = event["timestamp"]
+        at_ms = (event["timestamp"] - self._origin) * 1000
+        if "/auth/v1/" in parsed.path:
+            label = parsed.path.rsplit("/", 1)[-1] + (f"?{parsed.query}" if parsed.query else "")
+            self._last_auth = label
+            self.audit.auth_requests.append(f"{at_ms:.0f}ms {request['method']} {label}")
+        elif parsed.path.endswith("/rest/v1/profiles"):
+            self.audit.fetches.append(ProfileFetch(
+                at_ms=at_ms,
+                method=request["method"],
+                query=_normalise(parsed.query),
+                stack=_stack(event.get("initiator", {})),
+                after_auth=self._last_auth,
+            ))
+
+
+def _normalise(query: str) -> str:
+    params = parse_qs(query)
+    return "&".join(f"{k}={','.join(sorted(v))}" for k, v in sorted(params.items()))
+
+
+def _stack(initiator: dict, depth: int = 8) -> list[str]:
+    frames, stack = [], initiator.get("stack")
+    while stack and len(frames) < depth:
+        for frame in stack.get("callFrames", []):
+            name = frame.get("functionName")
+            if name and name not in frames:
+                frames.append(name)
+        stack = stack.get("parent")
+    return frames[:depth]
+
+
+async def audit_cold_loads(browser: "async_api.Browser", session: dict, routes: list[str],
+                           settle_ms: int) -> list[NavigationAudit]:
+    from harness.browser import new_context
+
+    audits = []
+    for route in routes:
+        # A fresh context per route so every load is cold.
+        context = await new_context(browser, storage_state=storage_state_for(session))
+        try:
+            page = await context.new_page()
+            probe = ProfileRequestProbe()
+            await probe.attach(context, page)
+            audits.append(probe.begin("cold-load", route))
+            await page.goto(url_for(route), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+            await page.wait_for_timeout(settle_ms)
+        finally:
+            await context.close()
+    return audits
+
+
+async def audit_sign_in(browser: "async_api.Browser", user: FactoryUser, settle_ms: int) -> NavigationAudit:
+    from harness.browser import new_context
+
+    context = await new_context(browser)
+    try:
+        page = await context.new_page()
+        probe = ProfileRequestProbe()
+        await probe.attach(context, page)
+        await page.goto(url_for("/auth/login"), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+        await page.fill("#email", user.email)
+        await page.fill("#password", user.password)
+        audit = probe.begin("sign-in", "/auth/login -> /dashboard")
+        await page.click("button[type=submit]")
+        await page.wait_for_url("**/dashboard", timeout=NAVIGATION_TIMEOUT_MS)
+        await page.wait_for_timeout(settle_ms)
+        return audit
+    finally:
+        await context.close()
+
+
+async def run(user: FactoryUser, session: dict, routes: list[str], settle_ms: int) -> list[NavigationAudit]:
+    # Imported here so the audit helpers work without Playwright.
+    from harness.browser import browser_session
+
+    async with browser_session() as browser:
+        audits = await audit_cold_loads(browser, session, routes, settle_ms)
+        audits.append(await audit_sign_in(browser, user, settle_ms))
+    return audits
+
+
+def format_audit(audit: NavigationAudit) -> str:
+    lines = [f"{audit.scenario:<10} {audit.route:<28} {len(audit.fetches)} profile request(s), "
+             f"{audit.duplicates} duplicate(s)"]
+    for f in audit.fetches:
+        origin = " < ".join(f.stack[:4]) or "?"
+        lines.append(f"    {f.at_ms:>6.0f}ms {f.method:<5} after {f.after_auth or '-':<28} {origin}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", default=DEFAULT_ROUTES)
+    parser.add_argument("--settle-ms", type=int, default=SETTLE_MS,
+                        help="time after load for late auth events to fire")
+    args = parser.parse_args(argv)
+
+    with provisioned() as make:
+        user = make.user("profiles", onboarded=True)
+        audits = asyncio.run(run(user, make.session(user), args.routes, args.settle_ms))
+
+    artifact_path("profile_fetches", "latest.json").write_text(json.dumps(
+        [{**asdict(a), "duplicates": a.duplicates, "ok": a.ok} for a in audits], indent=2
+    ))
+    for audit in audits:
+        print(format_audit(audit))
+    return 0 if all(a.ok for a in audits) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
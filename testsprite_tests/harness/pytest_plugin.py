@@ -0,0 +1,421 @@
+"""pytest plugin that collects the generated ``TC*.py`` scripts as tests.
+
+Every script ends in a module-level ``asyncio.run(run_test())``, so importing
+one runs it. This plugin parses the script, drops module-level
+``asyncio.run(...)`` calls and collects ``run_test`` as one test item; all
+items of a worker run on the same event loop. ``run_test`` parameters are
+filled from the fixtures below by name. Scripts that launch their own
+Chromium, as the generated ones do, get the worker's pooled browser from
+``async_playwright()`` instead; their ``browser.close()`` only closes the
+contexts they opened and ``pw.stop()`` does nothing. ``testsprite_tests/
+conftest.py`` loads the plugin::
+
+    cd testsprite_tests
+    python -m pytest -n 4                  # pytest-xdist, one browser per worker
+    python -m pytest --lf --tc-timeout 120
+
+Fixtures: ``tc_browser`` (one Chromium per worker), ``tc_context`` (a fresh
+context per test), ``tc_session`` (the ``HARNESS_USER_EMAIL`` session,
+signed in once per worker) and ``tc_authenticated_page``.
+
+Each commented block in a generated script counts as a step. With
+``--tc-results`` (or ``HARNESS_RESULTS=1``), test starts, steps and finishes
+stream to ``<artifacts>/results/events.ndjson`` while the run goes, and
+``results/junit.xml`` is written at the end (see ``harness.results``).
+Passing ``--tc-events`` or ``--tc-junit`` turns recording on as well.
+"""
+
+import ast
+import asyncio
+import fnmatch
+import inspect
+import io
+import re
+import time
+import tokenize
+import types
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+import pytest
+
+from harness.config import RECORD_RESULTS, artifact_path
+from harness.results import EventStream, RunRecorder, write_junit
+
+if TYPE_CHECKING:
+    from playwright import async_api
+
+TC_FILE = re.compile(r"TC\d+_\w+\.py")
+DEFAULT_TIMEOUT_S = 300.0
+RESULTS_KEY = pytest.StashKey["ResultReporter"]()
+
+__all__ = [
+    "pytest_addoption",
+    "pytest_collect_file",
+    "pytest_configure",
+    "pytest_pycollect_makemodule",
+    "tc_authenticated_page",
+    "tc_browser",
+    "tc_context",
+    "tc_loop",
+    "tc_session",
+]
+
+
+def _is_entry_point(stmt: ast.stmt) -> bool:
+    """``asyncio.run(...)`` as a statement of its own."""
+    if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+        return False
+    func = stmt.value.func
+    return (isinstance(func, ast.Attribute) and func.attr == "run"
+            and isinstance(func.value, ast.Name) and func.value.id == "asyncio")
+
+
+class StripEntryPoint(ast.NodeTransformer):
+    """Drop module-level ``asyncio.run(...)`` so loading a script runs nothing.
+
+    Only whole statements are removed, so line numbers in tracebacks still
+    match the file.
+    """
+
+    def visit_Module(self, node: ast.Module) -> ast.Module:
+        node.body = [stmt for stmt in node.body if not _is_entry_point(stmt)]
+        return node
+
+
+def _comments(source: str) -> dict[int, str]:
+    """Full-line comments by line number."""
+    comments = {}
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == tokenize.COMMENT and token.line.lstrip().startswith("#"):
+            comments[token.start[0]] = token.string.lstrip("#").strip()
+    return comments
+
+
+class MarkSteps(ast.NodeTransformer):
+    """Call ``__tc_step__(title, line)`` before each commented block of ``run_test``.
+
+    The generated scripts put a comment such as ``# Click the 'Sign In'
+    button`` above each step; statements right below a comment (directly in
+    ``run_test`` or in its ``try`` body) start a step titled with it.
+    """
+
+    def __init__(self, comments: dict[int, str]):
+        self.comments = comments
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AsyncFunctionDef:
+        if node.name == "run_test":
+            node.body = self._mark(node.body)
+        return node
+
+    def _mark(self, body: list[ast.stmt]) -> list[ast.stmt]:
+        marked, seen = [], set()
+        for stmt in body:
+            title = self._title_above(stmt.lineno)
+            if title and stmt.lineno not in seen:
+                seen.add(stmt.lineno)
+                call = ast.Call(ast.Name("__tc_step__", ast.Load()), [ast.Constant(title), ast.Constant(stmt.lineno)], [])
+                marked.append(ast.copy_location(ast.Expr(call), stmt))
+            if isinstance(stmt, ast.Try):
+                stmt.body = self._mark(stmt.body)
+            marked.append(stmt)
+        return marked
+
+    def _title_above(self, line: int) -> str:
+        lines = []
+        while line - 1 in self.comments:
+            line -= 1
+            lines.insert(0, self.comments[line])
+        return " ".join(lines)
+
+
+def load_script(path: Path) -> types.ModuleType:
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, str(path))
+    for transformer in (StripEntryPoint(), MarkSteps(_comments(source))):
+        tree = ast.fix_missing_locations(transformer.visit(tree))
+    module = types.ModuleType(f"testsprite_tc.{path.stem}")
+    module.__file__ = str(path)
+    module.__tc_step__ = lambda title, line: None
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+    return module
+
+
+class _PooledBrowser:
+    """The worker's browser as a script sees it after ``chromium.launch()``."""
+
+    def __init__(self, browser: "async_api.Browser"):
+        self._browser = browser
+        self._contexts: list["async_api.BrowserContext"] = []
+
+    async def new_context(self, **kwargs) -> "async_api.BrowserContext":
+        context = await self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        return context
+
+    async def new_page(self, **kwargs) -> "async_api.Page":
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    async def close(self, **kwargs) -> None:
+        while self._contexts:
+            await self._contexts.pop().close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+class _PooledPlaywright:
+    """Stands in for both ``async_playwright()`` and the object ``start()`` returns."""
+
+    def __init__(self, browser: "async_api.Browser", launched: list[_PooledBrowser]):
+        self._browser = browser
+        self._launched = launched
+        self.chromium = self
+
+    async def launch(self, **kwargs) -> _PooledBrowser:
+        pooled = _PooledBrowser(self._browser)
+        self._launched.append(pooled)
+        return pooled
+
+    async def start(self) -> "_PooledPlaywright":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "_PooledPlaywright":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+
+class PooledAsyncApi(types.ModuleType):
+    """``playwright.async_api`` whose ``async_playwright()`` hands out ``browser``."""
+
+    def __init__(self, browser: "async_api.Browser"):
+        super().__init__("playwright.async_api")
+        self._browser = browser
+        self._launched: list[_PooledBrowser] = []
+
+    def async_playwright(self) -> _PooledPlaywright:
+        return _PooledPlaywright(self._browser, self._launched)
+
+    async def close(self) -> None:
+        """Close whatever the script left open."""
+        for pooled in self._launched:
+            await pooled.close()
+
+    def __getattr__(self, name: str) -> Any:
+        from playwright import async_api
+
+        return getattr(async_api, name)
+
+
+class TCScript(pytest.Module):
+    """A ``TC*.py`` file, loaded without its ``asyncio.run`` entry point."""
+
+    def _getobj(self) -> types.ModuleType:
+        pytest.importorskip("playwright.async_api")
+        return load_script(self.path)
+
+    def collect(self) -> list[pytest.Item]:
+        run_test = getattr(self.obj, "run_test", None)
+        if not inspect.iscoroutinefunction(run_test):
+            return []
+        needs = ["tc_loop"] if inspect.signature(run_test).parameters else ["tc_loop", "tc_browser"]
+        run_test.pytestmark = [*getattr(run_test, "pytestmark", []),
+                               pytest.mark.testsprite, pytest.mark.usefixtures(*needs)]
+        return [TCItem.from_parent(self, name="run_test", callobj=run_test)]
+
+
+class StepTracker:
+    """``__tc_step__`` for one test: counts steps and streams them."""
+
+    def __init__(self, test: str, stream: Optional[EventStream]):
+        self.test = test
+        self.stream = stream
+        self.count = 0
+        self.last: Optional[str] = None
+        self._started = time.monotonic()
+
+    def __call__(self, title: str, line: int) -> None:
+        self.count += 1
+        self.last = title
+        if self.stream is not None:
+            self.stream.emit("step", test=self.test, index=self.count, title=title, line=line,
+                             elapsed_s=round(time.monotonic() - self._started, 3))
+
+
+class TCItem(pytest.Function):
+    """Runs ``run_test`` on the worker's loop with a per-test timeout."""
+
+    def runtest(self) -> None:
+        loop = self.funcargs["tc_loop"]
+        kwargs = {name: self.funcargs[name] for name in self._fixtureinfo.argnames}
+        timeout: Optional[float] = self.config.getoption("tc_timeout") or None
+        reporter = self.config.stash.get(RESULTS_KEY, None)
+        steps = StepTracker(self.nodeid, reporter.stream if reporter else None)
+        self.module.__tc_step__ = steps
+        api, timed_out = None, False
+        if not kwargs:
+            api = PooledAsyncApi(self.funcargs["tc_browser"])
+            self.module.async_api = api
+        try:
+            loop.run_until_complete(asyncio.wait_for(self.obj(**kwargs), timeout))
+        except asyncio.TimeoutError:
+            timed_out = True
+        finally:
+            # user_properties travel with the report, so xdist's controller sees them too.
+            self.user_properties += [("steps", steps.count), ("last_step", steps.last)]
+            if api is not None:
+                loop.run_until_complete(api.close())
+        if timed_out:
+            pytest.fail(f"{self.path.name} timed out after {timeout:.0f}s", pytrace=False)
+
+
+class ResultReporter:
+    """Streams test starts and finishes and writes JUnit XML at the end.
+
+    Under xdist the controller sees every start, report and finish, so it
+    owns those events and the XML; workers only append their step events.
+    """
+
+    def __init__(self, config: pytest.Config, events: Path, junit: Path):
+        self.worker = getattr(config, "workerinput", {}).get("workerid")
+        self.stream = EventStream(events, truncate=self.worker is None, source=self.worker or "main")
+        self.recorder = RunRecorder(self.stream)
+        self.junit = junit
+        if self.worker is None:
+            self.stream.emit("run_start", args=list(config.invocation_params.args))
+
+    def pytest_runtest_logstart(self, nodeid: str) -> None:
+        if self.worker is None:
+            self.recorder.start(nodeid)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call: pytest.CallInfo):
+        outcome = yield
+        report = outcome.get_result()
+        if call.excinfo is not None and report.failed:
+            # Only the worker that ran the test has the exception; the type
+            # reaches the controller with the report's user_properties.
+            # Skips raise too, but are not failures.
+            report.user_properties.append(("error_type", call.excinfo.typename))
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        if self.worker is not None:
+            return
+        message = ""
+        if report.failed:
+            crash = getattr(report.longrepr, "reprcrash", None)
+            lines = report.longreprtext.strip().splitlines()
+            message = crash.message if crash else (lines[-1] if lines else "")
+        elif report.skipped and isinstance(report.longrepr, tuple):
+            message = report.longrepr[2]
+        self.recorder.phase(report.nodeid, report.when, report.outcome, report.duration, message,
+                            report.longreprtext if report.failed else "", dict(report.user_properties))
+
+    def pytest_runtest_logfinish(self, nodeid: str) -> None:
+        if self.worker is None:
+            self.recorder.finish(nodeid)
+
+    def pytest_sessionfinish(self, exitstatus: int) -> None:
+        if self.worker is None:
+            self.recorder.close(exitstatus=int(exitstatus))
+            write_junit(self.recorder.records(), self.junit)
+
+    def pytest_unconfigure(self) -> None:
+        self.stream.close()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("testsprite", "TestSprite TC scripts")
+    group.addoption("--tc-timeout", type=float, default=DEFAULT_TIMEOUT_S,
+                    help=f"seconds before a TC script is cancelled, 0 for none (default {DEFAULT_TIMEOUT_S:.0f})")
+    group.addoption("--tc-events", type=Path, default=None,
+                    help="NDJSON event stream (default <artifacts>/results/events.ndjson)")
+    group.addoption("--tc-junit", type=Path, default=None,
+                    help="JUnit XML written at the end (default <artifacts>/results/junit.xml)")
+    group.addoption("--tc-results", action="store_true", default=RECORD_RESULTS,
+                    help="record the event stream and JUnit XML (default from HARNESS_RESULTS)")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line("markers", "testsprite: a generated TestSprite TC script")
+    enabled = config.getoption("tc_results") or config.getoption("tc_events") or config.getoption("tc_junit")
+    if not enabled or config.option.collectonly:
+        return
+    reporter = ResultReporter(
+        config,
+        config.getoption("tc_events") or artifact_path("results", "events.ndjson"),
+        config.getoption("tc_junit") or artifact_path("results", "junit.xml"),
+    )
+    config.stash[RESULTS_KEY] = reporter
+    config.pluginmanager.register(reporter, "tc-results")
+
+
+def pytest_collect_file(file_path: Path, parent: pytest.Collector) -> Optional[TCScript]:
+    # Files named on the command line or matching python_files reach
+    # pytest's own collector, which asks pytest_pycollect_makemodule below.
+    if not TC_FILE.fullmatch(file_path.name) or parent.session.isinitpath(file_path):
+        return None
+    if any(fnmatch.fnmatch(file_path.name, pattern) for pattern in parent.config.getini("python_files")):
+        return None
+    return TCScript.from_parent(parent, path=file_path)
+
+
+def pytest_pycollect_makemodule(module_path: Path, parent: pytest.Collector) -> Optional[TCScript]:
+    if TC_FILE.fullmatch(module_path.name):
+        return TCScript.from_parent(parent, path=module_path)
+    return None
+
+
+@pytest.fixture(scope="session")
+def tc_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def tc_browser(tc_loop: asyncio.AbstractEventLoop) -> Iterator["async_api.Browser"]:
+    pytest.importorskip("playwright.async_api")
+    from harness.browser import browser_session
+
+    session = browser_session()
+    browser = tc_loop.run_until_complete(session.__aenter__())
+    try:
+        yield browser
+    finally:
+        tc_loop.run_until_complete(session.__aexit__(None, None, None))
+
+
+@pytest.fixture
+def tc_context(tc_loop: asyncio.AbstractEventLoop, tc_browser: "async_api.Browser") -> Iterator["async_api.BrowserContext"]:
+    from harness.browser import new_context
+
+    context = tc_loop.run_until_complete(new_context(tc_browser))
+    yield context
+    tc_loop.run_until_complete(context.close())
+
+
+@pytest.fixture(scope="session")
+def tc_session() -> dict:
+    from harness.auth import USER_EMAIL, USER_PASSWORD, password_grant
+
+    if not USER_EMAIL:
+        pytest.skip("set HARNESS_USER_EMAIL and HARNESS_USER_PASSWORD")
+    return password_grant(USER_EMAIL, USER_PASSWORD)
+
+
+@pytest.fixture
+def tc_authenticated_page(tc_loop: asyncio.AbstractEventLoop, tc_browser: "async_api.Browser",
+                          tc_session: dict) -> Iterator["async_api.Page"]:
+    from harness.auth import authenticated_context
+
+    context = tc_loop.run_until_complete(authenticated_context(tc_browser, tc_session))
+    page = tc_loop.run_until_complete(context.new_page())
+    yield page
+    tc_loop.run_until_complete(context.close())
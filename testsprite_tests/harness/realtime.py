@@ -0,0 +1,242 @@
+"""Realtime fan-out load test for the dashboard's outfit subscription.
+
+``RealTimeUpdates`` listens for ``postgres_changes`` on ``saved_outfits``
+filtered by ``user_id`` and, for every event, re-runs
+``select("*").eq("user_id", user.id)``. With several tabs open, a burst of
+edits turns into tabs x edits full-list refetches.
+
+The component is not mounted by any page yet, so rather than driving a
+browser this scenario reproduces its handler directly. A local realtime
+stand-in fans every change out to all subscribed sessions of the row's
+owner, and each session reacts with one of these strategies:
+
+``refetch``    what the component does: one full refetch per event, each
+               started as the event arrives without waiting for the last
+``debounced``  coalesce events for ``--debounce-ms``, then refetch once
+``payload``    apply ``payload.new`` to the local list, no request
+
+The edits are real ``PATCH`` requests and the refetches real PostgREST
+requests signed as the owner, so latency and bytes come from the actual
+stack. Reported per strategy: event-to-render latency (event published to
+the list being up to date), refetches per edit and bytes transferred::
+
+    python -m harness.realtime --users 5 --tabs 4 --outfits 200 --burst 100
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from harness.auth import mint_jwt
+from harness.config import SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, artifact_path
+from harness.factory import FactoryUser, provisioned
+from harness.postgrest import PostgrestClient
+from harness.stats import format_summary, summarize
+
+STRATEGIES = ("refetch", "debounced", "payload")
+
+
+@dataclass
+class ChangeEvent:
+    table: str
+    event_type: str
+    new: dict
+    published_at: float
+
+
+class RealtimeStandIn:
+    """In-process stand-in for the realtime server's per-row fan-out."""
+
+    def __init__(self, delivery_delay_ms: float = 0.0):
+        self.delivery_delay_ms = delivery_delay_ms
+        self._subscribers: dict[str, list[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(user_id, []).append(queue)
+        return queue
+
+    async def publish(self, event: ChangeEvent) -> int:
+        if self.delivery_delay_ms:
+            await asyncio.sleep(self.delivery_delay_ms / 1000)
+        queues = self._subscribers.get(event.new.get("user_id"), [])
+        for queue in queues:
+            queue.put_nowait(event)
+        return len(queues)
+
+    def close(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(None)
+
+
+@dataclass
+class SessionStats:
+    strategy: str
+    events: int = 0
+    refetches: int = 0
+    bytes: int = 0
+    latencies_ms: list[float] = field(default_factory=list)
+
+
+class DashboardSession:
+    """One open dashboard tab reacting to outfit changes."""
+
+    def __init__(self, user: FactoryUser, queue: asyncio.Queue, strategy: str,
+                 debounce_ms: float, pool: ThreadPoolExecutor):
+        self.user = user
+        self.queue = queue
+        self.strategy = strategy
+        self.debounce_ms = debounce_ms
+        self.pool = pool
+        self.client = PostgrestClient(api_key=SUPABASE_ANON_KEY, access_token=mint_jwt(user.id, email=user.email))
+        self.outfits: dict[str, dict] = {}
+        self.stats = SessionStats(strategy)
+
+    async def refetch(self) -> None:
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(
+            self.pool, lambda: self.client.select("saved_outfits", {"user_id": f"eq.{self.user.id}"})
+        )
+        self.stats.refetches += 1
+        self.stats.bytes += resp.bytes
+        if isinstance(resp.body, list):
+            self.outfits = {row["id"]: row for row in resp.body}
+
+    def _rendered(self, events: list[ChangeEvent]) -> None:
+        now = time.perf_counter()
+        self.stats.latencies_ms.extend((now - e.published_at) * 1000 for e in events)
+
+    async def _refetch_and_render(self, events: list[ChangeEvent]) -> None:
+        await self.refetch()
+        self._rendered(events)
+
+    async def run(self) -> SessionStats:
+        in_flight: set[asyncio.Task] = set()
+        while True:
+            event = await self.queue.get()
+            if event is None:
+                await asyncio.gather(*in_flight)
+                return self.stats
+            batch = [event]
+            if self.strategy == "debounced":
+                deadline = time.perf_counter() + self.debounce_ms / 1000
+                while (remaining := deadline - time.perf_counter()) > 0:
+                    try:
+                        nxt = await asyncio.wait_for(self.queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if nxt is None:
+                        self.queue.put_nowait(None)
+                        break
+                    batch.append(nxt)
+            self.stats.events += len(batch)
+            if self.strategy == "payload":
+                for e in batch:
+                    self.outfits[e.new["id"]] = e.new
+                self._rendered(batch)
+            elif self.strategy == "refetch":
+                # The component's handler fires its query and returns, so
+                # refetches for back-to-back events overlap.
+                task = asyncio.create_task(self._refetch_and_render(batch))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            else:
+                await self._refetch_and_render(batch)
+
+
+async def _burst(realtime: RealtimeStandIn, admin: PostgrestClient, outfits: list[dict],
+                 edits: int, pool: ThreadPoolExecutor) -> None:
+    loop = asyncio.get_running_loop()
+
+    async def edit(i: int) -> None:
+        outfit = outfits[i % len(outfits)]
+        resp = await loop.run_in_executor(pool, lambda: admin.update(
+            "saved_outfits", {"id": f"eq.{outfit['id']}"}, {"description": f"burst edit {i}"}))
+        if isinstance(resp.body, list) and resp.body:
+            await realtime.publish(ChangeEvent("saved_outfits", "UPDATE", resp.body[0], time.perf_counter()))
+
+    await asyncio.gather(*(edit(i) for i in range(edits)))
+
+
+async def run_strategy(strategy: str, users: list[FactoryUser], outfits: dict[str, list[dict]],
+                       tabs: int, burst: int, debounce_ms: float, connections: int) -> list[SessionStats]:
+    realtime = RealtimeStandIn()
+    admin = PostgrestClient(api_key=SUPABASE_SERVICE_ROLE_KEY)
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        sessions = [DashboardSession(user, realtime.subscribe(user.id), strategy, debounce_ms, pool)
+                    for user in users for _ in range(tabs)]
+        for session in sessions:
+            await session.refetch()  # the dashboard's initial load
+            session.stats = SessionStats(strategy)
+        running = [asyncio.create_task(s.run()) for s in sessions]
+        await asyncio.gather(*(_burst(realtime, admin, outfits[u.id], burst, pool) for u in users))
+        # Let queued events drain before closing the subscriptions.
+        while any(not s.queue.empty() for s in sessions):
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(debounce_ms / 1000 + 0.5)
+        realtime.close()
+        return await asyncio.gather(*running)
+
+
+def report(strategy: str, stats: list[SessionStats], edits: int) -> dict:
+    events = sum(s.events for s in stats)
+    refetches = sum(s.refetches for s in stats)
+    result = {
+        "strategy": strategy,
+        "sessions": len(stats),
+        "edits": edits,
+        "events": events,
+        "refetches": refetches,
+        "refetches_per_event": refetches / events if events else 0.0,
+        "refetches_per_edit": refetches / edits if edits else 0.0,
+        "bytes": sum(s.bytes for s in stats),
+        "latency": summarize(ms for s in stats for ms in s.latencies_ms),
+    }
+    print(f"{strategy}: {edits} edits -> {events} events, {refetches} refetches "
+          f"({result['refetches_per_edit']:.2f}/edit), {result['bytes'] / 1024:.0f} KiB")
+    print("  " + format_summary("event->render", result["latency"]))
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--tabs", type=int, default=4, help="open dashboard sessions per user")
+    parser.add_argument("--outfits", type=int, default=200, help="saved outfits per user")
+    parser.add_argument("--burst", type=int, default=100, help="edits per user in one burst")
+    parser.add_argument("--debounce-ms", type=float, default=250.0)
+    parser.add_argument("--connections", type=int, default=64, help="concurrent HTTP requests")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--max-refetches-per-edit", type=float, default=None,
+                        help="fail if any strategy refetches more than this per edit")
+    args = parser.parse_args(argv)
+
+    results = []
+    with provisioned() as make:
+        users = [make.user(f"realtime{i}") for i in range(args.users)]
+        admin = PostgrestClient(api_key=SUPABASE_SERVICE_ROLE_KEY)
+        outfits = {}
+        for user in users:
+            rows = [{"user_id": user.id, "name": f"Realtime outfit {n}"} for n in range(args.outfits)]
+            outfits[user.id] = admin.insert("saved_outfits", rows).body
+        for strategy in args.strategies:
+            stats = asyncio.run(run_strategy(strategy, users, outfits, args.tabs, args.burst,
+                                             args.debounce_ms, args.connections))
+            results.append(report(strategy, stats, args.users * args.burst))
+
+    artifact_path("realtime", "latest.json").write_text(json.dumps({"config": vars(args), "results": results},
+                                                                   indent=2))
+    limit = args.max_refetches_per_edit
+    if limit is not None and any(r["refetches_per_edit"] > limit for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
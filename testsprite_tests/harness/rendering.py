@@ -0,0 +1,241 @@
+"""Deterministic WebGL rendering profile for headless 3D runs.
+
+The TC scripts launch Chromium without GPU flags, so the Three.js scenes
+(``components/3d/avatar-model.tsx``, the customizer's ``CanvasStage``) land
+on whatever software path Chromium picks, at the host's DPR and wall-clock
+animation speed. This profile pins all of that down:
+
+* WebGL through ANGLE on SwiftShader, on every machine;
+* a fixed viewport and device pixel ratio;
+* ``Math.random`` replaced by a seeded generator;
+* a virtual clock: ``performance.now``, ``Date.now`` and the timestamps
+  passed to ``requestAnimationFrame`` advance by exactly one frame per
+  frame, and :func:`freeze` stops frames entirely until :func:`step` runs
+  a given number of them.
+
+So a scene animated by gsap or ``THREE.Clock`` reaches the same state after
+the same number of frames regardless of how slow the CPU is::
+
+    python -m harness.rendering --routes /3d-playground /customize --frames 120
+
+The CLI reports the WebGL renderer string, time per stepped frame and a
+screenshot digest that should be identical between runs.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Optional
+
+from playwright import async_api
+
+from harness.browser import browser_session, new_context
+from harness.config import LAUNCH_ARGS, NAVIGATION_TIMEOUT_MS, artifact_path, url_for
+from harness.stats import format_summary, summarize
+
+# ``--single-process`` from the TC flags keeps the GPU process in-process,
+# which SwiftShader tolerates poorly, so the profile launches without it.
+SWIFTSHADER_ARGS = [arg for arg in LAUNCH_ARGS if arg != "--single-process"] + [
+    "--use-gl=angle",
+    "--use-angle=swiftshader",
+    "--enable-unsafe-swiftshader",
+    "--ignore-gpu-blocklist",
+    "--disable-gpu-vsync",
+    "--disable-frame-rate-limit",
+]
+
+
+@dataclass
+class RenderProfile:
+    width: int = 1280
+    height: int = 720
+    dpr: float = 1.0
+    seed: int = 42
+    fps: int = 60
+    start_frozen: bool = False
+
+    def context_options(self) -> dict:
+        return {
+            "viewport": {"width": self.width, "height": self.height},
+            "device_scale_factor": self.dpr,
+            "reduced_motion": "no-preference",
+        }
+
+
+_CLOCK_SCRIPT = """
+((config) => {
+  let seed = config.seed >>> 0;
+  Math.random = () => {
+    seed = (seed + 0x6D2B79F5) >>> 0;
+    let t = seed;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+
+  const frameMs = 1000 / config.fps;
+  const epoch = Date.UTC(2024, 0, 1);
+  const nativeRaf = window.requestAnimationFrame.bind(window);
+  const nativeCancel = window.cancelAnimationFrame.bind(window);
+  const state = { now: 0, frames: 0, frozen: config.startFrozen, queue: new Map(), nextId: 1 };
+  window.__harnessClock = state;
+
+  performance.now = () => state.now;
+  Date.now = () => epoch + state.now;
+
+  const runFrame = () => {
+    state.now += frameMs;
+    state.frames += 1;
+    const callbacks = [...state.queue.values()];
+    state.queue.clear();
+    for (const cb of callbacks) {
+      try { cb(state.now); } catch (e) { setTimeout(() => { throw e; }); }
+    }
+  };
+  const pump = () => {
+    if (!state.frozen && state.queue.size) runFrame();
+    nativeRaf(pump);
+  };
+  nativeRaf(pump);
+
+  window.requestAnimationFrame = (cb) => {
+    const id = state.nextId++;
+    state.queue.set(id, cb);
+    return id;
+  };
+  window.cancelAnimationFrame = (id) => { state.queue.delete(id) || nativeCancel(id); };
+
+  state.freeze = () => { state.frozen = true; };
+  state.resume = () => { state.frozen = false; };
+  state.step = (n) => { for (let i = 0; i < n; i++) runFrame(); return state.frames; };
+})(%s);
+"""
+
+_RENDERER_INFO = """
+() => {
+  const gl = document.createElement("canvas").getContext("webgl");
+  if (!gl) return null;
+  const ext = gl.getExtension("WEBGL_debug_renderer_info");
+  return ext ? gl.getParameter(ext.UNMASKED_RENDERER_WEBGL) : gl.getParameter(gl.RENDERER);
+}
+"""
+
+
+def launch_args() -> list[str]:
+    return list(SWIFTSHADER_ARGS)
+
+
+async def render_context(browser: async_api.Browser, profile: RenderProfile) -> async_api.BrowserContext:
+    """A context with the profile's viewport, DPR, seeded RNG and virtual clock."""
+    context = await new_context(browser, **profile.context_options())
+    config = {"seed": profile.seed, "fps": profile.fps, "startFrozen": profile.start_frozen}
+    await context.add_init_script(_CLOCK_SCRIPT % json.dumps(config))
+    return context
+
+
+async def freeze(page: async_api.Page) -> None:
+    await page.evaluate("window.__harnessClock.freeze()")
+
+
+async def resume(page: async_api.Page) -> None:
+    await page.evaluate("window.__harnessClock.resume()")
+
+
+async def step(page: async_api.Page, frames: int = 1) -> int:
+    """Run ``frames`` animation frames synchronously; returns the frame count."""
+    return await page.evaluate("(n) => window.__harnessClock.step(n)", frames)
+
+
+async def renderer(page: async_api.Page) -> Optional[str]:
+    return await page.evaluate(_RENDERER_INFO)
+
+
+@dataclass
+class RenderRun:
+    route: str
+    renderer: Optional[str]
+    frames: int
+    frame_ms: list[float] = field(default_factory=list)
+    digest: str = ""
+
+    @property
+    def swiftshader(self) -> bool:
+        return bool(self.renderer) and "swiftshader" in self.renderer.lower()
+
+
+async def render_route(
+    browser: async_api.Browser,
+    profile: RenderProfile,
+    route: str,
+    frames: int,
+    warmup_frames: int,
+) -> RenderRun:
+    """Render ``route`` on a clock that never runs on its own.
+
+    The page is loaded frozen, so no animation frame runs until models and
+    textures are fetched; ``warmup_frames`` are then stepped untimed and
+    ``frames`` timed, which puts the scene in the same state on every run.
+    """
+    context = await render_context(browser, replace(profile, start_frozen=True))
+    try:
+        page = await context.new_page()
+        await page.goto(url_for(route), wait_until="networkidle", timeout=NAVIGATION_TIMEOUT_MS)
+        await page.wait_for_selector("canvas", timeout=NAVIGATION_TIMEOUT_MS)
+        await step(page, warmup_frames)
+        run = RenderRun(route, await renderer(page), frames)
+        for _ in range(frames):
+            started = time.perf_counter()
+            await step(page)
+            run.frame_ms.append((time.perf_counter() - started) * 1000)
+        png = await page.locator("canvas").first.screenshot(animations="disabled")
+        run.digest = hashlib.sha256(png).hexdigest()[:16]
+        return run
+    finally:
+        await context.close()
+
+
+async def run(profile: RenderProfile, routes: list[str], frames: int, warmup_frames: int) -> list[RenderRun]:
+    async with browser_session(args=launch_args()) as browser:
+        return [await render_route(browser, profile, route, frames, warmup_frames) for route in routes]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", default=["/3d-playground", "/customize"])
+    parser.add_argument("--frames", type=int, default=120, help="timed frames to step after warm-up")
+    parser.add_argument("--warmup-frames", type=int, default=60,
+                        help="untimed frames to step once the page has loaded")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--dpr", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if p95 frame time exceeds this")
+    args = parser.parse_args(argv)
+
+    profile = RenderProfile(args.width, args.height, args.dpr, args.seed, start_frozen=True)
+    runs = asyncio.run(run(profile, args.routes, args.frames, args.warmup_frames))
+
+    artifact_path("rendering", "latest.json").write_text(json.dumps({
+        "profile": asdict(profile),
+        "runs": [{**asdict(r), "frame": summarize(r.frame_ms)} for r in runs],
+    }, indent=2))
+
+    failed = False
+    for r in runs:
+        frame = summarize(r.frame_ms)
+        print(f"{r.route}: {r.renderer or 'no WebGL'}, digest {r.digest}")
+        print("  " + format_summary("frame", frame))
+        if not r.swiftshader:
+            print("  ! not rendering on SwiftShader; frame metrics are not comparable")
+            failed = True
+        if args.budget_ms is not None and frame["p95"] > args.budget_ms:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
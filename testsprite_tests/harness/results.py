@@ -0,0 +1,224 @@
+"""Live NDJSON result stream and JUnit XML for TC runs.
+
+``tmp/test_results.json`` is only written when a run completes. The pytest
+plugin (``harness.pytest_plugin``) instead appends one JSON line per event
+to ``<artifacts>/results/events.ndjson`` as the run goes, and writes
+``results/junit.xml`` when it ends::
+
+    {"event": "test_start", "test": "TC009_...py::run_test", ...}
+    {"event": "step", "test": "...", "index": 3, "title": "Click the 'Sign In' button ...", ...}
+    {"event": "test_finish", "test": "...", "outcome": "failed", "last_step": "...", ...}
+
+Every event is a single ``write`` on an ``O_APPEND`` descriptor, so xdist
+workers can share the file and a killed run leaves every finished test's
+record intact. JUnit XML can be rebuilt from such a stream, and tests that
+started but never finished are reported as errors at their last step::
+
+    tail -f tmp/harness/results/events.ndjson
+    python -m harness.results summary tmp/harness/results/events.ndjson
+    python -m harness.results junit tmp/harness/results/events.ndjson --out junit.xml
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+MAX_DETAILS_LENGTH = 4000
+
+
+def _clip(text: str, limit: int = MAX_DETAILS_LENGTH) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit] + f"... [{len(text) - limit} chars truncated]"
+
+
+class EventStream:
+    """Append-only NDJSON writer; each event goes out in one ``write``."""
+
+    def __init__(self, path: Path, truncate: bool = False, source: str = "main"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if truncate else 0)
+        self.path = path
+        self.source = source
+        self._fd = os.open(path, flags, 0o644)
+
+    def emit(self, event: str, **data) -> dict:
+        entry = {"event": event, "at": round(time.time(), 3), "source": self.source, **data}
+        os.write(self._fd, (json.dumps(entry, separators=(",", ":")) + "\n").encode())
+        return entry
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+@dataclass
+class TestRecord:
+    test: str
+    outcome: str = "passed"  # passed, failed, error, skipped
+    duration_s: float = 0.0
+    started_at: float = 0.0
+    phase: str = ""
+    error_type: str = ""  # exception class name, e.g. "TimeoutError"
+    message: str = ""
+    details: str = ""
+    steps: int = 0
+    last_step: Optional[str] = None
+
+
+class RunRecorder:
+    """Folds per-phase results into one record per test and streams them."""
+
+    def __init__(self, stream: EventStream):
+        self.stream = stream
+        self.running: dict[str, TestRecord] = {}
+        self.finished: list[TestRecord] = []
+
+    def start(self, test: str) -> None:
+        self.running[test] = TestRecord(test, started_at=time.time())
+        self.stream.emit("test_start", test=test)
+
+    def phase(self, test: str, when: str, outcome: str, duration_s: float, message: str = "",
+              details: str = "", properties: Optional[dict] = None) -> None:
+        record = self.running.setdefault(test, TestRecord(test, started_at=time.time()))
+        record.duration_s += duration_s
+        properties = properties or {}
+        record.steps = properties.get("steps", record.steps)
+        record.last_step = properties.get("last_step", record.last_step)
+        if outcome == "failed" and record.outcome in ("passed", "skipped"):
+            record.outcome = "failed" if when == "call" else "error"
+        elif outcome == "skipped" and record.outcome == "passed":
+            record.outcome = "skipped"
+        else:
+            return
+        record.phase, record.message, record.details = when, message, _clip(details)
+        record.error_type = properties.get("error_type", "")
+
+    def finish(self, test: str) -> Optional[TestRecord]:
+        record = self.running.pop(test, None)
+        if record is not None:
+            record.duration_s = round(record.duration_s, 3)
+            self.finished.append(record)
+            self.stream.emit("test_finish", **asdict(record))
+        return record
+
+    def records(self) -> list[TestRecord]:
+        """Finished records, then whatever was still running marked as interrupted."""
+        return self.finished + [_interrupted(r) for r in self.running.values()]
+
+    def close(self, **data) -> dict:
+        counts = Counter(r.outcome for r in self.records())
+        return self.stream.emit("run_finish", counts=dict(counts), unfinished=sorted(self.running), **data)
+
+
+def _interrupted(record: TestRecord) -> TestRecord:
+    return TestRecord(**{**asdict(record), "outcome": "error", "phase": "interrupted",
+                         "message": "run ended before the test finished"})
+
+
+def read_events(path: Path) -> list[dict]:
+    """Load a stream, skipping a torn line from a killed writer."""
+    events = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+
+def records_from_events(events: list[dict]) -> list[TestRecord]:
+    names = {f.name for f in fields(TestRecord)}
+    finished, running = {}, {}
+    for event in events:
+        test = event.get("test")
+        if event["event"] == "test_start":
+            running[test] = TestRecord(test, started_at=event["at"])
+        elif event["event"] == "step" and test in running:
+            running[test].steps = event["index"]
+            running[test].last_step = event["title"]
+        elif event["event"] == "test_finish":
+            running.pop(test, None)
+            finished[test] = TestRecord(**{k: v for k, v in event.items() if k in names})
+    # Unfinished tests ran at least until the last thing the stream recorded.
+    last_at = events[-1]["at"] if events else 0.0
+    for record in running.values():
+        record.duration_s = round(max(0.0, last_at - record.started_at), 3)
+    return list(finished.values()) + [_interrupted(r) for r in running.values()]
+
+
+def write_junit(records: list[TestRecord], path: Path, suite: str = "testsprite") -> Path:
+    counts = Counter(r.outcome for r in records)
+    started = min((r.started_at for r in records if r.started_at), default=time.time())
+    testsuite = ET.Element("testsuite", {
+        "name": suite,
+        "tests": str(len(records)),
+        "failures": str(counts["failed"]),
+        "errors": str(counts["error"]),
+        "skipped": str(counts["skipped"]),
+        "time": f"{sum(r.duration_s for r in records):.3f}",
+        "timestamp": datetime.fromtimestamp(started, timezone.utc).isoformat(timespec="seconds"),
+    })
+    for record in records:
+        location, _, name = record.test.partition("::")
+        case = ET.SubElement(testsuite, "testcase", {
+            "classname": location.removesuffix(".py").replace("/", "."),
+            "name": name or location,
+            "file": location,
+            "time": f"{record.duration_s:.3f}",
+        })
+        tag = {"failed": "failure", "error": "error", "skipped": "skipped"}.get(record.outcome)
+        if tag:
+            message = record.message if record.phase in ("", "call") else f"[{record.phase}] {record.message}"
+            attrs = {"message": message, **({"type": record.error_type} if record.error_type else {})}
+            ET.SubElement(case, tag, attrs).text = record.details or None
+        if record.steps:
+            ET.SubElement(case, "system-out").text = f"steps: {record.steps}\nlast step: {record.last_step}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    root = ET.Element("testsuites")
+    root.append(testsuite)
+    ET.indent(root)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+    return path
+
+
+def format_record(record: TestRecord) -> str:
+    line = f"{record.outcome:<8} {record.duration_s:>7.1f}s {record.test}"
+    if record.outcome in ("failed", "error"):
+        line += f"\n{'':18}{record.message or record.phase}"
+        if record.last_step:
+            line += f"\n{'':18}at step {record.steps}: {record.last_step}"
+    return line
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="print one line per test seen so far")
+    summary.add_argument("events", type=Path)
+    junit = sub.add_parser("junit", help="write JUnit XML from an event stream")
+    junit.add_argument("events", type=Path)
+    junit.add_argument("--out", type=Path, help="default: junit.xml next to the stream")
+    args = parser.parse_args(argv)
+
+    records = records_from_events(read_events(args.events))
+    if args.command == "junit":
+        print(write_junit(records, args.out or args.events.with_name("junit.xml")))
+    else:
+        for record in records:
+            print(format_record(record))
+        counts = Counter(r.outcome for r in records)
+        print(", ".join(f"{n} {outcome}" for outcome, n in sorted(counts.items())) or "no tests")
+    return 1 if any(r.outcome in ("failed", "error") for r in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
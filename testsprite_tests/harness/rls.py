@@ -0,0 +1,399 @@
+"""Row Level Security verification without the browser.
+
+Each table case is exercised with select, insert, update and delete as the
+row's ``owner``, as an ``other`` signed-in user and as ``anon``, and the
+outcome is compared with the intended policy from
+``scripts/15-optimize-rls-policies.sql`` (``scripts/07-fix-rls-security.sql``
+for the tables 15 does not redefine). Child tables (``outfit_items``,
+``order_items``, ``avatar_measurements``) get their parent rows seeded
+first, since their policies check ownership through the parent::
+
+    python -m harness.rls                 # straight against Postgres
+    python -m harness.rls --backend rest  # through PostgREST
+
+The ``sql`` backend does what PostgREST does per request: ``SET LOCAL ROLE``
+to ``authenticated``/``anon`` and publishes the JWT claims through
+``request.jwt.claims`` so ``auth.uid()`` resolves. Every check runs in its
+own transaction, synthetic users included, and is rolled back, so nothing
+is left behind. It needs a Supabase-flavoured database (``auth`` schema).
+
+The ``rest`` backend creates two throwaway users with
+:func:`harness.factory.provisioned`, signs requests with JWTs minted from
+``HARNESS_JWT_SECRET``, seeds and cleans rows with the service-role key
+(raising if a seed fails, so it is never mistaken for a deny), and deletes
+the users afterwards.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from harness.auth import jwt_claims, mint_jwt
+from harness.config import SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, artifact_path
+from harness.factory import RestFactory, provisioned
+from harness.postgrest import PostgrestClient
+
+ACTORS = ("owner", "other", "anon")
+OPERATIONS = ("select", "insert", "update", "delete")
+
+ALLOW, DENY = "allow", "deny"
+
+
+def _expect(**ops: tuple[str, str, str]) -> dict[str, dict[str, str]]:
+    """``select=(owner, other, anon)`` -> ``{"select": {"owner": ...}}``."""
+    owner_only = (ALLOW, DENY, DENY)
+    return {op: dict(zip(ACTORS, ops.get(op, owner_only))) for op in OPERATIONS}
+
+
+@dataclass
+class TableCase:
+    name: str
+    table: str
+    key: str
+    row: Callable[[str, str], dict]  # (owner_id, row_id) -> row
+    update: dict
+    expect: dict[str, dict[str, str]] = field(default_factory=_expect)
+    # The row's key is the owner's id (profiles), so it can't be deleted
+    # between checks, only restored.
+    keyed_by_owner: bool = False
+    # (owner_id, row_id) -> [(table, row), ...] seeded first with full
+    # privileges, for child tables whose policy checks a parent row.
+    parents: Callable[[str, str], list[tuple[str, dict]]] = lambda owner, rid: []
+
+
+def _linked(row_id: str, table: str) -> str:
+    """A stable id for the ``table`` parent of ``row_id``."""
+    return str(uuid.uuid5(uuid.UUID(row_id), table))
+
+
+def _product(rid: str) -> tuple[str, dict]:
+    return "products", {"id": _linked(rid, "products"), "name": "RLS product", "price": 10}
+
+
+def _outfit(owner: str, rid: str, public: bool = False) -> tuple[str, dict]:
+    return "saved_outfits", {"id": _linked(rid, "saved_outfits"), "user_id": owner,
+                             "name": "RLS parent outfit", "is_public": public}
+
+
+def _order(owner: str, rid: str) -> tuple[str, dict]:
+    return "orders", {"id": _linked(rid, "orders"), "user_id": owner, "total_amount": 10,
+                      "shipping_address": {}, "billing_address": {}}
+
+
+def _avatar(owner: str, rid: str) -> tuple[str, dict]:
+    return "avatars", {"id": _linked(rid, "avatars"), "user_id": owner, "name": "RLS parent avatar"}
+
+
+DEFAULT_CASES = [
+    TableCase(
+        "profiles", "profiles", "id",
+        lambda owner, _: {"id": owner, "email": f"{owner[:8]}@rls.test", "full_name": "RLS Owner"},
+        {"full_name": "RLS probe"},
+        _expect(delete=(DENY, DENY, DENY)),
+        keyed_by_owner=True,
+    ),
+    TableCase(
+        "avatars", "avatars", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "name": "RLS avatar"},
+        {"name": "RLS probe"},
+    ),
+    TableCase(
+        "saved_outfits", "saved_outfits", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "name": "RLS outfit", "is_public": False},
+        {"description": "RLS probe"},
+    ),
+    TableCase(
+        "saved_outfits[public]", "saved_outfits", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "name": "RLS public outfit", "is_public": True},
+        {"description": "RLS probe"},
+        _expect(select=(ALLOW, ALLOW, DENY)),
+    ),
+    TableCase(
+        "orders", "orders", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "total_amount": 0,
+                            "shipping_address": {}, "billing_address": {}},
+        {"notes": "RLS probe"},
+        _expect(delete=(DENY, DENY, DENY)),
+    ),
+    # Child tables: ownership comes from the parent row.
+    TableCase(
+        "outfit_items", "outfit_items", "id",
+        lambda owner, rid: {"id": rid, "outfit_id": _linked(rid, "saved_outfits"),
+                            "product_id": _linked(rid, "products")},
+        {"position_data": {"probe": True}},
+        parents=lambda owner, rid: [_product(rid), _outfit(owner, rid)],
+    ),
+    TableCase(
+        "outfit_items[public]", "outfit_items", "id",
+        lambda owner, rid: {"id": rid, "outfit_id": _linked(rid, "saved_outfits"),
+                            "product_id": _linked(rid, "products")},
+        {"position_data": {"probe": True}},
+        _expect(select=(ALLOW, ALLOW, DENY)),
+        parents=lambda owner, rid: [_product(rid), _outfit(owner, rid, public=True)],
+    ),
+    TableCase(
+        "order_items", "order_items", "id",
+        lambda owner, rid: {"id": rid, "order_id": _linked(rid, "orders"), "product_id": _linked(rid, "products"),
+                            "quantity": 1, "unit_price": 10, "total_price": 10},
+        {"quantity": 2, "total_price": 20},
+        _expect(delete=(DENY, DENY, DENY)),
+        parents=lambda owner, rid: [_product(rid), _order(owner, rid)],
+    ),
+    TableCase(
+        "avatar_measurements", "avatar_measurements", "id",
+        lambda owner, rid: {"id": rid, "avatar_id": _linked(rid, "avatars"),
+                            "measurement_type": "height", "value": 175},
+        {"value": 180},
+        parents=lambda owner, rid: [_avatar(owner, rid)],
+    ),
+    TableCase(
+        "cart_items", "cart_items", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "product_id": _linked(rid, "products"), "quantity": 1},
+        {"quantity": 2},
+        parents=lambda owner, rid: [_product(rid)],
+    ),
+    TableCase(
+        "favorites", "favorites", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "product_id": _linked(rid, "products")},
+        {"created_at": "2024-01-01T00:00:00+00:00"},
+        _expect(update=(DENY, DENY, DENY)),
+        parents=lambda owner, rid: [_product(rid)],
+    ),
+    TableCase(
+        "outfit_likes", "outfit_likes", "id",
+        lambda owner, rid: {"id": rid, "user_id": owner, "outfit_id": _linked(rid, "saved_outfits")},
+        {"created_at": "2024-01-01T00:00:00+00:00"},
+        _expect(select=(ALLOW, ALLOW, ALLOW), update=(DENY, DENY, DENY)),
+        parents=lambda owner, rid: [_outfit(owner, rid, public=True)],
+    ),
+]
+
+
+@dataclass
+class RlsResult:
+    case: str
+    operation: str
+    actor: str
+    expected: str
+    actual: str
+    detail: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.expected == self.actual
+
+
+class SqlBackend:
+    """Run each check in a rolled-back transaction as PostgREST would."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @contextmanager
+    def _check(self, case: TableCase, seed: bool) -> Iterator[dict]:
+        owner, other, row_id = str(uuid.uuid4()), str(uuid.uuid4()), str(uuid.uuid4())
+        with self.conn.transaction(force_rollback=True):
+            for uid in (owner, other):
+                self.conn.execute(
+                    "INSERT INTO auth.users (id, email, aud, role) VALUES (%s, %s, 'authenticated', 'authenticated')",
+                    (uid, f"{uid[:8]}@rls.test"),
+                )
+                self.conn.execute(
+                    "INSERT INTO public.profiles (id, email) VALUES (%s, %s) ON CONFLICT (id) DO NOTHING",
+                    (uid, f"{uid[:8]}@rls.test"),
+                )
+            for table, parent in case.parents(owner, row_id):
+                self._upsert(table, "id", parent)
+            row = case.row(owner, row_id)
+            if seed:
+                self._upsert(case.table, case.key, row)
+            else:
+                self.conn.execute(f"DELETE FROM public.{case.table} WHERE {case.key} = %s", (row[case.key],))
+            yield {"owner": owner, "other": other, "row": row}
+
+    def _upsert(self, table: str, key: str, row: dict) -> None:
+        cols = list(row)
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in cols if c != key)
+        self.conn.execute(
+            f"INSERT INTO public.{table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))}) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {updates}",
+            [_sql_value(row[c]) for c in cols],
+        )
+
+    def _become(self, actor: str, ids: dict) -> None:
+        if actor == "anon":
+            claims = jwt_claims(mint_jwt(None, role="anon"))
+        else:
+            claims = jwt_claims(mint_jwt(ids[actor], email=f"{ids[actor][:8]}@rls.test"))
+        role = claims["role"]
+        self.conn.execute(f"SET LOCAL ROLE {role}")
+        self.conn.execute("SELECT set_config('request.jwt.claims', %s, true)", (json.dumps(claims),))
+        self.conn.execute("SELECT set_config('request.jwt.claim.sub', %s, true)", (claims.get("sub", ""),))
+        self.conn.execute("SELECT set_config('request.jwt.claim.role', %s, true)", (role,))
+
+    def run(self, case: TableCase, operation: str, actor: str) -> tuple[str, str]:
+        with self._check(case, seed=operation != "insert") as ids:
+            row = ids["row"]
+            try:
+                with self.conn.transaction():
+                    self._become(actor, ids)
+                    count = self._execute(case, operation, row)
+            except Exception as error:  # RLS violations and missing grants both deny
+                return DENY, str(error).splitlines()[0]
+            return (ALLOW if count else DENY), f"{count} row(s)"
+
+    def _execute(self, case: TableCase, operation: str, row: dict) -> int:
+        table, key = f"public.{case.table}", case.key
+        if operation == "select":
+            return len(self.conn.execute(f"SELECT 1 FROM {table} WHERE {key} = %s", (row[key],)).fetchall())
+        if operation == "insert":
+            cols = list(row)
+            return self.conn.execute(
+                f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})",
+                [_sql_value(row[c]) for c in cols],
+            ).rowcount
+        if operation == "update":
+            sets = ", ".join(f"{c} = %s" for c in case.update)
+            return self.conn.execute(
+                f"UPDATE {table} SET {sets} WHERE {key} = %s",
+                [*(_sql_value(v) for v in case.update.values()), row[key]],
+            ).rowcount
+        return self.conn.execute(f"DELETE FROM {table} WHERE {key} = %s", (row[key],)).rowcount
+
+
+def _sql_value(value):
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+class RestBackend:
+    """Drive PostgREST with minted tokens for two users created by ``make``."""
+
+    def __init__(self, make: RestFactory):
+        self.admin = PostgrestClient(api_key=SUPABASE_SERVICE_ROLE_KEY)
+        self.users = {actor: make.user(f"rls-{actor}").id for actor in ("owner", "other")}
+        self.clients = {
+            actor: PostgrestClient(api_key=SUPABASE_ANON_KEY, access_token=mint_jwt(uid))
+            for actor, uid in self.users.items()
+        }
+        self.clients["anon"] = PostgrestClient(api_key=SUPABASE_ANON_KEY)
+
+    def _upsert(self, table: str, row: dict) -> None:
+        resp = self.admin.request("POST", f"rest/v1/{table}", body=row,
+                                  headers={"Prefer": "resolution=merge-duplicates,return=minimal"})
+        if resp.status >= 400:
+            raise RuntimeError(f"seeding {table} failed: HTTP {resp.status} {resp.body}")
+
+    def _delete(self, table: str, match: dict) -> None:
+        resp = self.admin.delete(table, match)
+        if resp.status >= 400:
+            raise RuntimeError(f"cleaning {table} failed: HTTP {resp.status} {resp.body}")
+
+    def run(self, case: TableCase, operation: str, actor: str) -> tuple[str, str]:
+        owner, row_id = self.users["owner"], str(uuid.uuid4())
+        parents = case.parents(owner, row_id)
+        for table, parent in parents:
+            self._upsert(table, parent)
+        try:
+            return self._check(case, operation, actor, case.row(owner, row_id))
+        finally:
+            for table, parent in reversed(parents):
+                self._delete(table, {"id": f"eq.{parent['id']}"})
+
+    def _check(self, case: TableCase, operation: str, actor: str, row: dict) -> tuple[str, str]:
+        match = {case.key: f"eq.{row[case.key]}"}
+        if operation == "insert":
+            self._delete(case.table, match)
+        else:
+            self._upsert(case.table, row)
+        client = self.clients[actor]
+        try:
+            if operation == "select":
+                resp = client.select(case.table, match)
+            elif operation == "insert":
+                resp = client.insert(case.table, row, returning=False)
+            elif operation == "update":
+                resp = client.update(case.table, match, case.update)
+            else:
+                resp = client.delete(case.table, match)
+        finally:
+            if case.keyed_by_owner:
+                self._upsert(case.table, row)
+            else:
+                self._delete(case.table, match)
+
+        if resp.status >= 400:
+            return DENY, f"HTTP {resp.status}"
+        if operation == "insert":
+            return ALLOW, f"HTTP {resp.status}"
+        rows = resp.body if isinstance(resp.body, list) else []
+        return (ALLOW if rows else DENY), f"{len(rows)} row(s)"
+
+
+def verify(backend, cases: list[TableCase]) -> list[RlsResult]:
+    results = []
+    for case in cases:
+        for operation in OPERATIONS:
+            for actor in ACTORS:
+                actual, detail = backend.run(case, operation, actor)
+                results.append(RlsResult(case.name, operation, actor,
+                                         case.expect[operation][actor], actual, detail))
+    return results
+
+
+def format_grid(results: list[RlsResult]) -> str:
+    header = f"{'table':<24}" + "".join(f"{op:>22}" for op in OPERATIONS)
+    lines = [header, f"{'':<24}" + "".join(f"{'/'.join(a[:5] for a in ACTORS):>22}" for _ in OPERATIONS)]
+    cells = {(r.case, r.operation, r.actor): r for r in results}
+    for case in dict.fromkeys(r.case for r in results):
+        row = f"{case:<24}"
+        for op in OPERATIONS:
+            marks = []
+            for actor in ACTORS:
+                r = cells[(case, op, actor)]
+                marks.append(("+" if r.actual == ALLOW else "-") + ("" if r.ok else "!"))
+            row += f"{' '.join(marks):>22}"
+        lines.append(row)
+    lines.append("+ allowed, - denied, ! differs from the policy spec")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["sql", "rest"], default="sql")
+    parser.add_argument("--spec", type=Path, help='JSON overrides: {"case": {"op": {"actor": "allow"}}}')
+    args = parser.parse_args(argv)
+
+    cases = copy.deepcopy(DEFAULT_CASES)
+    if args.spec:
+        overrides = json.loads(args.spec.read_text())
+        for case in cases:
+            for op, actors in overrides.get(case.name, {}).items():
+                case.expect[op].update(actors)
+
+    if args.backend == "sql":
+        from harness.db import connect
+
+        with connect() as conn:
+            results = verify(SqlBackend(conn), cases)
+    else:
+        with provisioned() as make:
+            results = verify(RestBackend(make), cases)
+
+    artifact_path("rls", "latest.json").write_text(
+        json.dumps([{**asdict(r), "ok": r.ok} for r in results], indent=2)
+    )
+    print(format_grid(results))
+    for r in results:
+        if not r.ok:
+            print(f"  {r.case} {r.operation} as {r.actor}: expected {r.expected}, got {r.actual} ({r.detail})")
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Read the app's route constants from ``lib/constants/routes.ts``.
+
+The TypeScript file is the single source of truth for page paths; parsing
+it here keeps the harness from drifting when routes are added or renamed.
+Only the ``key: "value"`` object-literal and ``[ROUTES.X, ...]`` array forms
+used in that file are understood.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from harness.config import REPO_ROOT
+
+ROUTES_FILE = REPO_ROOT / "lib" / "constants" / "routes.ts"
+
+_OBJECT_START = re.compile(r"export\s+const\s+ROUTES\s*=\s*\{")
+_ENTRY = re.compile(r'^\s*(\w+)\s*:\s*"([^"]*)"\s*,?')
+_NESTED = re.compile(r"^\s*(\w+)\s*:\s*\{")
+_ARRAY = re.compile(r"export\s+const\s+(\w+)\s*=\s*\[(.*?)\]", re.S)
+_ARRAY_ITEM = re.compile(r'ROUTES\.([\w.]+)|"([^"]*)"')
+
+
+@dataclass
+class RouteTable:
+    routes: dict[str, str]
+    groups: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def pages(self) -> list[str]:
+        """Unique page paths, excluding the ``API.*`` endpoints."""
+        seen = []
+        for key, path in self.routes.items():
+            if not key.startswith("API.") and path not in seen:
+                seen.append(path)
+        return seen
+
+    @property
+    def protected(self) -> list[str]:
+        return self.groups.get("PROTECTED_ROUTES", [])
+
+    @property
+    def auth(self) -> list[str]:
+        return self.groups.get("AUTH_ROUTES", [])
+
+    @property
+    def public(self) -> list[str]:
+        return [p for p in self.pages if p not in self.protected and p not in self.auth]
+
+
+def parse_routes(source: str) -> RouteTable:
+    start = _OBJECT_START.search(source)
+    if not start:
+        raise ValueError("no `export const ROUTES = {` found")
+
+    routes: dict[str, str] = {}
+    prefix: list[str] = []
+    depth = 1
+    for line in source[start.end():].splitlines():
+        line = line.split("//", 1)[0]
+        nested = _NESTED.match(line)
+        entry = _ENTRY.match(line)
+        if nested:
+            prefix.append(nested.group(1))
+            depth += 1
+        elif entry:
+            routes[".".join(prefix + [entry.group(1)])] = entry.group(2)
+        depth -= line.count("}")
+        if line.count("}"):
+            prefix = prefix[: max(0, depth - 1)]
+        if depth <= 0:
+            break
+
+    groups = {}
+    for name, body in _ARRAY.findall(source):
+        items = []
+        for key, literal in _ARRAY_ITEM.findall(body):
+            items.append(routes[key] if key else literal)
+        groups[name] = items
+    return RouteTable(routes, groups)
+
+
+def load_routes(path: Path = ROUTES_FILE) -> RouteTable:
+    return parse_routes(path.read_text(encoding="utf-8"))
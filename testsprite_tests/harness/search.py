@@ -0,0 +1,222 @@
+"""Search-latency benchmark for the gallery's ``ilike('%term%')`` product search.
+
+``GalleryGrid`` filters with ``name ILIKE '%<term>%'`` on every keystroke
+(there is no debounce), and no index in ``scripts/*.sql`` can serve a
+leading-wildcard pattern. This benchmark replays typed-query streams, one
+query per keystroke prefix, against a scaled catalog and times each query
+under four strategies:
+
+``ilike``      the current query with only the baseline indexes (bitmap
+               scans are disabled for it, so the trigram index built for
+               ``trigram`` cannot serve it)
+``trigram``    the same query backed by a ``pg_trgm`` GIN index
+``fulltext``   ``to_tsvector('simple', name) @@ prefix tsquery`` with a GIN index
+``prefix``     ``lower(name) LIKE 'term%'`` with a ``text_pattern_ops`` index
+
+Full-text and prefix change what matches, so each strategy's top-12 is also
+compared against the ``ilike`` results and reported as recall. The
+recommendation is the fastest p95 among strategies with acceptable recall::
+
+    python -m harness.search --rows 200000
+
+Requires psycopg.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from harness.catalog import ADJECTIVES, ITEMS, PRODUCTS_TABLE, seed_products
+from harness.config import artifact_path
+from harness.db import connect, timed
+from harness.stats import format_summary, summarize
+
+PAGE_SIZE = 12
+DEFAULT_MIN_RECALL = 0.9
+
+# Search terms shoppers type, from whole words to mid-word fragments.
+DEFAULT_TERMS = [
+    "leather jacket", "sneakers", "black", "denim", "summer dress", "hoodie",
+    "wool", "boots", "cap", "shirt", "vintage", "linen blazer",
+]
+
+
+def _tsquery(term: str) -> str:
+    """Turn ``"leather jac"`` into ``"leather:* & jac:*"``."""
+    words = (re.sub(r"[^\w-]", "", w) for w in term.split())
+    return " & ".join(f"{w}:*" for w in words if w)
+
+
+STRATEGIES = {
+    "ilike": {
+        "index": None,
+        # Same SQL as "trigram"; a GIN index is only reachable through a
+        # bitmap scan, so this keeps the baseline on today's plan.
+        "settings": {"enable_bitmapscan": "off"},
+        "where": "name ILIKE %s",
+        "param": lambda term: f"%{term}%",
+    },
+    "trigram": {
+        "index": f"CREATE INDEX IF NOT EXISTS bench_products_name_trgm ON {PRODUCTS_TABLE} "
+                 "USING GIN (name gin_trgm_ops)",
+        "where": "name ILIKE %s",
+        "param": lambda term: f"%{term}%",
+    },
+    "fulltext": {
+        "index": f"CREATE INDEX IF NOT EXISTS bench_products_name_fts ON {PRODUCTS_TABLE} "
+                 "USING GIN (to_tsvector('simple', name))",
+        "where": "to_tsvector('simple', name) @@ to_tsquery('simple', %s)",
+        "param": lambda term: _tsquery(term),
+    },
+    "prefix": {
+        "index": f"CREATE INDEX IF NOT EXISTS bench_products_name_prefix ON {PRODUCTS_TABLE} "
+                 "(lower(name) text_pattern_ops)",
+        "where": "lower(name) LIKE %s",
+        "param": lambda term: term.lower().replace("%", r"\%").replace("_", r"\_") + "%",
+    },
+}
+
+
+@dataclass
+class SearchSample:
+    strategy: str
+    term: str
+    query: str
+    ms: float
+    rows: int
+    recall: Optional[float]
+
+
+def typed_stream(term: str, rng: random.Random, typo_rate: float = 0.05) -> list[str]:
+    """Return the successive search-box values while ``term`` is typed.
+
+    Occasionally a wrong character is typed and then deleted, which like a
+    real keystroke produces two extra queries.
+    """
+    values, current = [], ""
+    for char in term:
+        if rng.random() < typo_rate:
+            values.append(current + rng.choice("qxzjv"))
+            values.append(current)
+        current += char
+        values.append(current)
+    return [v for v in values if v.strip()]
+
+
+def search_sql(strategy: str) -> str:
+    return (f"SELECT id FROM {PRODUCTS_TABLE} WHERE {STRATEGIES[strategy]['where']} "
+            f"ORDER BY created_at DESC LIMIT {PAGE_SIZE}")
+
+
+def prepare(conn, strategies: list[str]) -> None:
+    if "trigram" in strategies:
+        conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name in strategies:
+        if STRATEGIES[name]["index"]:
+            conn.execute(STRATEGIES[name]["index"])
+    conn.execute(f"ANALYZE {PRODUCTS_TABLE}")
+
+
+def run_streams(conn, strategies: list[str], streams: dict[str, list[str]]) -> list[SearchSample]:
+    samples = []
+    for term, queries in streams.items():
+        for query in queries:
+            baseline_ids = None
+            for name in strategies:
+                param = STRATEGIES[name]["param"](query.strip())
+                if not param.strip(" &:*%"):
+                    continue
+                settings = STRATEGIES[name].get("settings", {})
+                for key, value in settings.items():
+                    conn.execute(f"SET {key} = {value}")
+                try:
+                    ms, rows = timed(conn, search_sql(name), (param,))
+                finally:
+                    for key in settings:
+                        conn.execute(f"RESET {key}")
+                ids = {r[0] for r in rows}
+                if name == "ilike":
+                    baseline_ids = ids
+                recall = None
+                if baseline_ids is not None and name != "ilike":
+                    recall = len(ids & baseline_ids) / len(baseline_ids) if baseline_ids else 1.0
+                samples.append(SearchSample(name, term, query, ms, len(rows), recall))
+    return samples
+
+
+def recommend(samples: list[SearchSample], strategies: list[str], min_recall: float) -> dict:
+    report = {}
+    for name in strategies:
+        ours = [s for s in samples if s.strategy == name]
+        recalls = [s.recall for s in ours if s.recall is not None]
+        report[name] = {
+            **summarize(s.ms for s in ours),
+            "short_query_p95": summarize(s.ms for s in ours if len(s.query) < 3)["p95"],
+            "mean_recall": sum(recalls) / len(recalls) if recalls else 1.0,
+        }
+    eligible = [n for n in strategies if report[n]["mean_recall"] >= min_recall]
+    best = min(eligible, key=lambda n: report[n]["p95"]) if eligible else "ilike"
+    return {"strategies": report, "recommended": best, "min_recall": min_recall}
+
+
+def render_report(result: dict) -> str:
+    lines = [
+        "# Gallery search benchmark",
+        "",
+        "| strategy | n | p50 ms | p95 ms | p99 ms | p95 (<3 chars) | recall vs ilike |",
+        "| --- | --- | --- | --- | --- | --- | --- |",
+    ]
+    for name, r in result["strategies"].items():
+        lines.append(
+            f"| {name} | {r['count']} | {r['p50']:.2f} | {r['p95']:.2f} | {r['p99']:.2f} "
+            f"| {r['short_query_p95']:.2f} | {r['mean_recall']:.2%} |"
+        )
+    lines += [
+        "",
+        f"Recommended: **{result['recommended']}** (fastest p95 with recall >= {result['min_recall']:.0%}).",
+        "",
+        "Trigram indexes cannot help queries shorter than three characters; if those",
+        "dominate, debounce the search input or require a minimum length.",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--streams", type=int, default=40, help="typed sessions to replay")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--min-recall", type=float, default=DEFAULT_MIN_RECALL)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-seed", action="store_true", help="reuse the existing catalog")
+    args = parser.parse_args(argv)
+
+    strategies = ["ilike"] + [s for s in args.strategies if s != "ilike"]
+    rng = random.Random(args.seed)
+    vocabulary = DEFAULT_TERMS + [f"{a} {i}".lower() for a in ADJECTIVES[:5] for i in ITEMS[:5]]
+    terms = [rng.choice(vocabulary) for _ in range(args.streams)]
+    streams = {f"{i}:{term}": typed_stream(term, rng) for i, term in enumerate(terms)}
+
+    with connect() as conn:
+        if not args.no_seed:
+            seed_products(conn, args.rows)
+        prepare(conn, strategies)
+        samples = run_streams(conn, strategies, streams)
+
+    result = recommend(samples, strategies, args.min_recall)
+    artifact_path("search", "samples.json").write_text(json.dumps([asdict(s) for s in samples]))
+    artifact_path("search", "report.json").write_text(json.dumps(result, indent=2))
+    artifact_path("search", "report.md").write_text(render_report(result))
+
+    for name in strategies:
+        print(format_summary(name, summarize(s.ms for s in samples if s.strategy == name)))
+    print(f"recommended: {result['recommended']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
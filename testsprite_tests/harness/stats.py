@@ -0,0 +1,37 @@
+"""Small latency-statistics helpers shared by the benchmarks."""
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Nearest-rank percentile; ``pct`` is in the 0-100 range."""
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values: Iterable[float]) -> dict[str, float]:
+    """Return count, mean, p50, p95, p99 and max for a list of samples."""
+    samples = list(values)
+    if not samples:
+        return {"count": 0, "mean": float("nan"), "p50": float("nan"),
+                "p95": float("nan"), "p99": float("nan"), "max": float("nan")}
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
+
+
+def format_summary(label: str, summary: dict[str, float], unit: str = "ms") -> str:
+    return (
+        f"{label:<32} n={summary['count']:<6} mean={summary['mean']:.2f}{unit} "
+        f"p50={summary['p50']:.2f}{unit} p95={summary['p95']:.2f}{unit} "
+        f"p99={summary['p99']:.2f}{unit} max={summary['max']:.2f}{unit}"
+    )
@@ -0,0 +1,141 @@
+"""Failure-only Playwright tracing with a bounded artifact directory.
+
+Tracing is started once per context and each test records into its own
+trace chunk. The chunk is only written to ``traces/<test_id>-<stamp>.zip``
+when the test raises or runs past its time budget; passing tests discard
+their chunk without touching the disk::
+
+    tracer = FailureTracer(context)
+    await tracer.start()
+    async with tracer.test("TC009", budget_s=60):
+        ...
+
+Screenshots go through :class:`ArtifactStore`, which names them by content
+hash so identical frames are stored once, and :func:`enforce_retention`
+prunes the ``traces/`` and ``screenshots/`` directories by age and total
+size. Other reports under the artifact directory (visual baselines, the
+``latest.json`` files other modules compare against) are never touched.
+"""
+
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from playwright import async_api
+
+from harness.config import ARTIFACTS_DIR
+
+DEFAULT_MAX_AGE_DAYS = 7
+DEFAULT_MAX_TOTAL_MB = 500
+# The directories this module writes to, and the only ones retention prunes.
+RETAINED_KINDS = ("traces", "screenshots")
+
+
+class ArtifactStore:
+    """Content-addressed storage for screenshots and other binary artifacts."""
+
+    def __init__(self, root: Path = ARTIFACTS_DIR):
+        self.root = root
+
+    def put(self, data: bytes, suffix: str = ".png", kind: str = "screenshots") -> Path:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.root / kind / digest[:2] / f"{digest}{suffix}"
+        if path.exists():
+            # Refresh mtime so retention treats a re-used frame as recent.
+            path.touch()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+        return path
+
+    async def screenshot(self, page: async_api.Page, **kwargs) -> Path:
+        return self.put(await page.screenshot(**kwargs))
+
+
+def enforce_retention(
+    root: Path = ARTIFACTS_DIR,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    max_total_mb: float = DEFAULT_MAX_TOTAL_MB,
+    kinds: tuple[str, ...] = RETAINED_KINDS,
+) -> list[Path]:
+    """Delete artifacts under ``root/<kind>`` older than ``max_age_days``,
+    then oldest-first until they fit in ``max_total_mb``. Returns the
+    removed paths."""
+    dirs = [root / kind for kind in kinds if (root / kind).is_dir()]
+    cutoff = time.time() - max_age_days * 86400
+    removed = []
+    files = []
+    for path in (p for d in dirs for p in d.rglob("*")):
+        if not path.is_file():
+            continue
+        stat = path.stat()
+        if stat.st_mtime < cutoff:
+            path.unlink(missing_ok=True)
+            removed.append(path)
+        else:
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    budget = max_total_mb * 1024 * 1024
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= budget:
+            break
+        path.unlink(missing_ok=True)
+        removed.append(path)
+        total -= size
+
+    for directory in sorted((p for d in dirs for p in d.rglob("*") if p.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+    return removed
+
+
+class FailureTracer:
+    """Keep a per-test trace chunk and persist it only for failing tests."""
+
+    def __init__(
+        self,
+        context: async_api.BrowserContext,
+        root: Path = ARTIFACTS_DIR,
+        screenshots: bool = True,
+        snapshots: bool = True,
+    ):
+        self.context = context
+        self.root = root
+        self._screenshots = screenshots
+        self._snapshots = snapshots
+        self.saved: list[Path] = []
+
+    async def start(self) -> None:
+        await self.context.tracing.start(
+            screenshots=self._screenshots, snapshots=self._snapshots, sources=False
+        )
+
+    async def stop(self) -> None:
+        await self.context.tracing.stop()
+
+    @asynccontextmanager
+    async def test(self, test_id: str, budget_s: Optional[float] = None) -> AsyncIterator[None]:
+        await self.context.tracing.start_chunk(title=test_id)
+        started = time.monotonic()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            over_budget = budget_s is not None and time.monotonic() - started > budget_s
+            if failed or over_budget:
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+                path = self.root / "traces" / f"{test_id}-{stamp}.zip"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                await self.context.tracing.stop_chunk(path=path)
+                self.saved.append(path)
+            else:
+                await self.context.tracing.stop_chunk()
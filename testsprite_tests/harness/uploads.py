@@ -0,0 +1,236 @@
+"""Avatar upload pipeline benchmark: storage bucket vs inline base64.
+
+Onboarding (``components/onboarding/onboarding-flow.tsx``) uploads the file
+to the ``avatars`` bucket and stores its public URL on the profile; the
+settings page (``components/profile/settings-tabs.tsx``) reads the file as
+a data URL and writes the base64 string into ``profiles.avatar_url``. For
+images from 100 KB up to the 2 MB limit this benchmark runs both paths for
+many concurrent users and reports:
+
+* time to finish (upload + profile update, or the one inline update),
+* bytes sent and received, and the size of the resulting profile row,
+* what every later ``select * from profiles`` costs, since ``AuthProvider``
+  fetches the profile on each session load,
+* with ``--browser``, the time and JS heap ``readAsDataURL`` needs in
+  Chromium for the inline path.
+
+Storage requests go to the local Supabase stack's storage API::
+
+    python -m harness.uploads --sizes-kb 100 500 1000 2048 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from harness.auth import mint_jwt
+from harness.config import SUPABASE_ANON_KEY, SUPABASE_SERVICE_ROLE_KEY, SUPABASE_URL, artifact_path
+from harness.factory import FactoryUser, provisioned
+from harness.postgrest import PostgrestClient
+from harness.stats import format_summary, summarize
+
+BUCKET = "avatars"
+MAX_BYTES = 2 * 1024 * 1024  # settings-tabs.tsx rejects anything larger
+DEFAULT_SIZES_KB = [100, 250, 500, 1000, 2048]
+PATHS = ("storage", "inline")
+
+_READ_AS_DATA_URL = """
+async (size) => {
+  const blob = new Blob([new Uint8Array(size).map(() => Math.random() * 256)], { type: "image/jpeg" });
+  const started = performance.now();
+  const url = await new Promise((resolve) => {
+    const reader = new FileReader();
+    reader.onload = (e) => resolve(e.target.result);
+    reader.readAsDataURL(blob);
+  });
+  window.__harnessDataUrl = url;  // keep it alive like the profile state does
+  return { ms: performance.now() - started, length: url.length };
+}
+"""
+
+
+@dataclass
+class UploadSample:
+    path: str
+    size: int
+    total_ms: float
+    upload_ms: float
+    profile_ms: float
+    sent_bytes: int
+    received_bytes: int
+    profile_row_bytes: int
+    profile_fetch_ms: float
+    ok: bool = True
+    error: str = ""
+
+
+def fake_image(size: int) -> bytes:
+    """Incompressible bytes behind a JPEG header, so sizes survive any gzip."""
+    return b"\xff\xd8\xff\xe0" + os.urandom(max(0, size - 4))
+
+
+def _storage_upload(token: str, object_path: str, data: bytes) -> tuple[float, int]:
+    req = urllib.request.Request(
+        f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{object_path}",
+        data=data,
+        method="POST",
+        headers={
+            "apikey": SUPABASE_ANON_KEY,
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "image/jpeg",
+            "cache-control": "max-age=3600",
+            "x-upsert": "false",
+        },
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            body = resp.read()
+    except urllib.error.HTTPError as error:
+        raise RuntimeError(f"storage upload HTTP {error.code}: {error.read()[:200]!r}") from error
+    return (time.perf_counter() - started) * 1000, len(body)
+
+
+def remove_objects(paths: list[str]) -> None:
+    if not paths:
+        return
+    req = urllib.request.Request(
+        f"{SUPABASE_URL}/storage/v1/object/{BUCKET}",
+        data=json.dumps({"prefixes": paths}).encode(),
+        method="DELETE",
+        headers={
+            "apikey": SUPABASE_SERVICE_ROLE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_ROLE_KEY}",
+            "Content-Type": "application/json",
+        },
+    )
+    urllib.request.urlopen(req, timeout=60).close()
+
+
+def run_once(path: str, user: FactoryUser, image: bytes, uploaded: list[str]) -> UploadSample:
+    token = mint_jwt(user.id, email=user.email)
+    client = PostgrestClient(api_key=SUPABASE_ANON_KEY, access_token=token)
+    match = {"id": f"eq.{user.id}"}
+    started = time.perf_counter()
+    try:
+        if path == "storage":
+            # Same object name onboarding-flow.tsx builds.
+            object_path = f"avatars/{user.id}-{int(time.time() * 1000)}.jpg"
+            upload_ms, received = _storage_upload(token, object_path, image)
+            uploaded.append(object_path)
+            avatar_url = f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET}/{object_path}"
+            resp = client.request("PATCH", "rest/v1/profiles", match, {"avatar_url": avatar_url},
+                                  headers={"Prefer": "return=minimal"})
+            sent = len(image) + len(json.dumps({"avatar_url": avatar_url}))
+        else:
+            upload_ms, received = 0.0, 0
+            avatar_url = "data:image/jpeg;base64," + base64.b64encode(image).decode()
+            # updateProfile() chains .select(), so the row comes straight back.
+            resp = client.update("profiles", match, {"avatar_url": avatar_url})
+            sent = len(json.dumps({"avatar_url": avatar_url}))
+        if resp.status >= 400:
+            raise RuntimeError(f"profile update HTTP {resp.status}")
+        total_ms = (time.perf_counter() - started) * 1000
+        fetched = client.select("profiles", match)
+        return UploadSample(path, len(image), total_ms, upload_ms, resp.elapsed_ms, sent,
+                            received + resp.bytes, fetched.bytes, fetched.elapsed_ms)
+    except Exception as error:
+        return UploadSample(path, len(image), (time.perf_counter() - started) * 1000, 0, 0, 0, 0, 0, 0,
+                            False, str(error).splitlines()[0])
+
+
+def run_path(path: str, users: list[FactoryUser], size: int, onboardings: int,
+             uploaded: list[str]) -> tuple[list[UploadSample], float]:
+    image = fake_image(size)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as pool:
+        samples = list(pool.map(lambda i: run_once(path, users[i % len(users)], image, uploaded),
+                                range(onboardings)))
+    return samples, time.perf_counter() - started
+
+
+async def measure_data_url(sizes: list[int]) -> dict[int, dict]:
+    from harness.browser import browser_session, new_context
+
+    results = {}
+    async with browser_session() as browser:
+        for size in sizes:
+            context = await new_context(browser)
+            page = await context.new_page()
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Performance.enable")
+            await cdp.send("HeapProfiler.collectGarbage")
+            before = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+            read = await page.evaluate(_READ_AS_DATA_URL, size)
+            await cdp.send("HeapProfiler.collectGarbage")
+            after = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+            results[size] = {
+                "read_ms": read["ms"],
+                "data_url_chars": read["length"],
+                "heap_delta_mb": (after["JSHeapUsedSize"] - before["JSHeapUsedSize"]) / 1024 / 1024,
+            }
+            await context.close()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes-kb", nargs="+", type=int, default=DEFAULT_SIZES_KB)
+    parser.add_argument("--concurrency", type=int, default=16, help="users onboarding at once")
+    parser.add_argument("--onboardings", type=int, default=64, help="uploads per size and path")
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=list(PATHS))
+    parser.add_argument("--browser", action="store_true", help="also time readAsDataURL in Chromium")
+    args = parser.parse_args(argv)
+
+    sizes = [min(kb * 1024, MAX_BYTES) for kb in args.sizes_kb]
+    results, samples, uploaded = [], [], []
+    with provisioned() as make:
+        users = [make.user(f"upload{i}") for i in range(args.concurrency)]
+        try:
+            for size in sizes:
+                for path in args.paths:
+                    ours, elapsed = run_path(path, users, size, args.onboardings, uploaded)
+                    samples += ours
+                    ok = [s for s in ours if s.ok]
+                    row_bytes = max((s.profile_row_bytes for s in ok), default=0)
+                    results.append({
+                        "path": path,
+                        "size": size,
+                        "errors": len(ours) - len(ok),
+                        "per_sec": len(ok) / elapsed if elapsed else 0.0,
+                        "total": summarize(s.total_ms for s in ok),
+                        "profile_fetch": summarize(s.profile_fetch_ms for s in ok),
+                        "sent_bytes": max((s.sent_bytes for s in ok), default=0),
+                        "profile_row_bytes": row_bytes,
+                    })
+                    print(f"{path} {size // 1024} KB: {results[-1]['per_sec']:.1f}/s, "
+                          f"sent {results[-1]['sent_bytes'] // 1024} KB, profile row {row_bytes // 1024} KB, "
+                          f"{results[-1]['errors']} errors")
+                    print("  " + format_summary("total", results[-1]["total"]))
+                    print("  " + format_summary("profile fetch", results[-1]["profile_fetch"]))
+        finally:
+            remove_objects(uploaded)
+
+    data_url = asyncio.run(measure_data_url(sizes)) if args.browser else {}
+    for size, r in data_url.items():
+        print(f"readAsDataURL {size // 1024} KB: {r['read_ms']:.1f} ms, heap +{r['heap_delta_mb']:.1f} MB")
+
+    artifact_path("uploads", "latest.json").write_text(json.dumps({
+        "results": results,
+        "data_url": {str(k): v for k, v in data_url.items()},
+        "samples": [asdict(s) for s in samples],
+    }, indent=2))
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
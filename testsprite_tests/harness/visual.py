@@ -0,0 +1,216 @@
+"""Perceptual-hash visual regression for the landing, gallery and products pages.
+
+Each route is captured at fixed viewports with animations disabled. The new
+screenshot is compared with its baseline by a 256-bit difference hash first;
+the baseline hashes live in ``visual/index.json`` so that step never opens a
+baseline image. Only when the Hamming distance crosses ``--hash-threshold``
+is a full pixel diff run, and its diff image written next to the baseline::
+
+    python -m harness.visual --update          # record baselines
+    python -m harness.visual                   # compare against them
+
+Requires Pillow (``pip install pillow``).
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from playwright import async_api
+
+from harness.browser import browser_session, new_context
+from harness.config import ARTIFACTS_DIR, NAVIGATION_TIMEOUT_MS, url_for
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:  # pragma: no cover - optional dependency
+    Image = ImageChops = None
+
+VIEWPORTS = {
+    "desktop": {"width": 1280, "height": 720},
+    "tablet": {"width": 768, "height": 1024},
+    "mobile": {"width": 375, "height": 812},
+}
+
+DEFAULT_ROUTES = ["/", "/gallery", "/products"]
+HASH_SIZE = 16  # 16x16 gradient bits = 256-bit hash
+DEFAULT_HASH_THRESHOLD = 12
+# A pixel counts as changed when any channel moves by more than this.
+PIXEL_TOLERANCE = 16
+DEFAULT_MAX_CHANGED_RATIO = 0.002
+
+VISUAL_DIR = ARTIFACTS_DIR / "visual"
+
+
+def _require_pillow() -> None:
+    if Image is None:
+        raise RuntimeError("harness.visual needs Pillow: pip install pillow")
+
+
+def snapshot_key(route: str, viewport: str) -> str:
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", route).strip("-") or "home"
+    return f"{slug}@{viewport}"
+
+
+def dhash(image: "Image.Image", size: int = HASH_SIZE) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair."""
+    small = image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            bits = (bits << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def pixel_diff(baseline: "Image.Image", current: "Image.Image") -> tuple[float, "Image.Image"]:
+    """Return the fraction of changed pixels and a diff mask image."""
+    if baseline.size != current.size:
+        current = current.resize(baseline.size)
+    diff = ImageChops.difference(baseline.convert("RGB"), current.convert("RGB"))
+    mask = diff.convert("L").point(lambda v: 255 if v > PIXEL_TOLERANCE else 0)
+    changed = mask.histogram()[255]
+    return changed / (mask.width * mask.height), mask
+
+
+@dataclass
+class VisualResult:
+    key: str
+    route: str
+    viewport: str
+    distance: Optional[int]
+    changed_ratio: Optional[float]
+    status: str  # "new", "match", "hash-drift", "changed"
+
+
+class BaselineStore:
+    """Baseline PNGs keyed by route and viewport, with a hash index."""
+
+    def __init__(self, root: Path = VISUAL_DIR):
+        self.root = root
+        self.index_path = root / "index.json"
+        self.index: dict[str, str] = (
+            json.loads(self.index_path.read_text()) if self.index_path.exists() else {}
+        )
+
+    def image_path(self, key: str, kind: str = "baselines") -> Path:
+        return self.root / kind / f"{key}.png"
+
+    def hash_for(self, key: str) -> Optional[int]:
+        value = self.index.get(key)
+        return int(value, 16) if value else None
+
+    def save(self, key: str, png: bytes, digest: int) -> None:
+        path = self.image_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        self.index[key] = f"{digest:x}"
+
+    def flush(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path.write_text(json.dumps(self.index, indent=2, sort_keys=True))
+
+
+def compare(
+    store: BaselineStore,
+    key: str,
+    png: bytes,
+    hash_threshold: int = DEFAULT_HASH_THRESHOLD,
+    max_changed_ratio: float = DEFAULT_MAX_CHANGED_RATIO,
+    update: bool = False,
+) -> tuple[str, Optional[int], Optional[float]]:
+    _require_pillow()
+    current = Image.open(BytesIO(png))
+    digest = dhash(current)
+    baseline_hash = store.hash_for(key)
+    if update or baseline_hash is None:
+        store.save(key, png, digest)
+        return "new", None, None
+
+    distance = hamming(digest, baseline_hash)
+    if distance <= hash_threshold:
+        return "match", distance, None
+
+    baseline = Image.open(store.image_path(key))
+    ratio, mask = pixel_diff(baseline, current)
+    if ratio <= max_changed_ratio:
+        return "hash-drift", distance, ratio
+    for kind, image in (("diffs", mask), ("current", current)):
+        path = store.image_path(key, kind=kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        image.save(path)
+    return "changed", distance, ratio
+
+
+async def capture(page: async_api.Page, route: str) -> bytes:
+    await page.goto(url_for(route), wait_until="load", timeout=NAVIGATION_TIMEOUT_MS)
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NAVIGATION_TIMEOUT_MS)
+    except async_api.Error:
+        pass
+    return await page.screenshot(animations="disabled", caret="hide", full_page=False)
+
+
+async def run(
+    routes: list[str],
+    viewports: list[str],
+    hash_threshold: int,
+    max_changed_ratio: float,
+    update: bool,
+) -> list[VisualResult]:
+    _require_pillow()
+    store = BaselineStore()
+    results = []
+    async with browser_session() as browser:
+        for name in viewports:
+            context = await new_context(
+                browser, viewport=VIEWPORTS[name], device_scale_factor=1, reduced_motion="reduce"
+            )
+            page = await context.new_page()
+            try:
+                for route in routes:
+                    key = snapshot_key(route, name)
+                    png = await capture(page, route)
+                    status, distance, ratio = compare(
+                        store, key, png, hash_threshold, max_changed_ratio, update
+                    )
+                    results.append(VisualResult(key, route, name, distance, ratio, status))
+            finally:
+                await context.close()
+    store.flush()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", nargs="+", default=DEFAULT_ROUTES)
+    parser.add_argument("--viewports", nargs="+", choices=sorted(VIEWPORTS), default=list(VIEWPORTS))
+    parser.add_argument("--hash-threshold", type=int, default=DEFAULT_HASH_THRESHOLD)
+    parser.add_argument("--max-changed-ratio", type=float, default=DEFAULT_MAX_CHANGED_RATIO)
+    parser.add_argument("--update", action="store_true", help="overwrite baselines")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(
+        args.routes, args.viewports, args.hash_threshold, args.max_changed_ratio, args.update
+    ))
+    (VISUAL_DIR / "latest.json").write_text(json.dumps([asdict(r) for r in results], indent=2))
+    for r in results:
+        ratio = f"{r.changed_ratio:.4f}" if r.changed_ratio is not None else "-"
+        distance = r.distance if r.distance is not None else "-"
+        print(f"{r.key:<28} {r.status:<11} distance={distance} changed={ratio}")
+    return 1 if any(r.status == "changed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import struct
+
+from harness.assets import image_size
+
+
+def test_png():
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 640, 480)
+    assert image_size(header + b"\x08\x06\x00\x00\x00") == (640, 480)
+
+
+def test_jpeg_skips_segments_before_the_frame_header():
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + bytes(9)
+    sof0 = b"\xff\xc0" + struct.pack(">HBHH", 17, 8, 600, 800) + b"\x03"
+    assert image_size(b"\xff\xd8" + app0 + sof0 + bytes(16)) == (800, 600)
+
+
+def test_webp_lossy():
+    chunk = b"VP8 " + bytes(4) + b"\x00\x00\x00" + b"\x9d\x01\x2a" + struct.pack("<HH", 1024, 512)
+    assert image_size(b"RIFF" + bytes(4) + b"WEBP" + chunk) == (1024, 512)
+
+
+def test_webp_lossless():
+    bits = (300 - 1) | ((200 - 1) << 14)
+    chunk = b"VP8L" + bytes(4) + b"\x2f" + bits.to_bytes(4, "little")
+    assert image_size(b"RIFF" + bytes(4) + b"WEBP" + chunk) == (300, 200)
+
+
+def test_webp_extended():
+    chunk = b"VP8X" + bytes(4) + bytes(4) + (2047).to_bytes(3, "little") + (1023).to_bytes(3, "little")
+    assert image_size(b"RIFF" + bytes(4) + b"WEBP" + chunk) == (2048, 1024)
+
+
+def test_ktx2():
+    header = b"\xabKTX 20\xbb\r\n\x1a\n" + struct.pack("<III", 0, 1, 256) + struct.pack("<I", 128)
+    assert image_size(header) == (256, 128)
+
+
+def test_unknown_format():
+    assert image_size(b"GIF89a" + bytes(16)) == (None, None)
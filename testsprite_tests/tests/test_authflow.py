@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from harness.authflow import CheckpointRecorder  # noqa: E402
+
+
+class _Page:
+    def on(self, event, handler):
+        pass
+
+
+def _recorder(started: float, **times: float) -> CheckpointRecorder:
+    rec = CheckpointRecorder(_Page(), {})
+    rec.started = started
+    rec.times.update(times)
+    return rec
+
+
+def test_hops_measure_from_the_previous_checkpoint():
+    rec = _recorder(10.0, token=10.2, redirect=10.5, profile=10.6, rendered=11.0)
+    hops = rec.hops(["token", "redirect", "profile", "rendered"])
+    assert hops == pytest.approx({"token": 200, "redirect": 300, "profile": 100, "rendered": 400})
+
+
+def test_overlapping_checkpoints_are_not_double_counted():
+    # The profile fetch landed before the redirect, so it adds nothing.
+    rec = _recorder(10.0, token=10.2, redirect=10.5, profile=10.4, rendered=11.0)
+    hops = rec.hops(["token", "redirect", "profile", "rendered"])
+    assert hops == pytest.approx({"token": 200, "redirect": 300, "profile": 0, "rendered": 500})
+    assert sum(hops.values()) == pytest.approx(1000)
+
+
+def test_missing_checkpoints_are_skipped():
+    rec = _recorder(10.0, signup=10.3, rendered=10.5)
+    assert rec.hops(["signup", "verify", "rendered"]) == pytest.approx({"signup": 300, "rendered": 200})
@@ -0,0 +1,44 @@
+from harness.churn import CommandSample, default_plan, regressions, summarize_kinds
+
+
+def _kind(commits: float, p95: float) -> dict:
+    return {"commits_per_command": commits, "wall_ms": {"p95": p95}}
+
+
+def test_default_plan_kinds():
+    plan = default_plan(3)
+    assert [burst.kind for burst in plan] == ["color", "logo", "full", "toggle"]
+    assert all(len(burst.commands) == 3 for burst in plan)
+
+
+def test_summarize_kinds_averages_per_command():
+    samples = [
+        CommandSample("color", "color #ff0000", 2, {"Shirt": 1, "CanvasStage": 1}, 4.0, 10.0, 0.0),
+        CommandSample("color", "color #00C4B4", 4, {"Shirt": 3}, None, 20.0, 60.0),
+        CommandSample("logo", "logo /textures/demo-2.png", 1, {}, None, 5.0, 0.0),
+    ]
+    report = summarize_kinds(samples)
+    assert list(report) == ["color", "logo"]
+    color = report["color"]
+    assert color["commands"] == 2
+    assert color["commits_per_command"] == 3.0
+    assert color["renders_per_command"] == {"Shirt": 2.0, "CanvasStage": 0.5}
+    assert color["render_ms"]["count"] == 1
+    assert color["long_task_ms"] == 60.0
+    assert report["logo"]["render_ms"] is None
+
+
+def test_regressions_flags_growth_past_the_allowance():
+    baseline = {"color": _kind(2.0, 10.0)}
+    current = {"color": _kind(3.0, 12.0)}
+    assert regressions(baseline, current, 0.25) == ["color: commits/command 2.0 -> 3.0"]
+
+
+def test_regressions_allows_growth_within_the_allowance():
+    assert regressions({"logo": _kind(2.0, 10.0)}, {"logo": _kind(2.5, 12.5)}, 0.25) == []
+
+
+def test_regressions_ignores_new_kinds_and_zero_baselines():
+    baseline = {"full": _kind(0.0, 0.0)}
+    current = {"full": _kind(4.0, 30.0), "toggle": _kind(9.0, 90.0)}
+    assert regressions(baseline, current, 0.25) == []
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from harness.coverage import chunk_name, used_bytes  # noqa: E402
+
+
+@pytest.mark.parametrize("url, name", [
+    ("http://localhost:3000/_next/static/chunks/app/gallery/page-3f2a9c1b7e4d5a60.js", "app/gallery/page.js"),
+    ("http://localhost:3000/_next/static/chunks/webpack-0123456789abcdef.js", "webpack.js"),
+    ("http://localhost:3000/_next/static/chunks/main-app.js?v=1", "main-app.js"),
+    ("http://localhost:3000/_next/static/development/_buildManifest.js", "development/_buildManifest.js"),
+    ("https://cdn.example.com/vendor/three.min.js", "vendor/three.min.js"),
+])
+def test_chunk_name(url, name):
+    assert chunk_name(url) == name
+
+
+def _fn(*ranges):
+    return {"ranges": [{"startOffset": s, "endOffset": e, "count": c} for s, e, c in ranges]}
+
+
+def test_used_bytes_inner_ranges_override_the_function_body():
+    # 0-100 ran, 20-40 never did, and 25-30 inside it did after all.
+    assert used_bytes([_fn((0, 100, 1), (20, 40, 0), (25, 30, 2))], 100) == 85
+
+
+def test_used_bytes_uncalled_function():
+    assert used_bytes([_fn((0, 50, 1)), _fn((50, 100, 0))], 100) == 50
+
+
+def test_used_bytes_clamps_ranges_to_the_script():
+    assert used_bytes([_fn((-5, 500, 1))], 100) == 100
+    assert used_bytes([_fn((0, 10, 1))], 0) == 0
@@ -0,0 +1,28 @@
+import pytest
+
+from harness.crawl import Visit, failure_reason, format_table
+
+
+@pytest.mark.parametrize("route, status, final_path, expect_redirect, reason", [
+    ("/gallery", 200, "/gallery", False, ""),
+    ("/dashboard", 200, "/auth/login", True, ""),
+    ("/dashboard", 200, "/auth/login?next=/dashboard", True, ""),
+    ("/dashboard", None, "/auth/login", True, ""),
+    ("/dashboard", 200, "/dashboard", True, "expected redirect to /auth/login, stayed on /dashboard"),
+    ("/dashboard", 200, "/auth/login", False, "unexpected redirect to /auth/login"),
+    ("/missing", 404, "/missing", False, "HTTP 404"),
+    ("/dashboard", 500, "/auth/login", True, "HTTP 500"),
+])
+def test_failure_reason(route, status, final_path, expect_redirect, reason):
+    assert failure_reason(route, status, final_path, expect_redirect) == reason
+
+
+def test_format_table_sorts_and_marks_failures():
+    visits = [
+        Visit("/gallery", "anonymous", 200, "/gallery", 12.4, 80.0, None, 300.0),
+        Visit("/dashboard", "anonymous", None, None, None, None, None, 10000.0, False, "Timeout"),
+    ]
+    header, first, second = format_table(visits).splitlines()
+    assert header.split()[:2] == ["route", "persona"]
+    assert first.startswith("/dashboard") and first.endswith("FAIL Timeout")
+    assert second.split() == ["/gallery", "anonymous", "200", "12", "80", "-", "300", "ok"]
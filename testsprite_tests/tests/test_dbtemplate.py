@@ -0,0 +1,37 @@
+from harness import dbtemplate
+
+
+def _scripts(tmp_path, monkeypatch, names):
+    for name in names:
+        (tmp_path / name).write_text(f"-- {name}\n")
+    monkeypatch.setattr(dbtemplate, "SCRIPTS_DIR", tmp_path)
+
+
+def test_migration_scripts_follow_script_order(tmp_path, monkeypatch):
+    _scripts(tmp_path, monkeypatch, ["20-z.sql", "01-create-tables.sql", "05-a.sql", "00-complete-database-setup.sql"])
+    assert [p.name for p in dbtemplate.migration_scripts()] == [
+        "00-complete-database-setup.sql", "05-a.sql", "20-z.sql"]
+
+
+def test_schema_hash_ignores_scripts_that_are_not_applied(tmp_path, monkeypatch):
+    _scripts(tmp_path, monkeypatch, ["00-complete-database-setup.sql", "01-create-tables.sql", "05-a.sql"])
+    before = dbtemplate.schema_hash()
+    (tmp_path / "01-create-tables.sql").write_text("-- edited\n")
+    (tmp_path / "notes.sql").write_text("-- not a migration\n")
+    assert dbtemplate.schema_hash() == before
+
+    (tmp_path / "05-a.sql").write_text("-- edited\n")
+    assert dbtemplate.schema_hash() != before
+
+
+def test_schema_hash_covers_script_names(tmp_path, monkeypatch):
+    _scripts(tmp_path, monkeypatch, ["00-complete-database-setup.sql", "05-a.sql"])
+    before = dbtemplate.schema_hash()
+    (tmp_path / "05-a.sql").rename(tmp_path / "05-b.sql")
+    assert dbtemplate.schema_hash() != before
+
+
+def test_names():
+    assert dbtemplate.template_name("abc123") == "harness_tpl_abc123"
+    assert dbtemplate.clone_name("gw0") == "harness_db_gw0"
+    assert not dbtemplate.clone_name("gw0").startswith(dbtemplate.TEMPLATE_PREFIX)
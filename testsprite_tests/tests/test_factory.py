@@ -0,0 +1,70 @@
+import pytest
+
+from harness import factory
+from harness.postgrest import RestResponse
+
+
+class _Admin:
+    def __init__(self, status=200):
+        self.status = status
+        self.inserted = []
+        self.deleted = []
+
+    def insert(self, table, row):
+        self.inserted.append((table, row))
+        return RestResponse(201, 1.0, [{"id": f"{table}-{len(self.inserted)}", **row}], 0, {})
+
+    def delete(self, table, filters):
+        self.deleted.append((table, filters))
+        return RestResponse(self.status, 1.0, {"message": "denied"} if self.status >= 400 else [], 0, {})
+
+
+@pytest.fixture
+def rest(monkeypatch):
+    deleted = []
+
+    def delete_user(user_id):
+        deleted.append(user_id)
+        if user_id == "broken":
+            raise OSError("connection reset")
+
+    monkeypatch.setattr(factory, "delete_user", delete_user)
+    made = factory.RestFactory("abcd1234")
+    made.admin = _Admin()
+    return made, deleted
+
+
+def test_emails_are_namespaced():
+    one, other = factory.SqlFactory(None), factory.SqlFactory(None)
+    assert one.namespace != other.namespace
+    assert factory.SqlFactory(None, "ns1").email("buyer") == "harness+ns1-buyer@example.com"
+
+
+def test_products_are_tracked_for_teardown(rest):
+    made, _ = rest
+    product = made.product(price=5)
+    assert made.product_ids == [product["id"]]
+    assert product["name"] == "Harness product abcd1234"
+
+
+def test_close_deletes_users_newest_first_then_products(rest):
+    made, deleted = rest
+    made.user_ids += ["u1", "u2"]
+    made.product_ids += ["p1", "p2"]
+    made.close()
+    assert deleted == ["u2", "u1"]
+    assert made.admin.deleted == [("products", {"id": "in.(p1,p2)"})]
+    assert made.user_ids == [] and made.product_ids == []
+
+
+def test_close_attempts_every_delete_before_raising(rest):
+    made, deleted = rest
+    made.admin.status = 403
+    made.user_ids += ["u1", "broken", "u3"]
+    made.product_ids.append("p1")
+    with pytest.raises(RuntimeError) as error:
+        made.close()
+    assert deleted == ["u3", "broken", "u1"]
+    assert made.admin.deleted == [("products", {"id": "in.(p1)"})]
+    assert "user broken: connection reset" in str(error.value)
+    assert "products: HTTP 403" in str(error.value)
@@ -0,0 +1,72 @@
+from harness import pagination
+from harness.pagination import PAGE_SIZE, PageSample, depth_table, keyset_sql, offset_sql, walk_rest, walk_sql
+from harness.postgrest import RestResponse
+
+
+def test_offset_sql_orders_by_the_sort_column():
+    sql = offset_sql("price-high-low")
+    assert sql.endswith(f"ORDER BY price DESC LIMIT {PAGE_SIZE} OFFSET %s")
+
+
+def test_keyset_sql_breaks_ties_on_id():
+    assert "WHERE" not in keyset_sql("newest", first=True)
+    assert "WHERE (created_at, id) < (%s, %s) ORDER BY created_at DESC, id DESC" in keyset_sql("newest", first=False)
+    assert "WHERE (price, id) > (%s, %s) ORDER BY price ASC, id ASC" in keyset_sql("price-low-high", first=False)
+
+
+def _rows(start, count):
+    return [{"id": f"p{n}", "price": n // 2} for n in range(start, start + count)]
+
+
+class _Client:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+
+    def select(self, table, params):
+        self.calls.append(dict(params))
+        start = int(params.get("offset", 0)) or PAGE_SIZE * sum("or" in c for c in self.calls)
+        return RestResponse(200, 1.0, _rows(start, max(0, min(PAGE_SIZE, self.total - start))), 0, {})
+
+
+def test_walk_rest_stops_on_an_empty_page():
+    client = _Client(total=PAGE_SIZE * 2)
+    samples = list(walk_rest(client, "price-low-high", pages=5))
+    assert [(s.strategy, s.page, s.rows) for s in samples] == [
+        ("offset", 1, PAGE_SIZE), ("offset", 2, PAGE_SIZE), ("offset", 3, 0),
+        ("keyset", 1, PAGE_SIZE), ("keyset", 2, PAGE_SIZE), ("keyset", 3, 0),
+    ]
+
+
+def test_walk_rest_keyset_cursor_uses_the_last_row():
+    client = _Client(total=PAGE_SIZE * 3)
+    list(walk_rest(client, "price-low-high", pages=2))
+    keyset = [c for c in client.calls if "offset" not in c]
+    assert "or" not in keyset[0]
+    assert keyset[0]["order"] == "price.asc,id.asc"
+    last = _rows(0, PAGE_SIZE)[-1]
+    assert keyset[1]["or"] == f"(price.gt.{last['price']},and(price.eq.{last['price']},id.gt.{last['id']}))"
+
+
+def test_walk_sql_passes_the_cursor_from_the_last_row(monkeypatch):
+    calls = []
+    id_at, price_at = pagination.COLUMNS.index("id"), pagination.COLUMNS.index("price")
+
+    def timed(conn, query, params=None):
+        calls.append((query, params))
+        page = len(calls)
+        row = [None] * len(pagination.COLUMNS)
+        row[id_at], row[price_at] = f"id{page}", page
+        return 2.0, [tuple(row)] if page != 2 else []
+
+    monkeypatch.setattr(pagination, "timed", timed)
+    samples = list(walk_sql(None, "price-low-high", pages=3))
+    assert [(s.strategy, s.page) for s in samples] == [("offset", 1), ("offset", 2),
+                                                        ("keyset", 1), ("keyset", 2), ("keyset", 3)]
+    assert [params for _, params in calls] == [(0,), (PAGE_SIZE,), None, (3, "id3"), (4, "id4")]
+
+
+def test_depth_table_buckets_by_page():
+    samples = [PageSample("newest", "offset", page, float(page), 12) for page in (1, 5, 20, 600)]
+    labels = [line.split(":")[0].split("  ")[0] for line in depth_table(samples)]
+    assert [label.split()[1] for label in labels] == ["p1-10", "p11-100", "p501-1000"]
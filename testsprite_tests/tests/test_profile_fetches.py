@@ -0,0 +1,28 @@
+from harness.profile_fetches import NavigationAudit, ProfileFetch, _normalise
+
+
+def _fetch(query, method="GET"):
+    return ProfileFetch(0.0, method, _normalise(query), [], None)
+
+
+def test_profile_id_comes_from_the_id_filter():
+    assert _fetch("select=*&id=eq.u1").profile_id == "u1"
+    assert _fetch("select=full_name").profile_id is None
+
+
+def test_duplicates_key_on_the_profile_not_the_query():
+    audit = NavigationAudit("cold-load", "/dashboard", [
+        _fetch("select=*&id=eq.u1"),
+        _fetch("select=full_name,avatar_url&id=eq.u1"),
+        _fetch("id=eq.u1&select=*"),
+        _fetch("select=*&id=eq.u2"),
+        _fetch("id=eq.u1", method="PATCH"),
+    ])
+    assert audit.duplicates == 2
+    assert not audit.ok
+
+
+def test_one_read_per_profile_is_ok():
+    audit = NavigationAudit("sign-in", "/auth/login -> /dashboard",
+                            [_fetch("select=*&id=eq.u1"), _fetch("select=*&id=eq.u2")])
+    assert audit.duplicates == 0 and audit.ok
@@ -0,0 +1,83 @@
+import ast
+import asyncio
+import textwrap
+import traceback
+
+import pytest
+
+from harness.pytest_plugin import MarkSteps, StripEntryPoint, _comments, load_script
+
+SCRIPT = textwrap.dedent('''\
+    import asyncio
+
+    async def run_test():
+        # Open the login page
+        steps.append("open")
+        # Fill in the form
+        # with a valid user
+        steps.append("fill")
+        try:
+            # Click 'Sign In'
+            steps.append("click")
+            value = 1
+        finally:
+            steps.append("done")
+
+    def fail():
+        raise ValueError("line 17")
+
+    steps = []
+    asyncio.run(run_test())
+    ''')
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "TC001_login.py"
+    path.write_text(SCRIPT)
+    return path
+
+
+def test_strip_entry_point_drops_module_level_asyncio_run():
+    tree = StripEntryPoint().visit(ast.parse(SCRIPT))
+    assert "asyncio.run" not in ast.unparse(tree)
+    assert "import asyncio" in ast.unparse(tree)
+
+
+def test_strip_entry_point_keeps_nested_and_assigned_calls():
+    source = "result = asyncio.run(main())\ndef f():\n    asyncio.run(main())\n"
+    assert ast.unparse(StripEntryPoint().visit(ast.parse(source))) == ast.unparse(ast.parse(source))
+
+
+def test_title_above_joins_consecutive_comment_lines():
+    marker = MarkSteps(_comments(SCRIPT))
+    assert marker._title_above(5) == "Open the login page"
+    assert marker._title_above(8) == "Fill in the form with a valid user"
+    assert marker._title_above(9) == ""
+
+
+def test_load_script_does_not_run_the_entry_point(script):
+    module = load_script(script)
+    assert module.steps == []
+    assert module.__file__ == str(script)
+
+
+def test_load_script_keeps_line_numbers(script):
+    module = load_script(script)
+    with pytest.raises(ValueError) as error:
+        module.fail()
+    frame = traceback.extract_tb(error.tb)[-1]
+    assert (frame.filename, frame.lineno) == (str(script), 17)
+
+
+def test_load_script_marks_steps_in_run_test_and_its_try_body(script):
+    module = load_script(script)
+    marked = []
+    module.__tc_step__ = lambda title, line: marked.append((title, line, list(module.steps)))
+    asyncio.run(module.run_test())
+    assert marked == [
+        ("Open the login page", 5, []),
+        ("Fill in the form with a valid user", 8, ["open"]),
+        ("Click 'Sign In'", 11, ["open", "fill"]),
+    ]
+    assert module.steps == ["open", "fill", "click", "done"]
@@ -0,0 +1,71 @@
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+import pytest
+
+from harness.pytest_plugin import ResultReporter
+from harness.results import TestRecord as Record, records_from_events, write_junit
+
+EVENTS = [
+    {"event": "run_start", "at": 100.0},
+    {"event": "test_start", "test": "TC001_a.py::run_test", "at": 100.0},
+    {"event": "test_finish", "at": 102.0, "test": "TC001_a.py::run_test", "outcome": "failed",
+     "duration_s": 2.0, "started_at": 100.0, "phase": "call", "error_type": "TimeoutError",
+     "message": "TimeoutError: slow", "steps": 2, "last_step": "Click submit"},
+    {"event": "test_start", "test": "TC002_b.py::run_test", "at": 102.0},
+    {"event": "step", "test": "TC002_b.py::run_test", "index": 1, "title": "Open login", "at": 103.0},
+    {"event": "step", "test": "TC002_b.py::run_test", "index": 2, "title": "Fill email", "at": 105.5},
+]
+
+
+def test_records_from_events_keeps_finished_tests():
+    finished = records_from_events(EVENTS)[0]
+    assert finished.outcome == "failed"
+    assert finished.error_type == "TimeoutError"
+    assert finished.last_step == "Click submit"
+
+
+def test_records_from_events_reports_unfinished_tests_as_interrupted():
+    unfinished = records_from_events(EVENTS)[1]
+    assert unfinished.test == "TC002_b.py::run_test"
+    assert unfinished.outcome == "error"
+    assert unfinished.phase == "interrupted"
+    assert (unfinished.steps, unfinished.last_step) == (2, "Fill email")
+    assert unfinished.duration_s == 3.5
+
+
+def test_records_from_events_tolerates_an_empty_stream():
+    assert records_from_events([]) == []
+
+
+def test_write_junit(tmp_path):
+    records = [
+        Record("TC001_a.py::run_test", duration_s=1.5, started_at=100.0),
+        Record("TC002_b.py::run_test", "failed", 2.0, 100.0, "call", "TimeoutError", "TimeoutError: slow",
+                   "trace", steps=3, last_step="Click submit"),
+        Record("TC003_c.py::run_test", "error", 0.1, 100.0, "setup", "KeyError", "KeyError: 'k'"),
+    ]
+    suite = ET.parse(write_junit(records, tmp_path / "junit.xml")).getroot().find("testsuite")
+    assert (suite.get("tests"), suite.get("failures"), suite.get("errors")) == ("3", "1", "1")
+
+    cases = {case.get("classname"): case for case in suite.iter("testcase")}
+    assert list(cases["TC001_a"]) == []
+    failure = cases["TC002_b"].find("failure")
+    assert failure.get("type") == "TimeoutError"
+    assert failure.get("message") == "TimeoutError: slow"
+    assert failure.text == "trace"
+    assert "last step: Click submit" in cases["TC002_b"].find("system-out").text
+    error = cases["TC003_c"].find("error")
+    assert error.get("type") == "KeyError"
+    assert error.get("message") == "[setup] KeyError: 'k'"
+
+
+@pytest.mark.parametrize("failed, expected", [(True, [("error_type", "KeyError")]), (False, [])])
+def test_makereport_records_error_type_only_for_failures(failed, expected):
+    report = SimpleNamespace(failed=failed, user_properties=[])
+    call = SimpleNamespace(excinfo=SimpleNamespace(typename="KeyError" if failed else "Skipped"))
+    hook = ResultReporter.pytest_runtest_makereport(None, None, call)
+    next(hook)
+    with pytest.raises(StopIteration):
+        hook.send(SimpleNamespace(get_result=lambda: report))
+    assert report.user_properties == expected
@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+
+from harness.rls import ACTORS, ALLOW, DEFAULT_CASES, DENY, OPERATIONS, _expect, format_grid, verify
+
+CASES = {case.name: case for case in DEFAULT_CASES}
+OWNER, ROW = str(uuid.uuid4()), str(uuid.uuid4())
+
+
+def _column(case, actor):
+    return tuple(case.expect[op][actor] for op in OPERATIONS)
+
+
+def test_expect_defaults_to_owner_only():
+    assert _expect() == {op: {"owner": ALLOW, "other": DENY, "anon": DENY} for op in OPERATIONS}
+    assert _expect(delete=(DENY, DENY, DENY))["delete"] == {"owner": DENY, "other": DENY, "anon": DENY}
+
+
+def test_every_case_covers_the_full_matrix():
+    assert len(CASES) == len(DEFAULT_CASES)
+    for case in DEFAULT_CASES:
+        assert set(case.expect) == set(OPERATIONS)
+        assert all(set(case.expect[op]) == set(ACTORS) for op in OPERATIONS)
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_anon_never_writes(name):
+    assert _column(CASES[name], "anon")[1:] == (DENY, DENY, DENY)
+
+
+@pytest.mark.parametrize("name, owner, other, anon", [
+    ("profiles", (ALLOW, ALLOW, ALLOW, DENY), (DENY,) * 4, (DENY,) * 4),
+    ("saved_outfits", (ALLOW,) * 4, (DENY,) * 4, (DENY,) * 4),
+    ("saved_outfits[public]", (ALLOW,) * 4, (ALLOW, DENY, DENY, DENY), (DENY,) * 4),
+    ("orders", (ALLOW, ALLOW, ALLOW, DENY), (DENY,) * 4, (DENY,) * 4),
+    ("outfit_items[public]", (ALLOW,) * 4, (ALLOW, DENY, DENY, DENY), (DENY,) * 4),
+    ("order_items", (ALLOW, ALLOW, ALLOW, DENY), (DENY,) * 4, (DENY,) * 4),
+    ("favorites", (ALLOW, ALLOW, DENY, ALLOW), (DENY,) * 4, (DENY,) * 4),
+    ("outfit_likes", (ALLOW, ALLOW, DENY, ALLOW), (ALLOW, DENY, DENY, DENY), (ALLOW, DENY, DENY, DENY)),
+])
+def test_expectations_follow_the_policy_scripts(name, owner, other, anon):
+    case = CASES[name]
+    assert (_column(case, "owner"), _column(case, "other"), _column(case, "anon")) == (owner, other, anon)
+
+
+@pytest.mark.parametrize("name", [n for n, c in CASES.items() if c.parents(OWNER, ROW)])
+def test_child_rows_reference_their_seeded_parents(name):
+    case = CASES[name]
+    row = case.row(OWNER, ROW)
+    parents = {table: parent for table, parent in case.parents(OWNER, ROW)}
+    references = {"outfit_id": "saved_outfits", "order_id": "orders", "avatar_id": "avatars",
+                  "product_id": "products"}
+    for column, table in references.items():
+        if column in row:
+            assert row[column] == parents[table]["id"]
+    for parent in parents.values():
+        assert parent.get("user_id", OWNER) == OWNER
+    assert case.parents(OWNER, ROW) == case.parents(OWNER, ROW)
+
+
+class _Backend:
+    def __init__(self, wrong=None):
+        self.wrong = wrong
+
+    def run(self, case, operation, actor):
+        expected = case.expect[operation][actor]
+        if (case.name, operation, actor) == self.wrong:
+            return (DENY if expected == ALLOW else ALLOW), "flipped"
+        return expected, ""
+
+
+def test_verify_and_grid_flag_differences():
+    cases = [CASES["avatars"], CASES["outfit_likes"]]
+    results = verify(_Backend(wrong=("avatars", "update", "other")), cases)
+    assert len(results) == len(cases) * len(OPERATIONS) * len(ACTORS)
+    assert [(r.case, r.operation, r.actor) for r in results if not r.ok] == [("avatars", "update", "other")]
+
+    grid = format_grid(results).splitlines()
+    avatars = next(line for line in grid if line.startswith("avatars"))
+    likes = next(line for line in grid if line.startswith("outfit_likes"))
+    assert avatars.split()[1:] == ["+", "-", "-"] * 2 + ["+", "+!", "-"] + ["+", "-", "-"]
+    assert likes.split()[1:4] == ["+", "+", "+"]
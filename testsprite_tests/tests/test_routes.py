@@ -0,0 +1,49 @@
+import pytest
+
+from harness.routes import load_routes, parse_routes
+
+SOURCE = """
+// Centralized route definitions
+export const ROUTES = {
+  HOME: "/",
+  LOGIN: "/auth/login", // sign in
+  DASHBOARD: "/dashboard",
+  API: {
+    CART: "/api/cart",
+  },
+  CART: "/cart",
+}
+
+export const PROTECTED_ROUTES = [ROUTES.DASHBOARD, ROUTES.CART, "/orders"] as const
+export const AUTH_ROUTES = [ROUTES.LOGIN] as const
+"""
+
+
+def test_parse_routes_flattens_nested_keys():
+    table = parse_routes(SOURCE)
+    assert table.routes == {
+        "HOME": "/",
+        "LOGIN": "/auth/login",
+        "DASHBOARD": "/dashboard",
+        "API.CART": "/api/cart",
+        "CART": "/cart",
+    }
+
+
+def test_parse_routes_groups_and_page_sets():
+    table = parse_routes(SOURCE)
+    assert table.protected == ["/dashboard", "/cart", "/orders"]
+    assert table.auth == ["/auth/login"]
+    assert table.pages == ["/", "/auth/login", "/dashboard", "/cart"]
+    assert table.public == ["/"]
+
+
+def test_parse_routes_rejects_source_without_routes():
+    with pytest.raises(ValueError):
+        parse_routes("export const OTHER = {}")
+
+
+def test_load_routes_reads_the_app_constants():
+    table = load_routes()
+    assert "/dashboard" in table.protected
+    assert set(table.auth) <= set(table.pages)
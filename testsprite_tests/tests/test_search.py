@@ -0,0 +1,25 @@
+import random
+
+from harness.search import typed_stream
+
+
+def test_typed_stream_without_typos_is_every_prefix():
+    assert typed_stream("cap", random.Random(0), typo_rate=0) == ["c", "ca", "cap"]
+
+
+def test_typed_stream_skips_blank_values():
+    assert typed_stream(" a", random.Random(0), typo_rate=0) == [" a"]
+
+
+def test_typed_stream_typo_is_typed_then_deleted():
+    values = typed_stream("boots", random.Random(1), typo_rate=1)
+    assert values[-1] == "boots"
+    # Each character adds a wrong key and its deletion, except that deleting
+    # the first wrong key empties the box, which is never searched.
+    assert len(values) == 3 * len("boots") - 1
+    for value in values:
+        assert "boots".startswith(value) or ("boots".startswith(value[:-1]) and value[-1] in "qxzjv")
+
+
+def test_typed_stream_is_reproducible():
+    assert typed_stream("linen blazer", random.Random(7)) == typed_stream("linen blazer", random.Random(7))
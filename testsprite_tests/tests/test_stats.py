@@ -0,0 +1,26 @@
+import math
+
+from harness.stats import percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    values = [15, 20, 35, 40, 50]
+    assert percentile(values, 5) == 15
+    assert percentile(values, 30) == 20
+    assert percentile(values, 40) == 20
+    assert percentile(values, 50) == 35
+    assert percentile(values, 100) == 50
+
+
+def test_percentile_ignores_input_order():
+    assert percentile([3, 1, 2], 50) == 2
+
+
+def test_percentile_of_nothing_is_nan():
+    assert math.isnan(percentile([], 95))
+
+
+def test_summarize_empty():
+    summary = summarize([])
+    assert summary["count"] == 0
+    assert math.isnan(summary["p95"])
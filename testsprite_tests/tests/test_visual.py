@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("playwright")
+Image = pytest.importorskip("PIL.Image")
+
+from harness.visual import HASH_SIZE, dhash, hamming  # noqa: E402
+
+
+def _gradient(width: int = 64, height: int = 32, reverse: bool = False) -> "Image.Image":
+    row = [x * 255 // (width - 1) for x in range(width)]
+    if reverse:
+        row.reverse()
+    image = Image.new("L", (width, height))
+    image.putdata(row * height)
+    return image
+
+
+def test_dhash_has_one_bit_per_adjacent_pair():
+    assert dhash(_gradient()) == (1 << HASH_SIZE * HASH_SIZE) - 1
+    assert dhash(_gradient(reverse=True)) == 0
+
+
+def test_dhash_ignores_scale_and_colour_mode():
+    assert hamming(dhash(_gradient()), dhash(_gradient(256, 128).convert("RGB"))) == 0
+
+
+def test_dhash_distance_grows_with_the_change():
+    base = _gradient()
+    changed = base.copy()
+    changed.paste(0, (0, 0, 32, 32))
+    assert 0 < hamming(dhash(base), dhash(changed)) <= HASH_SIZE * HASH_SIZE